@@ -85,6 +85,41 @@ resource "aws_cloudwatch_metric_alarm" "target_response_time" {
   )
 }
 
+# CloudWatch Alarms: Target Response Time percentiles (tail latency)
+resource "aws_cloudwatch_metric_alarm" "target_response_time_percentile" {
+  for_each = local.alarm_latency_percentiles
+
+  alarm_name          = "${aws_autoscaling_group.website.name}-high-latency-${each.key}"
+  alarm_description   = "Triggers when ${each.value.percentile} target response time exceeds ${each.value.threshold}s"
+  comparison_operator = "GreaterThanThreshold"
+  evaluation_periods  = var.alarm_evaluation_periods
+  metric_name         = "TargetResponseTime"
+  namespace           = "AWS/ApplicationELB"
+  period              = 60 # 1 minute
+  extended_statistic  = each.value.percentile
+  threshold           = each.value.threshold
+  treat_missing_data  = "notBreaching"
+
+  dimensions = merge(
+    {
+      LoadBalancer = aws_alb.website.arn_suffix
+    },
+    each.value.target_group == null ? {} : {
+      TargetGroup = each.value.target_group
+    }
+  )
+
+  alarm_actions = local.alarm_sns_topics
+  ok_actions    = local.alarm_sns_topics
+
+  tags = merge(
+    local.default_module_tags,
+    {
+      Name = "${aws_autoscaling_group.website.name}-high-latency-${each.key}"
+    }
+  )
+}
+
 # CloudWatch Alarm: Low Success Rate (Server Errors)
 resource "aws_cloudwatch_metric_alarm" "low_success_rate" {
   count = local.alarms_enabled ? 1 : 0
@@ -188,3 +223,191 @@ resource "aws_cloudwatch_metric_alarm" "cpu_utilization" {
     }
   )
 }
+
+# CloudWatch Alarms: Load balancer and target saturation
+resource "aws_cloudwatch_metric_alarm" "saturation" {
+  for_each = local.alarm_saturation
+
+  alarm_name          = "${aws_autoscaling_group.website.name}-${replace(each.key, "_", "-")}"
+  alarm_description   = "Triggers when ${each.value.description} (${each.value.metric_name} > ${each.value.threshold})"
+  comparison_operator = "GreaterThanThreshold"
+  evaluation_periods  = var.alarm_saturation_evaluation_periods
+  datapoints_to_alarm = var.alarm_saturation_datapoints_to_alarm
+  metric_name         = each.value.metric_name
+  namespace           = "AWS/ApplicationELB"
+  period              = 60 # 1 minute
+  statistic           = "Sum"
+  threshold           = each.value.threshold
+  treat_missing_data  = "notBreaching"
+
+  dimensions = {
+    LoadBalancer = aws_alb.website.arn_suffix
+  }
+
+  alarm_actions = local.alarm_sns_topics
+  ok_actions    = local.alarm_sns_topics
+
+  tags = merge(
+    local.default_module_tags,
+    {
+      Name = "${aws_autoscaling_group.website.name}-${replace(each.key, "_", "-")}"
+    }
+  )
+
+  lifecycle {
+    precondition {
+      condition     = var.alarm_saturation_datapoints_to_alarm <= var.alarm_saturation_evaluation_periods
+      error_message = "alarm_saturation_datapoints_to_alarm can't exceed alarm_saturation_evaluation_periods."
+    }
+  }
+}
+
+# CloudWatch Alarm: Surge of concurrent connections
+resource "aws_cloudwatch_metric_alarm" "active_connection_growth" {
+  count = local.alarm_saturation_enabled && var.alarm_active_connection_growth_threshold != null ? 1 : 0
+
+  alarm_name          = "${aws_autoscaling_group.website.name}-active-connection-growth"
+  alarm_description   = "Triggers when active connections grow by more than ${var.alarm_active_connection_growth_threshold}% in 5 minutes"
+  comparison_operator = "GreaterThanThreshold"
+  evaluation_periods  = 1
+  threshold           = var.alarm_active_connection_growth_threshold
+  treat_missing_data  = "notBreaching"
+
+  # Growth = 100 * (current - previous) / previous
+  # DIFF() is the change from the previous data point. Periods following a period
+  # without connections would divide by zero, so they count as no growth.
+  metric_query {
+    id          = "growth"
+    expression  = "IF(previous > 0, 100 * DIFF(connections) / previous, 0)"
+    label       = "Active connection growth (%)"
+    return_data = true
+  }
+
+  metric_query {
+    id         = "previous"
+    expression = "connections - DIFF(connections)"
+    label      = "Active connections in the previous period"
+  }
+
+  metric_query {
+    id = "connections"
+    metric {
+      metric_name = "ActiveConnectionCount"
+      namespace   = "AWS/ApplicationELB"
+      period      = 300
+      stat        = "Sum"
+      dimensions = {
+        LoadBalancer = aws_alb.website.arn_suffix
+      }
+    }
+  }
+
+  alarm_actions = local.alarm_sns_topics
+  ok_actions    = local.alarm_sns_topics
+
+  tags = merge(
+    local.default_module_tags,
+    {
+      Name = "${aws_autoscaling_group.website.name}-active-connection-growth"
+    }
+  )
+}
+
+# CloudWatch Alarm: Peak LCUs approaching the capacity reservation
+resource "aws_cloudwatch_metric_alarm" "lcu_reservation_utilization" {
+  count = local.alarms_enabled && var.alb_minimum_capacity_units != null && var.alarm_lcu_reservation_utilization_threshold != null ? 1 : 0
+
+  alarm_name          = "${aws_autoscaling_group.website.name}-lcu-reservation-utilization"
+  alarm_description   = "Triggers when peak LCUs exceed ${var.alarm_lcu_reservation_utilization_threshold}% of the ${var.alb_minimum_capacity_units} reserved LCUs"
+  comparison_operator = "GreaterThanThreshold"
+  evaluation_periods  = 3
+  threshold           = var.alarm_lcu_reservation_utilization_threshold
+  treat_missing_data  = "notBreaching"
+
+  metric_query {
+    id          = "utilization"
+    expression  = "100 * peak / reserved"
+    label       = "LCU reservation utilization (%)"
+    return_data = true
+  }
+
+  metric_query {
+    id = "peak"
+    metric {
+      metric_name = "PeakLCUs"
+      namespace   = "AWS/ApplicationELB"
+      period      = 60
+      stat        = "Maximum"
+      dimensions = {
+        LoadBalancer = aws_alb.website.arn_suffix
+      }
+    }
+  }
+
+  metric_query {
+    id = "reserved"
+    metric {
+      metric_name = "ReservedLCUs"
+      namespace   = "AWS/ApplicationELB"
+      period      = 60
+      stat        = "Maximum"
+      dimensions = {
+        LoadBalancer = aws_alb.website.arn_suffix
+      }
+    }
+  }
+
+  alarm_actions = local.alarm_sns_topics
+  ok_actions    = local.alarm_sns_topics
+
+  tags = merge(
+    local.default_module_tags,
+    {
+      Name = "${aws_autoscaling_group.website.name}-lcu-reservation-utilization"
+    }
+  )
+}
+
+# CloudWatch Alarms: Anomaly detection on traffic and latency
+resource "aws_cloudwatch_metric_alarm" "anomaly" {
+  for_each = local.alarm_anomaly_detection
+
+  alarm_name          = "${aws_autoscaling_group.website.name}-anomalous-${replace(each.key, "_", "-")}"
+  alarm_description   = "Triggers when ${each.value.description} (${var.alarm_anomaly_detection_band_width} standard deviations)"
+  comparison_operator = each.value.comparison_operator
+  evaluation_periods  = var.alarm_anomaly_detection_evaluation_periods
+  datapoints_to_alarm = var.alarm_anomaly_detection_datapoints_to_alarm
+  threshold_metric_id = "band"
+  treat_missing_data  = "notBreaching"
+
+  metric_query {
+    id          = "band"
+    expression  = "ANOMALY_DETECTION_BAND(metric, ${var.alarm_anomaly_detection_band_width})"
+    label       = "${each.value.metric_name} (expected)"
+    return_data = true
+  }
+
+  metric_query {
+    id          = "metric"
+    return_data = true
+    metric {
+      metric_name = each.value.metric_name
+      namespace   = "AWS/ApplicationELB"
+      period      = var.alarm_anomaly_detection_period
+      stat        = each.value.stat
+      dimensions = {
+        LoadBalancer = aws_alb.website.arn_suffix
+      }
+    }
+  }
+
+  alarm_actions = local.alarm_sns_topics
+  ok_actions    = local.alarm_sns_topics
+
+  tags = merge(
+    local.default_module_tags,
+    {
+      Name = "${aws_autoscaling_group.website.name}-anomalous-${replace(each.key, "_", "-")}"
+    }
+  )
+}
@@ -5,7 +5,7 @@ resource "aws_autoscaling_group" "website" {
   max_size                  = var.asg_max_size
   min_elb_capacity          = local.min_elb_capacity
   default_cooldown          = var.asg_default_cooldown
-  enabled_metrics           = var.asg_enabled_metrics
+  enabled_metrics           = local.asg_enabled_metrics
   vpc_zone_identifier       = var.backend_subnets
   health_check_type         = var.health_check_type
   wait_for_capacity_timeout = var.wait_for_capacity_timeout
@@ -17,29 +17,64 @@ resource "aws_autoscaling_group" "website" {
     strategy = "Rolling"
     preferences {
       min_healthy_percentage       = var.min_healthy_percentage
+      max_healthy_percentage       = var.asg_instance_refresh_max_healthy_percentage
       scale_in_protected_instances = var.asg_scale_in_protected_instances
+      skip_matching                = var.asg_instance_refresh_skip_matching
+      instance_warmup              = var.asg_instance_refresh_instance_warmup
+      checkpoint_percentages       = var.asg_instance_refresh_checkpoint_percentages
+      checkpoint_delay             = var.asg_instance_refresh_checkpoint_delay
+      auto_rollback                = var.asg_instance_refresh_auto_rollback
     }
     triggers = ["tag"]
   }
+  capacity_rebalance = var.capacity_rebalance
   dynamic "launch_template" {
-    for_each = var.on_demand_base_capacity == null ? [1] : []
+    for_each = local.mixed_instances_policy_enabled ? [] : [1]
     content {
       id      = aws_launch_template.website.id
       version = aws_launch_template.website.latest_version
     }
   }
   dynamic "mixed_instances_policy" {
-    for_each = var.on_demand_base_capacity == null ? [] : [1]
+    for_each = local.mixed_instances_policy_enabled ? [1] : []
     content {
       instances_distribution {
-        on_demand_base_capacity                  = var.on_demand_base_capacity
-        on_demand_percentage_above_base_capacity = 0
+        on_demand_base_capacity                  = coalesce(var.on_demand_base_capacity, 0)
+        on_demand_percentage_above_base_capacity = local.on_demand_percentage_above_base_capacity
+        spot_allocation_strategy                 = var.spot_allocation_strategy
       }
       launch_template {
         launch_template_specification {
           launch_template_id = aws_launch_template.website.id
           version            = aws_launch_template.website.latest_version
         }
+        dynamic "override" {
+          for_each = var.instance_type_overrides
+          content {
+            instance_type     = override.value.instance_type
+            weighted_capacity = override.value.weighted_capacity
+          }
+        }
+        dynamic "override" {
+          for_each = var.instance_requirements != null ? [var.instance_requirements] : []
+          content {
+            instance_requirements {
+              vcpu_count {
+                min = override.value.vcpu_min
+                max = override.value.vcpu_max
+              }
+              memory_mib {
+                min = override.value.memory_mib_min
+                max = override.value.memory_mib_max
+              }
+              allowed_instance_types  = override.value.allowed_instance_types
+              excluded_instance_types = override.value.excluded_instance_types
+              burstable_performance   = override.value.burstable_performance
+              cpu_manufacturers       = override.value.cpu_manufacturers
+              instance_generations    = override.value.instance_generations
+            }
+          }
+        }
       }
     }
   }
@@ -67,6 +102,24 @@ resource "aws_autoscaling_group" "website" {
 
     }
   }
+  lifecycle {
+    precondition {
+      condition     = var.instance_requirements == null || length(var.instance_type_overrides) == 0
+      error_message = "instance_requirements can't be combined with instance_type_overrides."
+    }
+    precondition {
+      condition = (
+        var.asg_instance_refresh_max_healthy_percentage == null
+        ? true
+        : var.asg_instance_refresh_max_healthy_percentage - var.min_healthy_percentage <= 100
+      )
+      error_message = "asg_instance_refresh_max_healthy_percentage can exceed min_healthy_percentage by at most 100."
+    }
+    precondition {
+      condition     = var.asg_instance_refresh_checkpoint_delay == null || var.asg_instance_refresh_checkpoint_percentages != null
+      error_message = "asg_instance_refresh_checkpoint_delay requires asg_instance_refresh_checkpoint_percentages."
+    }
+  }
 }
 
 resource "aws_launch_template" "website" {
@@ -93,12 +146,33 @@ resource "aws_launch_template" "website" {
     device_name = data.aws_ami.selected.root_device_name
     ebs {
       # Root volume size = user-specified size + swap space
-      # Swap space = 2 * RAM size (instance memory converted from MiB to GiB)
-      # This ensures adequate swap space for the instance type
-      volume_size           = var.root_volume_size + 2 * data.aws_ec2_instance_type.selected.memory_size / 1024
+      # Swap space = swap_size_multiplier * RAM size (instance memory converted from MiB to GiB)
+      volume_size           = local.root_volume_size
+      volume_type           = var.root_volume_type
+      iops                  = var.root_volume_iops
+      throughput            = var.root_volume_throughput
       delete_on_termination = true
     }
   }
+  dynamic "block_device_mappings" {
+    for_each = var.extra_block_devices
+    content {
+      device_name  = block_device_mappings.value.device_name
+      virtual_name = block_device_mappings.value.virtual_name
+      dynamic "ebs" {
+        for_each = block_device_mappings.value.virtual_name == null ? [block_device_mappings.value] : []
+        content {
+          volume_size           = ebs.value.volume_size
+          volume_type           = ebs.value.volume_type
+          iops                  = ebs.value.iops
+          throughput            = ebs.value.throughput
+          encrypted             = ebs.value.encrypted
+          snapshot_id           = ebs.value.snapshot_id
+          delete_on_termination = ebs.value.delete_on_termination
+        }
+      }
+    }
+  }
   tag_specifications {
     resource_type = "volume"
     tags = merge(
@@ -117,6 +191,36 @@ resource "aws_launch_template" "website" {
       }
     )
   }
+
+  lifecycle {
+    precondition {
+      condition     = var.root_volume_throughput == null || var.root_volume_type == "gp3"
+      error_message = "root_volume_throughput is only supported with root_volume_type = \"gp3\". Set root_volume_type explicitly."
+    }
+    precondition {
+      condition     = var.root_volume_iops == null ? true : var.root_volume_type == null ? false : contains(["gp3", "io1", "io2"], var.root_volume_type)
+      error_message = "root_volume_iops is only supported with root_volume_type gp3, io1 or io2. Set root_volume_type explicitly."
+    }
+  }
+}
+
+resource "aws_autoscaling_warm_pool" "website" {
+  count                       = var.asg_warm_pool_enabled ? 1 : 0
+  autoscaling_group_name      = aws_autoscaling_group.website.name
+  pool_state                  = var.asg_warm_pool_state
+  min_size                    = var.asg_warm_pool_min_size
+  max_group_prepared_capacity = var.asg_warm_pool_max_group_prepared_capacity
+
+  instance_reuse_policy {
+    reuse_on_scale_in = var.asg_warm_pool_reuse_on_scale_in
+  }
+
+  lifecycle {
+    precondition {
+      condition     = !local.mixed_instances_policy_enabled
+      error_message = "Warm pools are not supported with a mixed instances policy. Unset on_demand_base_capacity, instance_type_overrides and instance_requirements to use asg_warm_pool_enabled."
+    }
+  }
 }
 
 resource "aws_autoscaling_lifecycle_hook" "launching" {
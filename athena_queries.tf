@@ -0,0 +1,93 @@
+locals {
+  # Saved queries over today's (UTC) partition of the raw access log table.
+  # Latencies of -1 mean the request never reached a target, so they are excluded.
+  athena_table = local.glue_enabled ? "\"${aws_glue_catalog_database.alb_access_logs[0].name}\".\"${aws_glue_catalog_table.alb_access_logs[0].name}\"" : ""
+  athena_today = "day = date_format(current_date, '%Y/%m/%d')"
+
+  athena_named_queries = {
+    latency-by-domain = {
+      description = "p50/p95/p99 target processing time by domain name, today (UTC)"
+      query       = <<-EOF
+        SELECT domain_name,
+               count(*) AS requests,
+               approx_percentile(target_processing_time, 0.50) AS p50,
+               approx_percentile(target_processing_time, 0.95) AS p95,
+               approx_percentile(target_processing_time, 0.99) AS p99
+        FROM ${local.athena_table}
+        WHERE ${local.athena_today}
+          AND target_processing_time >= 0
+        GROUP BY domain_name
+        ORDER BY p99 DESC
+      EOF
+    }
+    latency-by-target = {
+      description = "p50/p95/p99 target processing time by target IP, today (UTC)"
+      query       = <<-EOF
+        SELECT target_ip,
+               count(*) AS requests,
+               approx_percentile(target_processing_time, 0.50) AS p50,
+               approx_percentile(target_processing_time, 0.95) AS p95,
+               approx_percentile(target_processing_time, 0.99) AS p99
+        FROM ${local.athena_table}
+        WHERE ${local.athena_today}
+          AND target_processing_time >= 0
+        GROUP BY target_ip
+        ORDER BY p99 DESC
+      EOF
+    }
+    slowest-urls = {
+      description = "URL paths with the highest p99 target processing time, today (UTC)"
+      query       = <<-EOF
+        SELECT request_verb,
+               url_extract_path(request_url) AS path,
+               count(*) AS requests,
+               approx_percentile(target_processing_time, 0.99) AS p99,
+               max(target_processing_time) AS max
+        FROM ${local.athena_table}
+        WHERE ${local.athena_today}
+          AND target_processing_time >= 0
+        GROUP BY request_verb, url_extract_path(request_url)
+        ORDER BY p99 DESC
+        LIMIT 100
+      EOF
+    }
+    errors-by-target = {
+      description = "5xx responses by target IP, today (UTC). Empty target_ip means the ALB answered itself."
+      query       = <<-EOF
+        SELECT target_ip,
+               count(*) AS requests,
+               count_if(elb_status_code >= 500) AS elb_5xx,
+               count_if(target_status_code LIKE '5%') AS target_5xx,
+               round(100.0 * count_if(elb_status_code >= 500) / count(*), 2) AS elb_5xx_percent
+        FROM ${local.athena_table}
+        WHERE ${local.athena_today}
+        GROUP BY target_ip
+        ORDER BY elb_5xx DESC
+      EOF
+    }
+    bytes-by-path = {
+      description = "Bytes sent and received by URL path, today (UTC)"
+      query       = <<-EOF
+        SELECT url_extract_path(request_url) AS path,
+               count(*) AS requests,
+               sum(sent_bytes) AS sent_bytes,
+               sum(received_bytes) AS received_bytes,
+               avg(sent_bytes) AS avg_sent_bytes
+        FROM ${local.athena_table}
+        WHERE ${local.athena_today}
+        GROUP BY url_extract_path(request_url)
+        ORDER BY sent_bytes DESC
+        LIMIT 100
+      EOF
+    }
+  }
+}
+
+resource "aws_athena_named_query" "alb_access_logs" {
+  for_each    = local.glue_enabled ? local.athena_named_queries : {}
+  name        = "${var.service_name}-${each.key}"
+  description = each.value.description
+  workgroup   = aws_athena_workgroup.alb_access_logs[0].id
+  database    = aws_glue_catalog_database.alb_access_logs[0].name
+  query       = each.value.query
+}
@@ -1,4 +1,5 @@
 resource "aws_autoscaling_policy" "cpu_load" {
+  count                  = var.autoscaling_cpu_policy_enabled ? 1 : 0
   autoscaling_group_name = aws_autoscaling_group.website.name
   name                   = aws_autoscaling_group.website.name
   policy_type            = "TargetTrackingScaling"
@@ -9,3 +10,115 @@ resource "aws_autoscaling_policy" "cpu_load" {
     target_value = var.autoscaling_target_cpu_load
   }
 }
+
+moved {
+  from = aws_autoscaling_policy.cpu_load
+  to   = aws_autoscaling_policy.cpu_load[0]
+}
+
+resource "aws_autoscaling_policy" "request_count" {
+  count                     = var.autoscaling_target_request_count != null ? 1 : 0
+  autoscaling_group_name    = aws_autoscaling_group.website.name
+  name                      = "${aws_autoscaling_group.website.name}-request-count"
+  policy_type               = "TargetTrackingScaling"
+  estimated_instance_warmup = var.autoscaling_request_count_instance_warmup
+  target_tracking_configuration {
+    predefined_metric_specification {
+      predefined_metric_type = "ALBRequestCountPerTarget"
+      resource_label         = local.alb_request_count_resource_label
+    }
+    target_value = var.autoscaling_target_request_count
+  }
+}
+
+resource "aws_autoscaling_policy" "predictive" {
+  count                  = var.autoscaling_predictive_mode != null ? 1 : 0
+  autoscaling_group_name = aws_autoscaling_group.website.name
+  name                   = "${aws_autoscaling_group.website.name}-predictive"
+  policy_type            = "PredictiveScaling"
+  predictive_scaling_configuration {
+    mode                         = var.autoscaling_predictive_mode
+    scheduling_buffer_time       = var.autoscaling_predictive_scheduling_buffer_time
+    max_capacity_breach_behavior = var.autoscaling_predictive_max_capacity_breach_behavior
+    max_capacity_buffer          = var.autoscaling_predictive_max_capacity_breach_behavior == "IncreaseMaxCapacity" ? var.autoscaling_predictive_max_capacity_buffer : null
+    metric_specification {
+      target_value = local.autoscaling_predictive_target_request_count
+      predefined_metric_pair_specification {
+        predefined_metric_type = "ALBRequestCount"
+        resource_label         = local.alb_request_count_resource_label
+      }
+    }
+  }
+  lifecycle {
+    precondition {
+      condition     = local.autoscaling_predictive_target_request_count != null
+      error_message = "Predictive scaling needs a target request count. Set autoscaling_predictive_target_request_count or autoscaling_target_request_count."
+    }
+  }
+}
+
+# Step scaling on latency: adds capacity when a TargetResponseTime percentile
+# breaches the threshold, even if CPU is low (e.g. I/O-bound applications).
+# Scale in is left to the target tracking policies.
+resource "aws_autoscaling_policy" "latency" {
+  count                     = var.autoscaling_latency_threshold != null ? 1 : 0
+  autoscaling_group_name    = aws_autoscaling_group.website.name
+  name                      = "${aws_autoscaling_group.website.name}-latency"
+  policy_type               = "StepScaling"
+  adjustment_type           = "ChangeInCapacity"
+  metric_aggregation_type   = "Maximum"
+  estimated_instance_warmup = var.autoscaling_latency_instance_warmup
+  dynamic "step_adjustment" {
+    for_each = var.autoscaling_latency_step_adjustments
+    content {
+      metric_interval_lower_bound = step_adjustment.value.lower_bound
+      metric_interval_upper_bound = step_adjustment.value.upper_bound
+      scaling_adjustment          = step_adjustment.value.scaling_adjustment
+    }
+  }
+}
+
+resource "aws_cloudwatch_metric_alarm" "latency_scale_out" {
+  count = var.autoscaling_latency_threshold != null ? 1 : 0
+
+  alarm_name          = "${aws_autoscaling_group.website.name}-latency-scale-out"
+  alarm_description   = "Scales out the ASG when ${var.autoscaling_latency_percentile} target response time exceeds ${var.autoscaling_latency_threshold}s"
+  comparison_operator = "GreaterThanThreshold"
+  evaluation_periods  = var.autoscaling_latency_evaluation_periods
+  metric_name         = "TargetResponseTime"
+  namespace           = "AWS/ApplicationELB"
+  period              = 60 # 1 minute
+  extended_statistic  = var.autoscaling_latency_percentile
+  threshold           = var.autoscaling_latency_threshold
+  treat_missing_data  = "notBreaching"
+
+  dimensions = {
+    LoadBalancer = aws_alb.website.arn_suffix
+    TargetGroup  = aws_alb_target_group.website.arn_suffix
+  }
+
+  alarm_actions = [aws_autoscaling_policy.latency[0].arn]
+
+  tags = merge(
+    local.default_module_tags,
+    {
+      Name = "${aws_autoscaling_group.website.name}-latency-scale-out"
+    }
+  )
+}
+
+# Scheduled actions: change the capacity limits ahead of known traffic patterns,
+# e.g. a larger minimum during business hours.
+resource "aws_autoscaling_schedule" "website" {
+  for_each               = { for action in var.autoscaling_scheduled_actions : action.name => action }
+  autoscaling_group_name = aws_autoscaling_group.website.name
+  scheduled_action_name  = each.key
+  recurrence             = each.value.recurrence
+  time_zone              = each.value.time_zone
+  start_time             = each.value.start_time
+  end_time               = each.value.end_time
+  # -1 leaves the setting unchanged
+  min_size         = coalesce(each.value.min_size, -1)
+  max_size         = coalesce(each.value.max_size, -1)
+  desired_capacity = coalesce(each.value.desired_capacity, -1)
+}
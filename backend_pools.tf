@@ -0,0 +1,174 @@
+# Additional backend pools.
+# Each pool gets its own target group, a listener rule that matches path patterns
+# on the module's host names, and its own autoscaling group.
+# Pools share the launch template (AMI, userdata, instance type) with the main ASG.
+
+locals {
+  backend_pool_names = sort(keys(var.backend_pools))
+  backend_pools = {
+    for name, pool in var.backend_pools : name => {
+      path_patterns = pool.path_patterns
+      # Rules are evaluated before the main rule (priority 99), the first pool gets 98.
+      priority                      = pool.priority != null ? pool.priority : 98 - index(local.backend_pool_names, name)
+      port                          = coalesce(pool.port, var.target_group_port)
+      protocol                      = coalesce(pool.protocol, var.target_group_protocol)
+      health_check_path             = coalesce(pool.health_check_path, var.alb_healthcheck_path)
+      health_check_matcher          = coalesce(pool.health_check_matcher, local.alb_healthcheck_response_code_matcher)
+      load_balancing_algorithm_type = coalesce(pool.load_balancing_algorithm_type, var.load_balancing_algorithm_type)
+      deregistration_delay          = coalesce(pool.deregistration_delay, var.target_group_deregistration_delay)
+      asg_min_size                  = coalesce(pool.asg_min_size, var.asg_min_size)
+      asg_max_size                  = coalesce(pool.asg_max_size, var.asg_max_size)
+      autoscaling_target_cpu_load   = coalesce(pool.autoscaling_target_cpu_load, var.autoscaling_target_cpu_load)
+    }
+  }
+}
+
+resource "aws_alb_target_group" "pool" {
+  for_each             = local.backend_pools
+  port                 = each.value.port
+  protocol             = each.value.protocol
+  protocol_version     = var.target_group_protocol_version
+  target_type          = var.target_group_type
+  vpc_id               = data.aws_subnet.selected.vpc_id
+  deregistration_delay = each.value.deregistration_delay
+
+  load_balancing_algorithm_type = each.value.load_balancing_algorithm_type
+  stickiness {
+    type    = "lb_cookie"
+    enabled = var.stickiness_enabled
+  }
+
+  health_check {
+    enabled             = var.alb_healthcheck_enabled
+    path                = each.value.health_check_path
+    port                = "traffic-port"
+    protocol            = var.alb_healthcheck_protocol
+    healthy_threshold   = var.alb_healthcheck_healthy_threshold
+    unhealthy_threshold = local.unhealthy_threshold
+    interval            = var.alb_healthcheck_interval
+    timeout             = var.alb_healthcheck_timeout
+    matcher             = each.value.health_check_matcher
+  }
+  tags = merge(
+    local.default_module_tags,
+    {
+      backend_pool : each.key
+    },
+    {
+      VantaContainsUserData : false
+      VantaContainsEPHI : false
+    }
+  )
+}
+
+resource "aws_alb_listener_rule" "pool" {
+  for_each     = local.backend_pools
+  listener_arn = aws_lb_listener.ssl.arn
+  priority     = each.value.priority
+  action {
+    type             = "forward"
+    target_group_arn = aws_alb_target_group.pool[each.key].arn
+  }
+  condition {
+    host_header {
+      values = [
+        for record in var.dns_a_records : trimprefix(join(".", [record, data.aws_route53_zone.webserver_zone.name]), ".")
+      ]
+    }
+  }
+  condition {
+    path_pattern {
+      values = each.value.path_patterns
+    }
+  }
+  tags = merge(
+    local.default_module_tags,
+    {
+      backend_pool : each.key
+    },
+    {
+      VantaContainsUserData : false
+      VantaContainsEPHI : false
+    }
+  )
+  lifecycle {
+    precondition {
+      condition     = each.value.priority >= 1 && each.value.priority < 99
+      error_message = "Backend pool ${each.key} must have a listener rule priority between 1 and 98, got ${each.value.priority}."
+    }
+    precondition {
+      condition     = length(distinct([for pool in values(local.backend_pools) : pool.priority])) == length(local.backend_pools)
+      error_message = "Backend pool listener rule priorities must be distinct, got ${jsonencode({ for name, pool in local.backend_pools : name => pool.priority })}. Set priority on the pools that conflict with an auto-assigned one."
+    }
+    precondition {
+      # An ALB rule allows 5 condition values, host names and paths combined
+      condition     = length(var.dns_a_records) + length(each.value.path_patterns) <= 5
+      error_message = "Backend pool ${each.key} has ${length(each.value.path_patterns)} path_patterns and the rule matches ${length(var.dns_a_records)} host names from dns_a_records. Together they must be at most 5."
+    }
+  }
+}
+
+resource "aws_autoscaling_group" "pool" {
+  for_each                  = local.backend_pools
+  name_prefix               = "${aws_autoscaling_group.website.name}-${each.key}-"
+  min_size                  = each.value.asg_min_size
+  max_size                  = each.value.asg_max_size
+  min_elb_capacity          = each.value.asg_min_size
+  default_cooldown          = var.asg_default_cooldown
+  enabled_metrics           = var.asg_enabled_metrics
+  vpc_zone_identifier       = var.backend_subnets
+  health_check_type         = var.health_check_type
+  wait_for_capacity_timeout = var.wait_for_capacity_timeout
+  max_instance_lifetime     = var.max_instance_lifetime_days * 24 * 3600
+  health_check_grace_period = var.health_check_grace_period
+  protect_from_scale_in     = var.protect_from_scale_in
+  target_group_arns         = var.target_group_type == "instance" && local.attach_tg_to_asg ? [aws_alb_target_group.pool[each.key].arn] : []
+  instance_refresh {
+    strategy = "Rolling"
+    preferences {
+      min_healthy_percentage       = var.min_healthy_percentage
+      max_healthy_percentage       = var.asg_instance_refresh_max_healthy_percentage
+      scale_in_protected_instances = var.asg_scale_in_protected_instances
+      skip_matching                = var.asg_instance_refresh_skip_matching
+      instance_warmup              = var.asg_instance_refresh_instance_warmup
+      checkpoint_percentages       = var.asg_instance_refresh_checkpoint_percentages
+      checkpoint_delay             = var.asg_instance_refresh_checkpoint_delay
+      auto_rollback                = var.asg_instance_refresh_auto_rollback
+    }
+    triggers = ["tag"]
+  }
+  launch_template {
+    id      = aws_launch_template.website.id
+    version = aws_launch_template.website.latest_version
+  }
+  instance_maintenance_policy {
+    min_healthy_percentage = var.asg_min_healthy_percentage
+    max_healthy_percentage = var.asg_max_healthy_percentage
+  }
+  dynamic "tag" {
+    for_each = merge(
+      local.default_asg_tags,
+      {
+        backend_pool : each.key
+      }
+    )
+    content {
+      key                 = tag.key
+      value               = tag.value
+      propagate_at_launch = true
+    }
+  }
+}
+
+resource "aws_autoscaling_policy" "pool_cpu_load" {
+  for_each               = local.backend_pools
+  autoscaling_group_name = aws_autoscaling_group.pool[each.key].name
+  name                   = aws_autoscaling_group.pool[each.key].name
+  policy_type            = "TargetTrackingScaling"
+  target_tracking_configuration {
+    predefined_metric_specification {
+      predefined_metric_type = "ASGAverageCPUUtilization"
+    }
+    target_value = each.value.autoscaling_target_cpu_load
+  }
+}
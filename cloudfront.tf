@@ -0,0 +1,120 @@
+# Optional CloudFront distribution in front of the ALB.
+# When enabled, the DNS records in dns.tf point at the distribution instead of the ALB.
+#
+# CloudFront forwards the viewer Host header to the ALB (Managed-AllViewer origin
+# request policy), so the ALB listener rule still matches on the module's DNS names
+# and the ALB certificate is valid for the origin connection.
+
+locals {
+  cloudfront_origin_id = "alb-${var.service_name}"
+
+  # CloudFront only accepts ACM certificates from us-east-1.
+  # In us-east-1 the module's own certificate can be reused.
+  cloudfront_certificate_arn = (
+    var.cloudfront_certificate_arn != null
+    ? var.cloudfront_certificate_arn
+    : local.region == "us-east-1" ? aws_acm_certificate_validation.website.certificate_arn : null
+  )
+
+  cloudfront_cache_policy_names = toset(
+    concat(
+      [var.cloudfront_default_cache_policy],
+      [for behavior in var.cloudfront_cache_behaviors : behavior.cache_policy]
+    )
+  )
+}
+
+data "aws_cloudfront_cache_policy" "selected" {
+  for_each = var.cloudfront_enabled ? local.cloudfront_cache_policy_names : toset([])
+  name     = each.value
+}
+
+data "aws_cloudfront_origin_request_policy" "all_viewer" {
+  count = var.cloudfront_enabled ? 1 : 0
+  name  = "Managed-AllViewer"
+}
+
+resource "aws_cloudfront_distribution" "website" {
+  count           = var.cloudfront_enabled ? 1 : 0
+  enabled         = true
+  is_ipv6_enabled = true
+  comment         = "CDN for ${var.service_name}"
+  price_class     = var.cloudfront_price_class
+  http_version    = "http2and3"
+  web_acl_id      = var.cloudfront_web_acl_id
+  aliases = [
+    for record in var.dns_a_records : trimprefix(join(".", [record, data.aws_route53_zone.webserver_zone.name]), ".")
+  ]
+
+  origin {
+    origin_id   = local.cloudfront_origin_id
+    domain_name = aws_alb.website.dns_name
+
+    custom_origin_config {
+      http_port              = var.alb_listener_port
+      https_port             = 443
+      origin_protocol_policy = "https-only"
+      origin_ssl_protocols   = ["TLSv1.2"]
+      origin_read_timeout    = min(var.alb_idle_timeout, 60)
+    }
+
+    dynamic "origin_shield" {
+      for_each = var.cloudfront_origin_shield_region != null ? [1] : []
+      content {
+        enabled              = true
+        origin_shield_region = var.cloudfront_origin_shield_region
+      }
+    }
+  }
+
+  default_cache_behavior {
+    target_origin_id         = local.cloudfront_origin_id
+    viewer_protocol_policy   = "redirect-to-https"
+    allowed_methods          = ["DELETE", "GET", "HEAD", "OPTIONS", "PATCH", "POST", "PUT"]
+    cached_methods           = ["GET", "HEAD"]
+    compress                 = var.cloudfront_compression
+    cache_policy_id          = data.aws_cloudfront_cache_policy.selected[var.cloudfront_default_cache_policy].id
+    origin_request_policy_id = data.aws_cloudfront_origin_request_policy.all_viewer[0].id
+  }
+
+  dynamic "ordered_cache_behavior" {
+    for_each = var.cloudfront_cache_behaviors
+    content {
+      path_pattern             = ordered_cache_behavior.value.path_pattern
+      target_origin_id         = local.cloudfront_origin_id
+      viewer_protocol_policy   = "redirect-to-https"
+      allowed_methods          = ["GET", "HEAD", "OPTIONS"]
+      cached_methods           = ["GET", "HEAD"]
+      compress                 = var.cloudfront_compression
+      cache_policy_id          = data.aws_cloudfront_cache_policy.selected[ordered_cache_behavior.value.cache_policy].id
+      origin_request_policy_id = data.aws_cloudfront_origin_request_policy.all_viewer[0].id
+    }
+  }
+
+  restrictions {
+    geo_restriction {
+      restriction_type = "none"
+    }
+  }
+
+  viewer_certificate {
+    acm_certificate_arn      = local.cloudfront_certificate_arn
+    ssl_support_method       = "sni-only"
+    minimum_protocol_version = "TLSv1.2_2021"
+  }
+
+  tags = merge(
+    local.default_module_tags,
+    {
+      VantaContainsUserData : false
+      VantaContainsEPHI : false
+    }
+  )
+
+  lifecycle {
+    precondition {
+      condition     = local.cloudfront_certificate_arn != null
+      error_message = "CloudFront requires an ACM certificate in us-east-1. Set cloudfront_certificate_arn when the module is deployed outside us-east-1."
+    }
+  }
+}
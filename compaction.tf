@@ -0,0 +1,171 @@
+resource "aws_s3_object" "compaction_script" {
+  count  = local.compaction_enabled ? 1 : 0
+  bucket = aws_s3_bucket.access_log[0].id
+  key    = "glue/scripts/compaction.py"
+  source = "${path.module}/website_pod/compaction.py"
+  etag   = filemd5("${path.module}/website_pod/compaction.py")
+  tags   = local.default_module_tags
+}
+
+data "aws_iam_policy_document" "compaction_assume" {
+  count = local.compaction_enabled ? 1 : 0
+  statement {
+    actions = ["sts:AssumeRole"]
+    principals {
+      type        = "Service"
+      identifiers = ["glue.amazonaws.com"]
+    }
+  }
+}
+
+data "aws_iam_policy_document" "compaction" {
+  count = local.compaction_enabled ? 1 : 0
+  statement {
+    actions = [
+      "glue:GetTable",
+    ]
+    resources = [
+      "arn:aws:glue:${local.region}:${local.account_id}:catalog",
+      aws_glue_catalog_database.alb_access_logs[0].arn,
+      aws_glue_catalog_table.alb_access_logs[0].arn,
+    ]
+  }
+  statement {
+    actions = [
+      "s3:ListBucket",
+    ]
+    resources = [
+      aws_s3_bucket.access_log[0].arn,
+    ]
+  }
+  statement {
+    actions = [
+      "s3:GetObject",
+    ]
+    resources = [
+      "${aws_s3_bucket.access_log[0].arn}/AWSLogs/${local.account_id}/*",
+      "${aws_s3_bucket.access_log[0].arn}/${aws_s3_object.compaction_script[0].key}",
+    ]
+  }
+  statement {
+    actions = [
+      "s3:PutObject",
+    ]
+    resources = [
+      "${aws_s3_bucket.access_log[0].arn}/${local.compaction_prefix}*",
+    ]
+  }
+  statement {
+    actions = [
+      "logs:CreateLogGroup",
+      "logs:CreateLogStream",
+      "logs:PutLogEvents",
+    ]
+    resources = [
+      "arn:aws:logs:${local.region}:${local.account_id}:log-group:/aws-glue/*",
+    ]
+  }
+}
+
+resource "aws_iam_role" "compaction" {
+  count              = local.compaction_enabled ? 1 : 0
+  name_prefix        = "alb-logs-compaction-"
+  assume_role_policy = data.aws_iam_policy_document.compaction_assume[0].json
+  tags               = local.default_module_tags
+}
+
+resource "aws_iam_role_policy" "compaction" {
+  count  = local.compaction_enabled ? 1 : 0
+  name   = "alb-logs-compaction"
+  role   = aws_iam_role.compaction[0].id
+  policy = data.aws_iam_policy_document.compaction[0].json
+}
+
+resource "aws_glue_job" "compaction" {
+  count        = local.compaction_enabled ? 1 : 0
+  name         = "${var.service_name}-alb-logs-compaction-${local.glue_suffix}"
+  description  = "Compacts a day of ALB access logs for ${var.service_name} into Parquet"
+  role_arn     = aws_iam_role.compaction[0].arn
+  max_capacity = var.alb_access_log_compaction_max_capacity
+  max_retries  = 1
+  timeout      = 120
+
+  command {
+    name            = "pythonshell"
+    python_version  = "3.9"
+    script_location = "s3://${aws_s3_bucket.access_log[0].id}/${aws_s3_object.compaction_script[0].key}"
+  }
+
+  # Pass --day yyyy/MM/dd to a manual run to backfill a day.
+  # Scheduled runs compact the previous day (UTC).
+  default_arguments = {
+    "--source_database" = aws_glue_catalog_database.alb_access_logs[0].name
+    "--source_table"    = aws_glue_catalog_table.alb_access_logs[0].name
+    "--target_location" = local.compaction_location
+    "--compression"     = "snappy"
+    "library-set"       = "analytics"
+  }
+
+  tags = local.default_module_tags
+}
+
+resource "aws_glue_trigger" "compaction" {
+  count    = local.compaction_enabled ? 1 : 0
+  name     = "${aws_glue_job.compaction[0].name}-daily"
+  type     = "SCHEDULED"
+  schedule = var.alb_access_log_compaction_schedule
+
+  actions {
+    job_name = aws_glue_job.compaction[0].name
+  }
+
+  tags = local.default_module_tags
+}
+
+resource "aws_glue_catalog_table" "alb_access_logs_parquet" {
+  count         = local.compaction_enabled ? 1 : 0
+  name          = "${local.glue_table}_parquet"
+  database_name = aws_glue_catalog_database.alb_access_logs[0].name
+  description   = "ALB access logs for ${var.service_name}, compacted daily into Parquet"
+
+  table_type = "EXTERNAL_TABLE"
+
+  parameters = {
+    "EXTERNAL"                     = "TRUE"
+    "classification"               = "parquet"
+    "parquet.compression"          = "SNAPPY"
+    "projection.enabled"           = "true"
+    "projection.day.type"          = "date"
+    "projection.day.format"        = "yyyy/MM/dd"
+    "projection.day.range"         = var.alb_access_log_athena_projection_range
+    "projection.day.interval"      = "1"
+    "projection.day.interval.unit" = "DAYS"
+    "storage.location.template"    = "${local.compaction_location}$${day}"
+  }
+
+  partition_keys {
+    name = "day"
+    type = "string"
+  }
+
+  storage_descriptor {
+    location      = local.compaction_location
+    input_format  = "org.apache.hadoop.hive.ql.io.parquet.MapredParquetInputFormat"
+    output_format = "org.apache.hadoop.hive.ql.io.parquet.MapredParquetOutputFormat"
+
+    ser_de_info {
+      serialization_library = "org.apache.hadoop.hive.ql.io.parquet.serde.ParquetHiveSerDe"
+      parameters = {
+        "serialization.format" = "1"
+      }
+    }
+
+    dynamic "columns" {
+      for_each = local.alb_access_log_columns
+      content {
+        name = columns.value.name
+        type = columns.value.type
+      }
+    }
+  }
+}
@@ -0,0 +1,149 @@
+locals {
+  dashboard_lb = ["LoadBalancer", aws_alb.website.arn_suffix]
+  dashboard_tg = ["TargetGroup", aws_alb_target_group.website.arn_suffix, "LoadBalancer", aws_alb.website.arn_suffix]
+
+  # ASG capacity metrics are only published if they are in asg_enabled_metrics
+  dashboard_asg_metrics = [
+    for metric in ["GroupDesiredCapacity", "GroupInServiceInstances", "GroupPendingInstances"] :
+    metric if contains(var.asg_enabled_metrics, metric)
+  ]
+
+  dashboard_alarm_arns = concat(
+    aws_cloudwatch_metric_alarm.unhealthy_host_count[*].arn,
+    aws_cloudwatch_metric_alarm.target_response_time[*].arn,
+    values(aws_cloudwatch_metric_alarm.target_response_time_percentile)[*].arn,
+    aws_cloudwatch_metric_alarm.low_success_rate[*].arn,
+    aws_cloudwatch_metric_alarm.cpu_utilization[*].arn,
+    values(aws_cloudwatch_metric_alarm.saturation)[*].arn,
+    aws_cloudwatch_metric_alarm.active_connection_growth[*].arn,
+    aws_cloudwatch_metric_alarm.lcu_reservation_utilization[*].arn,
+    values(aws_cloudwatch_metric_alarm.anomaly)[*].arn,
+    aws_cloudwatch_metric_alarm.latency_scale_out[*].arn,
+  )
+
+  # Filtered with for/if rather than conditionals: the graphs have different
+  # types, so they can only live in a tuple.
+  dashboard_graphs = [
+    for graph in [
+      {
+        title = "Request rate"
+        stat  = "Sum"
+        metrics = [
+          concat(["AWS/ApplicationELB", "RequestCount"], local.dashboard_lb, [{ label = "Requests" }]),
+        ]
+        annotations = []
+      },
+      {
+        title = "Target response time (seconds)"
+        stat  = "Average"
+        metrics = [
+          for p in ["p50", "p90", "p99"] :
+          concat(["AWS/ApplicationELB", "TargetResponseTime"], local.dashboard_lb, [{ stat = p, label = p }])
+        ]
+        annotations = concat(
+          local.alarms_enabled ? [{ label = "Average latency alarm", value = local.alarm_target_response_time }] : [],
+          [
+            for percentile, threshold in var.alarm_target_response_time_percentiles :
+            { label = "${percentile} latency alarm", value = threshold } if local.alarms_enabled
+          ]
+        )
+      },
+      {
+        title = "HTTP errors: load balancer vs targets"
+        stat  = "Sum"
+        metrics = [
+          for metric in ["HTTPCode_ELB_4XX_Count", "HTTPCode_ELB_5XX_Count", "HTTPCode_Target_4XX_Count", "HTTPCode_Target_5XX_Count"] :
+          concat(["AWS/ApplicationELB", metric], local.dashboard_lb)
+        ]
+        annotations = []
+      },
+      {
+        title = "Target health"
+        stat  = "Maximum"
+        metrics = [
+          concat(["AWS/ApplicationELB", "HealthyHostCount"], local.dashboard_tg, [{ label = "Healthy" }]),
+          concat(["AWS/ApplicationELB", "UnHealthyHostCount"], local.dashboard_tg, [{ label = "Unhealthy" }]),
+        ]
+        annotations = local.alarms_enabled ? [{ label = "Unhealthy hosts alarm", value = var.alarm_unhealthy_host_threshold }] : []
+      },
+      {
+        title = "Load balancer capacity units"
+        stat  = "Average"
+        metrics = concat(
+          [concat(["AWS/ApplicationELB", "ConsumedLCUs"], local.dashboard_lb, [{ label = "Consumed" }])],
+          [
+            for metric in ["PeakLCUs", "ReservedLCUs"] :
+            concat(["AWS/ApplicationELB", metric], local.dashboard_lb, [{ stat = "Maximum" }])
+            if var.alb_minimum_capacity_units != null
+          ]
+        )
+        annotations = []
+      },
+      {
+        title = "Autoscaling group capacity"
+        stat  = "Average"
+        metrics = [
+          for metric in local.dashboard_asg_metrics :
+          ["AWS/AutoScaling", metric, "AutoScalingGroupName", aws_autoscaling_group.website.name]
+        ]
+        annotations = []
+        enabled     = length(local.dashboard_asg_metrics) > 0
+      },
+      {
+        title = "CPU utilization (%)"
+        stat  = "Average"
+        metrics = [
+          ["AWS/EC2", "CPUUtilization", "AutoScalingGroupName", aws_autoscaling_group.website.name, { label = "CPU" }],
+        ]
+        annotations = concat(
+          [{ label = "Autoscaling target", value = var.autoscaling_target_cpu_load }],
+          local.alarms_enabled ? [{ label = "High CPU alarm", value = local.alarm_cpu_threshold }] : []
+        )
+      },
+    ] : graph if lookup(graph, "enabled", true)
+  ]
+
+  # Graphs fill a two-column grid, the alarm status widget goes below them.
+  dashboard_widgets = concat(
+    [
+      for idx, graph in local.dashboard_graphs : {
+        type   = "metric"
+        x      = (idx % 2) * 12
+        y      = floor(idx / 2) * 6
+        width  = 12
+        height = 6
+        properties = {
+          title   = graph.title
+          region  = local.region
+          view    = "timeSeries"
+          stacked = false
+          period  = var.dashboard_period
+          stat    = graph.stat
+          metrics = graph.metrics
+          annotations = {
+            horizontal = graph.annotations
+          }
+        }
+      }
+    ],
+    [
+      for widget in [{
+        type   = "alarm"
+        x      = 0
+        y      = ceil(length(local.dashboard_graphs) / 2) * 6
+        width  = 24
+        height = 4
+        properties = {
+          title  = "Alarms"
+          alarms = local.dashboard_alarm_arns
+        }
+      }] : widget if length(local.dashboard_alarm_arns) > 0
+    ]
+  )
+}
+
+resource "aws_cloudwatch_dashboard" "website" {
+  count          = var.dashboard_enabled ? 1 : 0
+  dashboard_name = aws_autoscaling_group.website.name
+  dashboard_body = jsonencode({ widgets = local.dashboard_widgets })
+}
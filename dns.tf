@@ -15,10 +15,12 @@ resource "aws_route53_record" "extra" {
     }
   }
 
+  # With CloudFront enabled, records point at the distribution instead of the ALB.
+  # Route53 doesn't support evaluating target health for CloudFront aliases.
   alias {
-    name                   = aws_alb.website.dns_name
-    zone_id                = aws_alb.website.zone_id
-    evaluate_target_health = true
+    name                   = var.cloudfront_enabled ? aws_cloudfront_distribution.website[0].domain_name : aws_alb.website.dns_name
+    zone_id                = var.cloudfront_enabled ? aws_cloudfront_distribution.website[0].hosted_zone_id : aws_alb.website.zone_id
+    evaluate_target_health = !var.cloudfront_enabled
   }
 }
 
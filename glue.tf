@@ -41,6 +41,15 @@ resource "aws_athena_workgroup" "alb_access_logs" {
   force_destroy = var.alb_access_log_force_destroy
 
   configuration {
+    bytes_scanned_cutoff_per_query     = var.alb_access_log_athena_bytes_scanned_cutoff
+    enforce_workgroup_configuration    = true
+    publish_cloudwatch_metrics_enabled = var.alb_access_log_athena_publish_metrics
+
+    # Engine version 3 supports query result reuse.
+    engine_version {
+      selected_engine_version = "Athena engine version 3"
+    }
+
     result_configuration {
       output_location = "s3://${module.athena_results[0].bucket_name}/results/"
 
@@ -68,13 +77,28 @@ resource "aws_glue_catalog_table" "alb_access_logs" {
 
   table_type = "EXTERNAL_TABLE"
 
+  # Partition projection computes the day partitions from the query predicates,
+  # so Athena only lists the matching yyyy/MM/dd prefixes and no crawler or
+  # MSCK REPAIR is needed.
   parameters = {
-    "EXTERNAL"           = "TRUE"
-    "has_encrypted_data" = "true"
+    "EXTERNAL"                     = "TRUE"
+    "has_encrypted_data"           = "true"
+    "projection.enabled"           = "true"
+    "projection.day.type"          = "date"
+    "projection.day.format"        = "yyyy/MM/dd"
+    "projection.day.range"         = var.alb_access_log_athena_projection_range
+    "projection.day.interval"      = "1"
+    "projection.day.interval.unit" = "DAYS"
+    "storage.location.template"    = "${local.glue_table_location}$${day}"
+  }
+
+  partition_keys {
+    name = "day"
+    type = "string"
   }
 
   storage_descriptor {
-    location      = "s3://${aws_s3_bucket.access_log[0].id}/AWSLogs/${local.account_id}/elasticloadbalancing/${local.region}/"
+    location      = local.glue_table_location
     input_format  = "org.apache.hadoop.mapred.TextInputFormat"
     output_format = "org.apache.hadoop.hive.ql.io.HiveIgnoreKeyTextOutputFormat"
 
@@ -117,141 +141,12 @@ resource "aws_glue_catalog_table" "alb_access_logs" {
       }
     }
 
-    columns {
-      name = "type"
-      type = "string"
-    }
-    columns {
-      name = "time"
-      type = "string"
-    }
-    columns {
-      name = "elb"
-      type = "string"
-    }
-    columns {
-      name = "client_ip"
-      type = "string"
-    }
-    columns {
-      name = "client_port"
-      type = "int"
-    }
-    columns {
-      name = "target_ip"
-      type = "string"
-    }
-    columns {
-      name = "target_port"
-      type = "int"
-    }
-    columns {
-      name = "request_processing_time"
-      type = "double"
-    }
-    columns {
-      name = "target_processing_time"
-      type = "double"
-    }
-    columns {
-      name = "response_processing_time"
-      type = "double"
-    }
-    columns {
-      name = "elb_status_code"
-      type = "int"
-    }
-    columns {
-      name = "target_status_code"
-      type = "string"
-    }
-    columns {
-      name = "received_bytes"
-      type = "bigint"
-    }
-    columns {
-      name = "sent_bytes"
-      type = "bigint"
-    }
-    columns {
-      name = "request_verb"
-      type = "string"
-    }
-    columns {
-      name = "request_url"
-      type = "string"
-    }
-    columns {
-      name = "request_proto"
-      type = "string"
-    }
-    columns {
-      name = "user_agent"
-      type = "string"
-    }
-    columns {
-      name = "ssl_cipher"
-      type = "string"
-    }
-    columns {
-      name = "ssl_protocol"
-      type = "string"
-    }
-    columns {
-      name = "target_group_arn"
-      type = "string"
-    }
-    columns {
-      name = "trace_id"
-      type = "string"
-    }
-    columns {
-      name = "domain_name"
-      type = "string"
-    }
-    columns {
-      name = "chosen_cert_arn"
-      type = "string"
-    }
-    columns {
-      name = "matched_rule_priority"
-      type = "string"
-    }
-    columns {
-      name = "request_creation_time"
-      type = "string"
-    }
-    columns {
-      name = "actions_executed"
-      type = "string"
-    }
-    columns {
-      name = "redirect_url"
-      type = "string"
-    }
-    columns {
-      name = "lambda_error_reason"
-      type = "string"
-    }
-    columns {
-      name = "target_port_list"
-      type = "string"
-    }
-    columns {
-      name = "target_status_code_list"
-      type = "string"
-    }
-    columns {
-      name = "classification"
-      type = "string"
-    }
-    columns {
-      name = "classification_reason"
-      type = "string"
-    }
-    columns {
-      name = "conn_trace_id"
-      type = "string"
+    dynamic "columns" {
+      for_each = local.alb_access_log_columns
+      content {
+        name = columns.value.name
+        type = columns.value.type
+      }
     }
   }
 }
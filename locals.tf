@@ -51,6 +51,48 @@ locals {
   )
 
   min_elb_capacity = var.asg_min_elb_capacity != null ? var.asg_min_elb_capacity : var.asg_min_size
+
+  # The ASG uses a mixed instances policy for spot instances and/or multiple instance types.
+  mixed_instances_policy_enabled = (
+    var.on_demand_base_capacity != null
+    || length(var.instance_type_overrides) > 0
+    || var.instance_requirements != null
+  )
+  # Without on_demand_base_capacity the user didn't ask for spot instances,
+  # so multiple instance types alone must not turn the capacity into spot.
+  on_demand_percentage_above_base_capacity = (
+    var.on_demand_percentage_above_base_capacity != null
+    ? var.on_demand_percentage_above_base_capacity
+    : var.on_demand_base_capacity != null ? 0 : 100
+  )
+
+  # Warm pool metrics are added automatically when the warm pool is enabled,
+  # unless metrics collection is disabled altogether (empty asg_enabled_metrics).
+  asg_warm_pool_metrics = [
+    "WarmPoolDesiredCapacity",
+    "WarmPoolWarmedCapacity",
+    "WarmPoolPendingCapacity",
+    "WarmPoolTerminatingCapacity",
+    "WarmPoolTotalCapacity",
+    "WarmPoolMinSize",
+    "GroupAndWarmPoolDesiredCapacity",
+    "GroupAndWarmPoolTotalCapacity",
+  ]
+  asg_enabled_metrics = (
+    var.asg_warm_pool_enabled && length(var.asg_enabled_metrics) > 0
+    ? distinct(concat(var.asg_enabled_metrics, local.asg_warm_pool_metrics))
+    : var.asg_enabled_metrics
+  )
+
+  # Resource label for the ALBRequestCountPerTarget metric: <load-balancer>/<target-group>
+  alb_request_count_resource_label = "${aws_alb.website.arn_suffix}/${aws_alb_target_group.website.arn_suffix}"
+
+  # Predictive scaling forecasts against the same request count target as target tracking, unless overridden
+  autoscaling_predictive_target_request_count = try(
+    coalesce(var.autoscaling_predictive_target_request_count, var.autoscaling_target_request_count),
+    null
+  )
+
   # See https://docs.aws.amazon.com/elasticloadbalancing/latest/application/enable-access-logging.html
   elb_account_map = {
     "us-east-1"      = "127311923021"
@@ -90,6 +132,20 @@ locals {
     var.alb_healthcheck_uhealthy_threshold,
   )
 
+  # Root volume holds the OS plus the swap file sized relative to the instance RAM.
+  # Rounded up to whole GiB, which EBS requires for a fractional swap_size_multiplier.
+  # For the whole sizes of earlier releases, ceil() changes nothing.
+  root_volume_size = var.root_volume_size + ceil(
+    var.swap_size_multiplier * data.aws_ec2_instance_type.selected.memory_size / 1024
+  )
+
+  # gRPC health checks match gRPC status codes, not HTTP status codes.
+  alb_healthcheck_response_code_matcher = (
+    var.alb_healthcheck_response_code_matcher != null
+    ? var.alb_healthcheck_response_code_matcher
+    : var.target_group_protocol_version == "GRPC" ? "12" : "200-299"
+  )
+
   attach_tg_to_asg = coalesce(
     var.attach_target_group_to_asg,
     var.attach_tagret_group_to_asg,
@@ -116,6 +172,72 @@ locals {
     99
   )
 
+  # Percentile latency alarms: one per percentile, or one per percentile and
+  # target group when alarm_target_response_time_per_target_group is set.
+  # Keys are static names: ARN suffixes aren't known until the target groups exist.
+  # Backend pools can't be named "default" (see var.backend_pools).
+  alarm_latency_target_groups = var.alarm_target_response_time_per_target_group ? merge(
+    { default = aws_alb_target_group.website.arn_suffix },
+    { for name in keys(var.backend_pools) : name => aws_alb_target_group.pool[name].arn_suffix }
+  ) : { all = null }
+  alarm_latency_percentiles = local.alarms_enabled ? merge(
+    {},
+    [
+      for percentile, threshold in var.alarm_target_response_time_percentiles : {
+        for tg, arn_suffix in local.alarm_latency_target_groups :
+        (var.alarm_target_response_time_per_target_group ? "${percentile}-${tg}" : percentile) => {
+          percentile   = percentile
+          threshold    = threshold
+          target_group = arn_suffix
+        }
+      }
+    ]...
+  ) : {}
+
+  # Saturation alarms on load balancer metrics with a static threshold
+  alarm_saturation_enabled = local.alarms_enabled && var.alarm_saturation_enabled
+  alarm_saturation = {
+    for name, alarm in {
+      rejected_connections = {
+        metric_name = "RejectedConnectionCount"
+        threshold   = var.alarm_rejected_connection_threshold
+        description = "the load balancer rejects connections because it reached its maximum number of connections"
+      }
+      target_connection_errors = {
+        metric_name = "TargetConnectionErrorCount"
+        threshold   = var.alarm_target_connection_error_threshold
+        description = "the load balancer fails to establish connections to targets"
+      }
+      elb_503 = {
+        metric_name = "HTTPCode_ELB_503_Count"
+        threshold   = var.alarm_elb_503_threshold
+        description = "the load balancer returns 503, no healthy targets or no capacity"
+      }
+      consumed_lcus = {
+        metric_name = "ConsumedLCUs"
+        threshold   = var.alarm_consumed_lcu_threshold
+        description = "the load balancer consumes more capacity units than expected"
+      }
+    } : name => alarm
+    if local.alarm_saturation_enabled && alarm.threshold != null
+  }
+
+  # Anomaly detection alarms: both directions for traffic, only upwards for latency
+  alarm_anomaly_detection = local.alarms_enabled && var.alarm_anomaly_detection_enabled ? {
+    request_count = {
+      metric_name         = "RequestCount"
+      stat                = "Sum"
+      comparison_operator = "LessThanLowerOrGreaterThanUpperThreshold"
+      description         = "request count is outside the expected band"
+    }
+    target_response_time = {
+      metric_name         = "TargetResponseTime"
+      stat                = var.alarm_anomaly_detection_latency_statistic
+      comparison_operator = "GreaterThanUpperThreshold"
+      description         = "${var.alarm_anomaly_detection_latency_statistic} target response time is above the expected band"
+    }
+  } : {}
+
   # SNS topic ARNs to send alarms to
   alarm_sns_topics = concat(
     length(var.alarm_emails) > 0 ? [aws_sns_topic.alarms[0].arn] : [],
@@ -127,4 +249,54 @@ locals {
   glue_suffix   = local.glue_enabled ? random_string.glue_suffix[0].result : ""
   glue_database = "${replace(var.service_name, "-", "_")}_${local.glue_suffix}"
   glue_table    = "${replace(var.service_name, "-", "_")}_alb_access_logs"
+
+  glue_table_location = (
+    local.glue_enabled
+    ? "s3://${aws_s3_bucket.access_log[0].id}/AWSLogs/${local.account_id}/elasticloadbalancing/${local.region}/"
+    : null
+  )
+
+  # Daily Parquet compaction of the ALB access logs
+  compaction_enabled  = local.glue_enabled && var.alb_access_log_compaction_enabled
+  compaction_prefix   = "parquet/"
+  compaction_location = local.compaction_enabled ? "s3://${aws_s3_bucket.access_log[0].id}/${local.compaction_prefix}" : null
+
+  # Columns of the ALB access log tables, in the order of the input.regex
+  # capture groups. Shared by the raw and the Parquet tables.
+  alb_access_log_columns = [
+    { name = "type", type = "string" },
+    { name = "time", type = "string" },
+    { name = "elb", type = "string" },
+    { name = "client_ip", type = "string" },
+    { name = "client_port", type = "int" },
+    { name = "target_ip", type = "string" },
+    { name = "target_port", type = "int" },
+    { name = "request_processing_time", type = "double" },
+    { name = "target_processing_time", type = "double" },
+    { name = "response_processing_time", type = "double" },
+    { name = "elb_status_code", type = "int" },
+    { name = "target_status_code", type = "string" },
+    { name = "received_bytes", type = "bigint" },
+    { name = "sent_bytes", type = "bigint" },
+    { name = "request_verb", type = "string" },
+    { name = "request_url", type = "string" },
+    { name = "request_proto", type = "string" },
+    { name = "user_agent", type = "string" },
+    { name = "ssl_cipher", type = "string" },
+    { name = "ssl_protocol", type = "string" },
+    { name = "target_group_arn", type = "string" },
+    { name = "trace_id", type = "string" },
+    { name = "domain_name", type = "string" },
+    { name = "chosen_cert_arn", type = "string" },
+    { name = "matched_rule_priority", type = "string" },
+    { name = "request_creation_time", type = "string" },
+    { name = "actions_executed", type = "string" },
+    { name = "redirect_url", type = "string" },
+    { name = "lambda_error_reason", type = "string" },
+    { name = "target_port_list", type = "string" },
+    { name = "target_status_code_list", type = "string" },
+    { name = "classification", type = "string" },
+    { name = "classification_reason", type = "string" },
+    { name = "conn_trace_id", type = "string" },
+  ]
 }
@@ -3,6 +3,9 @@ resource "aws_alb" "website" {
   enable_deletion_protection = var.enable_deletion_protection
   subnets                    = var.subnets
   idle_timeout               = var.alb_idle_timeout
+  enable_http2               = var.alb_enable_http2
+  client_keep_alive          = var.alb_client_keep_alive
+  desync_mitigation_mode     = var.alb_desync_mitigation_mode
   # ALB is internal if subnets don't auto-assign public IPs
   # Otherwise, it's internet-facing (publicly accessible)
   internal                   = !data.aws_subnet.selected.map_public_ip_on_launch
@@ -10,6 +13,12 @@ resource "aws_alb" "website" {
   security_groups = [
     aws_security_group.alb.id
   ]
+  dynamic "minimum_load_balancer_capacity" {
+    for_each = var.alb_minimum_capacity_units == null ? [] : [var.alb_minimum_capacity_units]
+    content {
+      capacity_units = minimum_load_balancer_capacity.value
+    }
+  }
   dynamic "access_logs" {
     for_each = var.alb_access_log_enabled ? [{}] : []
     content {
@@ -63,7 +72,7 @@ resource "aws_lb_listener" "ssl" {
   port              = 443
   protocol          = "HTTPS"
   # https://docs.aws.amazon.com/elasticloadbalancing/latest/application/describe-ssl-policies.html
-  ssl_policy      = "ELBSecurityPolicy-TLS13-1-2-Ext1-2021-06"
+  ssl_policy      = var.alb_ssl_policy
   certificate_arn = aws_acm_certificate.website.arn
   default_action {
     type = "fixed-response"
@@ -89,6 +98,7 @@ resource "aws_alb_listener_rule" "website" {
   listener_arn = aws_lb_listener.ssl.arn
   # Priority is fixed at 99, leaving room for users to add custom rules:
   # - Priorities 1-98: Higher priority (evaluated before this rule)
+  #   Backend pool rules (backend_pools.tf) take priorities from 98 down by default.
   # - Priorities 100+: Lower priority (evaluated after this rule)
   priority = 99
   action {
@@ -114,11 +124,14 @@ resource "aws_alb_listener_rule" "website" {
 resource "aws_alb_target_group" "website" {
   port                 = var.target_group_port
   protocol             = var.target_group_protocol
+  protocol_version     = var.target_group_protocol_version
   target_type          = var.target_group_type
   vpc_id               = data.aws_subnet.selected.vpc_id
   deregistration_delay = var.target_group_deregistration_delay
 
-  load_balancing_algorithm_type = var.load_balancing_algorithm_type
+  load_balancing_algorithm_type     = var.load_balancing_algorithm_type
+  load_balancing_anomaly_mitigation = var.load_balancing_algorithm_type == "weighted_random" ? (var.load_balancing_anomaly_mitigation ? "on" : "off") : null
+  slow_start                        = var.target_group_slow_start
   stickiness {
     type    = "lb_cookie"
     enabled = var.stickiness_enabled
@@ -133,7 +146,7 @@ resource "aws_alb_target_group" "website" {
     unhealthy_threshold = local.unhealthy_threshold
     interval            = var.alb_healthcheck_interval
     timeout             = var.alb_healthcheck_timeout
-    matcher             = var.alb_healthcheck_response_code_matcher
+    matcher             = local.alb_healthcheck_response_code_matcher
   }
   tags = merge(
     local.default_module_tags,
@@ -142,5 +155,14 @@ resource "aws_alb_target_group" "website" {
       VantaContainsEPHI : false
     }
   )
-
+  lifecycle {
+    precondition {
+      condition     = !var.load_balancing_anomaly_mitigation || var.load_balancing_algorithm_type == "weighted_random"
+      error_message = "load_balancing_anomaly_mitigation requires load_balancing_algorithm_type = \"weighted_random\"."
+    }
+    precondition {
+      condition     = var.target_group_slow_start == 0 || var.load_balancing_algorithm_type != "weighted_random"
+      error_message = "target_group_slow_start isn't supported with load_balancing_algorithm_type = \"weighted_random\"."
+    }
+  }
 }
@@ -8,6 +8,59 @@ output "asg_name" {
   value       = aws_autoscaling_group.website.name
 }
 
+output "asg_warm_pool" {
+  description = "Warm pool configuration of the autoscaling group (null if the warm pool is not enabled)."
+  value = var.asg_warm_pool_enabled ? {
+    pool_state                  = aws_autoscaling_warm_pool.website[0].pool_state
+    min_size                    = aws_autoscaling_warm_pool.website[0].min_size
+    max_group_prepared_capacity = aws_autoscaling_warm_pool.website[0].max_group_prepared_capacity
+    reuse_on_scale_in           = var.asg_warm_pool_reuse_on_scale_in
+  } : null
+}
+
+output "autoscaling_policy_arns" {
+  description = "ARNs of the autoscaling policies attached to the ASG (null if a policy is not enabled)."
+  value = {
+    cpu_load      = var.autoscaling_cpu_policy_enabled ? aws_autoscaling_policy.cpu_load[0].arn : null
+    request_count = var.autoscaling_target_request_count != null ? aws_autoscaling_policy.request_count[0].arn : null
+    predictive    = var.autoscaling_predictive_mode != null ? aws_autoscaling_policy.predictive[0].arn : null
+    latency       = var.autoscaling_latency_threshold != null ? aws_autoscaling_policy.latency[0].arn : null
+  }
+}
+
+output "autoscaling_scheduled_actions" {
+  description = "ARNs of the scheduled scaling actions, keyed by name"
+  value       = { for name, action in aws_autoscaling_schedule.website : name => action.arn }
+}
+
+output "backend_pools" {
+  description = "Map of additional backend pools with their target group, listener rule priority and ASG name."
+  value = {
+    for name, pool in local.backend_pools : name => {
+      target_group_arn        = aws_alb_target_group.pool[name].arn
+      target_group_arn_suffix = aws_alb_target_group.pool[name].arn_suffix
+      listener_rule_arn       = aws_alb_listener_rule.pool[name].arn
+      priority                = pool.priority
+      asg_name                = aws_autoscaling_group.pool[name].name
+    }
+  }
+}
+
+output "cloudfront_distribution_id" {
+  description = "ID of the CloudFront distribution (null if CloudFront is not enabled)."
+  value       = var.cloudfront_enabled ? aws_cloudfront_distribution.website[0].id : null
+}
+
+output "cloudfront_domain_name" {
+  description = "Domain name of the CloudFront distribution (null if CloudFront is not enabled)."
+  value       = var.cloudfront_enabled ? aws_cloudfront_distribution.website[0].domain_name : null
+}
+
+output "dashboard_name" {
+  description = "Name of the CloudWatch dashboard (null if not enabled)"
+  value       = var.dashboard_enabled ? aws_cloudwatch_dashboard.website[0].dashboard_name : null
+}
+
 output "dns_name" {
   description = "DNS name of the load balancer."
   value       = aws_alb.website.dns_name
@@ -44,10 +97,27 @@ output "target_group_arn_suffix" {
 }
 
 output "load_balancing_algorithm_type" {
-  description = "Load balancing algorithm used by the target group (round_robin or least_outstanding_requests)."
+  description = "Load balancing algorithm used by the target group (round_robin, least_outstanding_requests or weighted_random)."
   value       = aws_alb_target_group.website.load_balancing_algorithm_type
 }
 
+output "alb_capacity_units" {
+  description = <<-EOF
+    Capacity of the load balancer: reserved LCUs (null if there is no reservation)
+    and the CloudWatch metrics to compare consumed and peak LCUs against it.
+  EOF
+  value = {
+    reserved = var.alb_minimum_capacity_units
+    metrics = {
+      namespace     = "AWS/ApplicationELB"
+      load_balancer = aws_alb.website.arn_suffix
+      consumed      = "ConsumedLCUs"
+      peak          = "PeakLCUs"
+      reserved      = "ReservedLCUs"
+    }
+  }
+}
+
 output "zone_id" {
   description = "Zone id where A records are created for the service."
   value       = aws_alb.website.zone_id
@@ -151,11 +221,45 @@ output "athena_workgroup" {
   value       = local.glue_enabled ? aws_athena_workgroup.alb_access_logs[0].name : null
 }
 
+output "athena_named_queries" {
+  description = "Map of saved Athena query names to their IDs (empty if not enabled)"
+  value       = { for k, q in aws_athena_named_query.alb_access_logs : q.name => q.id }
+}
+
+output "alb_access_log_parquet_table" {
+  description = "Name of the Glue catalog table with compacted Parquet ALB access logs (null if not enabled)"
+  value       = local.compaction_enabled ? aws_glue_catalog_table.alb_access_logs_parquet[0].name : null
+}
+
+output "alb_access_log_compaction_job" {
+  description = "Name of the Glue job that compacts ALB access logs into Parquet (null if not enabled)"
+  value       = local.compaction_enabled ? aws_glue_job.compaction[0].name : null
+}
+
 output "athena_results_bucket" {
   description = "S3 bucket where Athena query results are stored (null if not enabled)"
   value       = local.glue_enabled ? module.athena_results[0].bucket_name : null
 }
 
+output "latency_percentile_alarm_arns" {
+  description = "ARNs of the percentile latency alarms, keyed by percentile (and target group, if alarmed per target group)"
+  value       = { for k, alarm in aws_cloudwatch_metric_alarm.target_response_time_percentile : k => alarm.arn }
+}
+
+output "saturation_alarm_arns" {
+  description = "ARNs of the load balancer saturation alarms that were created, keyed by alarm"
+  value = merge(
+    { for k, alarm in aws_cloudwatch_metric_alarm.saturation : k => alarm.arn },
+    { for alarm in aws_cloudwatch_metric_alarm.active_connection_growth : "active_connection_growth" => alarm.arn },
+    { for alarm in aws_cloudwatch_metric_alarm.lcu_reservation_utilization : "lcu_reservation_utilization" => alarm.arn }
+  )
+}
+
+output "anomaly_alarm_arns" {
+  description = "ARNs of the anomaly detection alarms that were created, keyed by metric"
+  value       = { for k, alarm in aws_cloudwatch_metric_alarm.anomaly : k => alarm.arn }
+}
+
 output "cloudwatch_alarm_arns" {
   description = "ARNs of CloudWatch alarms created for ALB and ASG monitoring"
   value = {
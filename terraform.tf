@@ -3,7 +3,7 @@ terraform {
   required_providers {
     aws = {
       source  = "hashicorp/aws"
-      version = ">= 5.11, < 7.0"
+      version = ">= 5.86, < 7.0"
       configuration_aliases = [
         aws.dns # AWS provider for DNS
       ]
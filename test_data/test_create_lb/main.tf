@@ -39,4 +39,15 @@ module "lb" {
   alb_access_log_force_destroy  = true
   alb_access_log_athena_enabled = true
   alarm_emails                  = var.alarm_emails
+
+  asg_warm_pool_enabled                     = true
+  asg_warm_pool_max_group_prepared_capacity = 4
+  asg_warm_pool_reuse_on_scale_in           = true
+
+  alarm_saturation_enabled        = true
+  dashboard_enabled               = true
+  alarm_anomaly_detection_enabled = true
+  alarm_target_response_time_percentiles = {
+    p99 = 5
+  }
 }
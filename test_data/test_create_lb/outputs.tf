@@ -14,6 +14,10 @@ output "asg_name" {
   value = module.lb.asg_name
 }
 
+output "asg_warm_pool" {
+  value = module.lb.asg_warm_pool
+}
+
 output "instance_profile_name" {
   value = module.lb.instance_profile_name
 }
@@ -38,6 +42,16 @@ output "cloudwatch_alarm_arns" {
   value       = module.lb.cloudwatch_alarm_arns
 }
 
+output "latency_percentile_alarm_arns" {
+  description = "ARNs of the percentile latency alarms"
+  value       = module.lb.latency_percentile_alarm_arns
+}
+
+output "saturation_alarm_arns" {
+  description = "ARNs of the load balancer saturation alarms"
+  value       = module.lb.saturation_alarm_arns
+}
+
 # Athena access log outputs
 output "alb_access_log_glue_database" {
   description = "Name of the Glue catalog database for ALB access logs"
@@ -63,3 +77,13 @@ output "client_instance_id" {
   description = "Instance ID of the test client EC2 instance"
   value       = aws_instance.client.id
 }
+
+output "anomaly_alarm_arns" {
+  description = "ARNs of the anomaly detection alarms"
+  value       = module.lb.anomaly_alarm_arns
+}
+
+output "dashboard_name" {
+  description = "Name of the CloudWatch dashboard"
+  value       = module.lb.dashboard_name
+}
@@ -15,6 +15,7 @@ module "lb" {
   asg_name                     = var.asg_name
   asg_min_size                 = 2
   on_demand_base_capacity      = 1
+  capacity_rebalance           = true
   internet_gateway_id          = var.internet_gateway_id
   zone_id                      = var.zone_id
   dns_a_records                = var.dns_a_records
@@ -23,4 +24,8 @@ module "lb" {
   health_check_type            = "ELB"
   instance_profile_permissions = data.aws_iam_policy_document.webserver_permissions.json
   instance_role_name           = var.instance_role_name
+  instance_type_overrides = [
+    { instance_type = "t3.micro" },
+    { instance_type = "t3a.micro" },
+  ]
 }
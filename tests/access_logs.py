@@ -0,0 +1,57 @@
+"""
+Sample ALB access log lines and the access log table as defined in Terraform,
+shared by the unit tests of the ``website_pod`` package.
+"""
+
+import json
+from os import path as osp
+
+import hcl2
+
+REPO_ROOT = osp.dirname(osp.dirname(osp.abspath(__file__)))
+
+LOG_LINE = (
+    "https 2025-01-31T22:23:00.186641Z app/my-loadbalancer/50dc6c495c0c9188 "
+    "192.168.131.39:2817 10.0.0.1:80 0.086 0.048 0.037 200 200 0 57 "
+    '"GET https://www.example.com:443/ HTTP/1.1" "curl/7.46.0" '
+    "ECDHE-RSA-AES128-GCM-SHA256 TLSv1.2 "
+    "arn:aws:elasticloadbalancing:us-east-1:123456789012:targetgroup/my-targets/73e2d6bc24d8a067 "
+    '"Root=1-58337281-1d84f3d73c47ec4e58577259" "www.example.com" '
+    '"arn:aws:acm:us-east-1:123456789012:certificate/12345678-1234-1234-1234-123456789012" '
+    '1 2025-01-31T22:22:48.364000Z "forward" "-" "-" "10.0.0.1:80" "200" "-" "-" '
+    "TID_1234abcd5678ef90"
+)
+# A request that never reached a target.
+LOG_LINE_NO_TARGET = (
+    "https 2025-01-31T22:24:00.186641Z app/my-loadbalancer/50dc6c495c0c9188 "
+    "192.168.131.39:2818 - -1 -1 -1 503 - 0 0 "
+    '"GET https://www.example.com:443/health HTTP/1.1" "curl/7.46.0" '
+    "ECDHE-RSA-AES128-GCM-SHA256 TLSv1.2 "
+    "arn:aws:elasticloadbalancing:us-east-1:123456789012:targetgroup/my-targets/73e2d6bc24d8a067 "
+    '"Root=1-58337281-1d84f3d73c47ec4e58577260" "www.example.com" '
+    '"arn:aws:acm:us-east-1:123456789012:certificate/12345678-1234-1234-1234-123456789012" '
+    '0 2025-01-31T22:24:00.100000Z "forward" "-" "-" "-" "-" "-" "-" '
+    "TID_1234abcd5678ef91"
+)
+
+
+def terraform_table_definition():
+    """Return the input.regex and columns of the raw access log table in Terraform."""
+    with open(osp.join(REPO_ROOT, "locals.tf")) as fp:
+        columns = hcl2.load(fp)["locals"][0]["alb_access_log_columns"]
+    with open(osp.join(REPO_ROOT, "glue.tf")) as fp:
+        resources = hcl2.load(fp)["resource"]
+    table = next(
+        res['"aws_glue_catalog_table"']['"alb_access_logs"']
+        for res in resources
+        if '"aws_glue_catalog_table"' in res
+    )
+    expression = table["storage_descriptor"][0]["ser_de_info"][0]["parameters"][
+        '"input.regex"'
+    ]
+    # ${join(" ", [...])}
+    parts = json.loads(expression[len('${join(" ", ') : -len(")}")])
+    return " ".join(parts), [
+        {"Name": json.loads(col["name"]), "Type": json.loads(col["type"])}
+        for col in columns
+    ]
@@ -0,0 +1,153 @@
+import gzip
+import io
+
+import boto3
+import pyarrow.parquet as pq
+import pytest
+from moto import mock_aws
+
+from tests.access_logs import LOG_LINE, LOG_LINE_NO_TARGET, terraform_table_definition
+from website_pod.compaction import SourceTable, compact_day, parse_args, parse_lines
+
+REGION = "us-east-1"
+DATABASE = "website_abc123"
+TABLE = "website_alb_access_logs"
+LOG_PREFIX = "AWSLogs/123456789012/elasticloadbalancing/us-east-1/"
+
+
+def put_log_object(s3_client, bucket, key, lines):
+    s3_client.put_object(
+        Bucket=bucket,
+        Key=key,
+        Body=gzip.compress(("\n".join(lines) + "\n").encode()),
+    )
+
+
+@pytest.fixture
+def aws(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", REGION)
+    with mock_aws():
+        s3_client = boto3.client("s3", region_name=REGION)
+        glue_client = boto3.client("glue", region_name=REGION)
+        s3_client.create_bucket(Bucket="access-logs")
+        regex, columns = terraform_table_definition()
+        glue_client.create_database(DatabaseInput={"Name": DATABASE})
+        glue_client.create_table(
+            DatabaseName=DATABASE,
+            TableInput={
+                "Name": TABLE,
+                "StorageDescriptor": {
+                    "Columns": columns,
+                    "Location": f"s3://access-logs/{LOG_PREFIX}",
+                    "SerdeInfo": {
+                        "SerializationLibrary": "org.apache.hadoop.hive.serde2.RegexSerDe",
+                        "Parameters": {"input.regex": regex},
+                    },
+                },
+            },
+        )
+        yield s3_client, glue_client
+
+
+def test_compact_day(aws):
+    s3_client, glue_client = aws
+    put_log_object(
+        s3_client,
+        "access-logs",
+        f"{LOG_PREFIX}2025/01/31/part1.log.gz",
+        [LOG_LINE, "not an access log line"],
+    )
+    put_log_object(
+        s3_client,
+        "access-logs",
+        f"{LOG_PREFIX}2025/01/31/part2.log.gz",
+        [LOG_LINE_NO_TARGET],
+    )
+    put_log_object(
+        s3_client, "access-logs", f"{LOG_PREFIX}2025/02/01/part1.log.gz", [LOG_LINE]
+    )
+
+    stats = compact_day(
+        s3_client,
+        glue_client,
+        database=DATABASE,
+        table=TABLE,
+        day="2025/01/31",
+        target_location="s3://access-logs/parquet/",
+        batch_size=1,
+    )
+    assert stats == {
+        "objects": 2,
+        "rows": 2,
+        "skipped": 1,
+        "key": "parquet/2025/01/31/alb-access-logs.parquet",
+    }
+
+    body = s3_client.get_object(Bucket="access-logs", Key=stats["key"])["Body"]
+    table = pq.read_table(io.BytesIO(body.read()))
+    _, columns = terraform_table_definition()
+    assert table.column_names == [col["Name"] for col in columns]
+    assert str(table.schema.field("client_port").type) == "int32"
+    assert str(table.schema.field("sent_bytes").type) == "int64"
+    assert str(table.schema.field("target_processing_time").type) == "double"
+
+    rows = table.to_pylist()
+    assert rows[0]["target_ip"] == "10.0.0.1"
+    assert rows[0]["target_port"] == 80
+    assert rows[0]["target_processing_time"] == 0.048
+    assert rows[0]["elb_status_code"] == 200
+    assert rows[0]["request_url"] == "https://www.example.com:443/"
+    assert rows[0]["conn_trace_id"] == "TID_1234abcd5678ef90"
+    assert rows[1]["target_ip"] == ""
+    assert rows[1]["target_port"] is None
+    assert rows[1]["target_processing_time"] == -1
+    assert rows[1]["elb_status_code"] == 503
+
+
+def test_compact_day_without_logs(aws):
+    s3_client, glue_client = aws
+    stats = compact_day(
+        s3_client,
+        glue_client,
+        database=DATABASE,
+        table=TABLE,
+        day="2025/01/31",
+        target_location="s3://access-logs/parquet/",
+    )
+    assert stats["key"] is None
+    assert "Contents" not in s3_client.list_objects_v2(
+        Bucket="access-logs", Prefix="parquet/"
+    )
+
+
+def test_parse_lines_out_of_range():
+    regex, columns = terraform_table_definition()
+    source = SourceTable(location="s3://access-logs/", regex=regex, columns=columns)
+    lines = [
+        LOG_LINE.replace("10.0.0.1:80", "10.0.0.1:2147483648"),
+        LOG_LINE.replace(" 0 57 ", " 0 99999999999999999999 "),
+    ]
+    ((batch, skipped),) = parse_lines(lines, source)
+    rows = batch.to_pylist()
+    assert skipped == 0
+    assert rows[0]["target_port"] is None
+    assert rows[0]["sent_bytes"] == 57
+    assert rows[1]["target_port"] == 80
+    assert rows[1]["sent_bytes"] is None
+
+
+def test_parse_args_day():
+    glue_args = [
+        "--source_database",
+        DATABASE,
+        "--source_table",
+        TABLE,
+        "--target_location",
+        "s3://access-logs/parquet/",
+        "--job-bookmark-option",
+        "job-bookmark-disable",
+    ]
+    assert parse_args(glue_args + ["--day", "2025-01-31"]).day == "2025/01/31"
+    assert len(parse_args(glue_args).day) == len("yyyy/MM/dd")
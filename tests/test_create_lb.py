@@ -17,6 +17,7 @@ from tests.conftest import (
     TEST_TIMEOUT,
     UBUNTU_CODENAME,
 )
+from website_pod.parser import COLUMNS, REGEX
 
 
 def wait_for_athena_query(athena_client, query_execution_id, seconds=120):
@@ -330,6 +331,20 @@ def test_lb(
         ), f"Instance's name should be set to {instance_name}."
         LOG.info("✓ Instance tags verified: Name=%s", instance_name)
 
+        # Verify the warm pool
+        warm_pool = tf_output["asg_warm_pool"]["value"]
+        assert warm_pool is not None, "asg_warm_pool output should be set"
+        response = autoscaling_client.describe_warm_pool(AutoScalingGroupName=asg_name)
+        LOG.debug("describe_warm_pool(%s): %s", asg_name, pformat(response, indent=4))
+        wp_config = response["WarmPoolConfiguration"]
+        assert wp_config["PoolState"] == warm_pool["pool_state"] == "Stopped"
+        assert (
+            wp_config["MaxGroupPreparedCapacity"]
+            == warm_pool["max_group_prepared_capacity"]
+        )
+        assert wp_config["InstanceReusePolicy"]["ReuseOnScaleIn"] is True
+        LOG.info("✓ Warm pool verified: %s", wp_config)
+
         # Verify Vanta compliance CloudWatch alarms
         LOG.info("=" * 80)
         LOG.info("Verifying CloudWatch alarms for Vanta compliance")
@@ -430,6 +445,48 @@ def test_lb(
         ), "Latency alarm should send to SNS topic"
         LOG.info("✓ Latency alarm configuration verified")
 
+        # 7a. Verify p99 latency alarm
+        p99_arn = tf_output["latency_percentile_alarm_arns"]["value"]["p99"]
+        p99_alarm = cw_client.describe_alarms(AlarmNames=[p99_arn.split(":")[-1]])[
+            "MetricAlarms"
+        ][0]
+        assert p99_alarm["ExtendedStatistic"] == "p99", p99_alarm
+        assert p99_alarm["Threshold"] == 5, p99_alarm
+        assert topic_arn in p99_alarm["AlarmActions"]
+        LOG.info("✓ p99 latency alarm configuration verified")
+
+        # 7b. Verify saturation alarms
+        saturation_arns = tf_output["saturation_alarm_arns"]["value"]
+        assert set(saturation_arns) == {
+            "rejected_connections",
+            "target_connection_errors",
+            "elb_503",
+            "active_connection_growth",
+        }, saturation_arns
+        LOG.info("✓ Saturation alarms exist")
+
+        # 7c. Verify anomaly detection alarms
+        anomaly_arns = tf_output["anomaly_alarm_arns"]["value"]
+        assert set(anomaly_arns) == {"request_count", "target_response_time"}
+        anomaly_alarm = cw_client.describe_alarms(
+            AlarmNames=[anomaly_arns["target_response_time"].split(":")[-1]]
+        )["MetricAlarms"][0]
+        assert anomaly_alarm["ComparisonOperator"] == "GreaterThanUpperThreshold"
+        assert anomaly_alarm["ThresholdMetricId"] == "band", anomaly_alarm
+        assert topic_arn in anomaly_alarm["AlarmActions"]
+        LOG.info("✓ Anomaly detection alarms configuration verified")
+
+        # 7d. Verify the dashboard
+        dashboard = json.loads(
+            cw_client.get_dashboard(DashboardName=tf_output["dashboard_name"]["value"])[
+                "DashboardBody"
+            ]
+        )
+        widget_types = [widget["type"] for widget in dashboard["widgets"]]
+        assert widget_types.count("metric") == 7, widget_types
+        assert widget_types.count("alarm") == 1, widget_types
+        LOG.info("✓ Dashboard verified")
+
         # 8. Verify success rate alarm (uses metric math)
         success_alarm = [
             a for a in alarms.values() if "low-success-rate" in a["AlarmName"]
@@ -488,6 +545,16 @@ def test_lb(
         ), f"Table location missing elasticloadbalancing path: {location}"
         LOG.info("Glue table exists: %s (location: %s)", glue_table, location)
 
+        # Verify day partition projection
+        partition_keys = {col["Name"]: col["Type"] for col in table["PartitionKeys"]}
+        assert partition_keys == {"day": "string"}, partition_keys
+        table_params = table["Parameters"]
+        assert table_params.get("projection.enabled") == "true"
+        assert table_params.get("projection.day.type") == "date"
+        assert table_params.get("projection.day.format") == "yyyy/MM/dd"
+        assert table_params.get("storage.location.template") == location + "${day}"
+        LOG.info("Glue table partition projection verified")
+
         serde = table["StorageDescriptor"]["SerdeInfo"]["SerializationLibrary"]
         assert "RegexSerDe" in serde, f"Unexpected SerDe: {serde}"
 
@@ -495,47 +562,15 @@ def test_lb(
         assert serde_params.get(
             "input.regex"
         ), "SerDe input.regex parameter is missing or empty"
+        assert (
+            serde_params["input.regex"] == REGEX
+        ), "Glue input.regex differs from website_pod.parser.REGEX"
 
         # Verify all ALB log columns exist with correct types
         actual_columns = {
             col["Name"]: col["Type"] for col in table["StorageDescriptor"]["Columns"]
         }
-        expected_columns = {
-            "type": "string",
-            "time": "string",
-            "elb": "string",
-            "client_ip": "string",
-            "client_port": "int",
-            "target_ip": "string",
-            "target_port": "int",
-            "request_processing_time": "double",
-            "target_processing_time": "double",
-            "response_processing_time": "double",
-            "elb_status_code": "int",
-            "target_status_code": "string",
-            "received_bytes": "bigint",
-            "sent_bytes": "bigint",
-            "request_verb": "string",
-            "request_url": "string",
-            "request_proto": "string",
-            "user_agent": "string",
-            "ssl_cipher": "string",
-            "ssl_protocol": "string",
-            "target_group_arn": "string",
-            "trace_id": "string",
-            "domain_name": "string",
-            "chosen_cert_arn": "string",
-            "matched_rule_priority": "string",
-            "request_creation_time": "string",
-            "actions_executed": "string",
-            "redirect_url": "string",
-            "lambda_error_reason": "string",
-            "target_port_list": "string",
-            "target_status_code_list": "string",
-            "classification": "string",
-            "classification_reason": "string",
-            "conn_trace_id": "string",
-        }
+        expected_columns = dict(COLUMNS)
         missing = set(expected_columns) - set(actual_columns)
         assert not missing, f"Glue table is missing columns: {sorted(missing)}"
         wrong_type = {
@@ -562,6 +597,13 @@ def test_lb(
             f"Workgroup output location {output_location!r} "
             f"does not reference results bucket {results_bucket!r}"
         )
+        assert wg["Configuration"]["BytesScannedCutoffPerQuery"] == 10737418240
+        assert wg["Configuration"]["EnforceWorkGroupConfiguration"]
+        assert wg["Configuration"]["PublishCloudWatchMetricsEnabled"]
+        named_query_ids = athena_client.list_named_queries(WorkGroup=athena_workgroup)[
+            "NamedQueryIds"
+        ]
+        assert len(named_query_ids) == 5, named_query_ids
         LOG.info(
             "Athena workgroup exists: %s (output: %s)",
             athena_workgroup,
@@ -608,7 +650,9 @@ def test_lb(
         LOG.info("Waiting for access log entry to appear in Athena...")
         select_query = (
             f"SELECT type, time, elb, client_ip, request_url "
-            f"FROM {glue_database}.{glue_table} LIMIT 1"
+            f"FROM {glue_database}.{glue_table} "
+            f"WHERE day >= date_format(current_date - interval '1' day, '%Y/%m/%d') "
+            f"LIMIT 1"
         )
         with timeout(600):
             while True:
@@ -0,0 +1,173 @@
+import gzip
+import logging
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+
+import pyarrow.parquet as pq
+import pytest
+from moto import mock_aws
+
+from tests.access_logs import LOG_LINE, LOG_LINE_NO_TARGET
+from website_pod.ingest import (
+    IngestStats,
+    Watermark,
+    ingest,
+    main,
+    make_s3_client,
+)
+
+LOG = logging.getLogger(__name__)
+BUCKET = "access-logs"
+PREFIX = "AWSLogs/123456789012/elasticloadbalancing/us-east-1/"
+LATER = datetime.now(timezone.utc) + timedelta(days=1)
+
+
+def log_key(day, minute, node="10.0.0.1"):
+    return (
+        f"{PREFIX}{day}/123456789012_elasticloadbalancing_us-east-1_"
+        f"app.my-loadbalancer.50dc6c495c0c9188_{day.replace('/', '')}T00{minute:02d}Z_"
+        f"{node}_abcdef.log.gz"
+    )
+
+
+def put_log_object(s3_client, key, lines=(LOG_LINE,)):
+    s3_client.put_object(
+        Bucket=BUCKET,
+        Key=key,
+        Body=gzip.compress(("\n".join(lines) + "\n").encode()),
+    )
+
+
+@pytest.fixture
+def s3_client(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    with mock_aws():
+        client = make_s3_client(max_workers=4, region_name="us-east-1")
+        client.create_bucket(Bucket=BUCKET)
+        yield client
+
+
+def run(s3_client, watermark, **kwargs):
+    return dict(ingest(s3_client, BUCKET, PREFIX, watermark, max_workers=4, **kwargs))
+
+
+def test_ingest(s3_client):
+    keys = [
+        log_key("2025/01/31", 5),
+        log_key("2025/01/31", 10),
+        log_key("2025/02/01", 5),
+    ]
+    for key in keys:
+        put_log_object(s3_client, key, [LOG_LINE, LOG_LINE_NO_TARGET])
+
+    watermark = Watermark()
+    stats = IngestStats()
+    objects = run(s3_client, watermark, now=LATER, stats=stats)
+    assert sorted(objects) == keys
+    assert objects[keys[0]] == f"{LOG_LINE}\n{LOG_LINE_NO_TARGET}\n".encode()
+    assert stats.objects == 3
+    assert stats.bytes == 3 * len(objects[keys[0]])
+    assert watermark == Watermark(start_after=keys[-1], seen=set())
+
+    # Nothing is fetched again, only the new object
+    assert run(s3_client, watermark, now=LATER) == {}
+    put_log_object(s3_client, log_key("2025/02/01", 10))
+    assert list(run(s3_client, watermark, now=LATER)) == [log_key("2025/02/01", 10)]
+
+
+def test_ingest_unsettled_objects(s3_client):
+    keys = [log_key("2025/01/31", 5), log_key("2025/01/31", 10, node="10.0.0.2")]
+    for key in keys:
+        put_log_object(s3_client, key)
+
+    # The objects were just written, a smaller key may still arrive
+    watermark = Watermark()
+    assert sorted(run(s3_client, watermark)) == keys
+    assert watermark == Watermark(start_after="", seen=set(keys))
+    assert run(s3_client, watermark) == {}
+
+    late_key = log_key("2025/01/31", 10, node="10.0.0.1")
+    put_log_object(s3_client, late_key)
+    assert list(run(s3_client, watermark)) == [late_key]
+
+    # Once settled, the watermark moves past them
+    assert run(s3_client, watermark, now=LATER) == {}
+    assert watermark == Watermark(start_after=keys[-1], seen=set())
+
+
+def test_ingest_interrupted(s3_client):
+    keys = [log_key("2025/01/31", minute) for minute in range(10)]
+    for key in keys:
+        put_log_object(s3_client, key)
+
+    watermark = Watermark()
+    objects = ingest(s3_client, BUCKET, PREFIX, watermark, max_workers=2, now=LATER)
+    consumed = [key for key, _ in islice(objects, 3)]
+    objects.close()
+    # The third object was yielded, but the caller never asked for the next one
+    confirmed = {key for key in keys if key <= watermark.start_after} | watermark.seen
+    assert confirmed == set(consumed[:2])
+
+    remaining = run(s3_client, watermark, now=LATER)
+    assert confirmed | set(remaining) == set(keys)
+    assert consumed[2] in remaining
+    assert watermark == Watermark(start_after=keys[-1], seen=set())
+
+
+def test_watermark_save_load(tmp_path):
+    path = str(tmp_path / "watermark.json")
+    assert Watermark.load(path) == Watermark()
+    watermark = Watermark(start_after="a/b", seen={"a/c", "a/d"})
+    watermark.save(path)
+    assert Watermark.load(path) == watermark
+
+
+def test_main(s3_client, tmp_path):
+    put_log_object(s3_client, log_key("2025/01/30", 5), [LOG_LINE])  # before --since
+    put_log_object(s3_client, log_key("2025/01/31", 5), [LOG_LINE, LOG_LINE_NO_TARGET])
+    watermark_path = str(tmp_path / "watermark.json")
+    output = str(tmp_path / "logs.parquet")
+
+    main(
+        [
+            "--bucket",
+            BUCKET,
+            "--prefix",
+            PREFIX,
+            "--watermark",
+            watermark_path,
+            "--since",
+            "2025-01-31",
+            "--output",
+            output,
+        ]
+    )
+
+    assert pq.read_table(output).num_rows == 2
+    assert Watermark.load(watermark_path).seen == {log_key("2025/01/31", 5)}
+
+
+def test_ingest_benchmark(s3_client):
+    """Throughput against moto: a regression check, not a measure of S3 speed."""
+    lines = [LOG_LINE] * 200
+    for minute in range(50):
+        for node in range(6):
+            put_log_object(
+                s3_client, log_key("2025/01/31", minute, f"10.0.0.{node}"), lines
+            )
+
+    stats = IngestStats()
+    for _ in ingest(
+        s3_client, BUCKET, PREFIX, Watermark(), max_workers=16, stats=stats
+    ):
+        pass
+    LOG.info(
+        "Ingested %d objects in %.2fs: %.1f objects/s, %.1f MB/s",
+        stats.objects,
+        stats.seconds,
+        stats.objects_per_second,
+        stats.mb_per_second,
+    )
+    assert stats.objects == 300
+    assert stats.objects_per_second > 50
@@ -0,0 +1,113 @@
+import gzip
+
+import boto3
+import pyarrow as pa
+import pytest
+from moto import mock_aws
+
+from tests.access_logs import LOG_LINE, LOG_LINE_NO_TARGET, terraform_table_definition
+from website_pod.parser import (
+    COLUMNS,
+    REGEX,
+    SCHEMA,
+    ParseStats,
+    parse_lines,
+    read_s3_object,
+    read_table,
+)
+
+
+def test_regex_matches_terraform():
+    regex, _ = terraform_table_definition()
+    assert REGEX == regex
+
+
+def test_columns_match_terraform():
+    _, columns = terraform_table_definition()
+    assert list(COLUMNS) == [(col["Name"], col["Type"]) for col in columns]
+
+
+def test_parse_lines():
+    stats = ParseStats()
+    batches = list(
+        parse_lines(
+            [LOG_LINE + "\n", "not an access log line", LOG_LINE_NO_TARGET],
+            batch_size=1,
+            stats=stats,
+        )
+    )
+    assert stats == ParseStats(lines=3, rows=2, skipped=1)
+    assert [batch.num_rows for batch in batches] == [1, 1]
+    assert all(batch.schema == SCHEMA for batch in batches)
+
+    rows = pa.Table.from_batches(batches).to_pylist()
+    assert rows[0]["client_port"] == 2817
+    assert rows[0]["target_ip"] == "10.0.0.1"
+    assert rows[0]["target_port"] == 80
+    assert rows[0]["target_processing_time"] == 0.048
+    assert rows[0]["elb_status_code"] == 200
+    assert rows[0]["target_status_code"] == "200"
+    assert rows[0]["sent_bytes"] == 57
+    assert rows[0]["request_url"] == "https://www.example.com:443/"
+    assert rows[0]["conn_trace_id"] == "TID_1234abcd5678ef90"
+    assert rows[1]["target_ip"] == ""
+    assert rows[1]["target_port"] is None
+    assert rows[1]["target_processing_time"] == -1
+    assert rows[1]["target_status_code"] == "-"
+
+
+@pytest.mark.parametrize(
+    "port, expected",
+    [
+        ("80", 80),
+        ("", None),
+        ("2147483647", 2147483647),
+        ("2147483648", None),
+    ],
+)
+def test_parse_lines_int_conversion(port, expected):
+    line = LOG_LINE.replace("10.0.0.1:80 ", f"10.0.0.1:{port} ")
+    (batch,) = parse_lines([line])
+    assert batch.column("target_port").to_pylist() == [expected]
+
+
+def test_parse_lines_numpy():
+    (batch,) = parse_lines([LOG_LINE] * 3)
+    latencies = batch.column("target_processing_time").to_numpy()
+    assert latencies.dtype == "float64"
+    assert latencies.tolist() == [0.048] * 3
+
+
+def test_parse_lines_empty():
+    stats = ParseStats()
+    assert list(parse_lines(["garbage"], stats=stats)) == []
+    assert stats == ParseStats(lines=1, rows=0, skipped=1)
+
+
+def test_read_table(tmp_path):
+    paths = []
+    for idx, lines in enumerate([[LOG_LINE, LOG_LINE], [LOG_LINE_NO_TARGET]]):
+        path = tmp_path / f"part{idx}.log.gz"
+        path.write_bytes(gzip.compress(("\n".join(lines) + "\n").encode()))
+        paths.append(str(path))
+
+    stats = ParseStats()
+    table = read_table(paths, stats=stats)
+    assert table.schema == SCHEMA
+    assert table.num_rows == 3
+    assert stats == ParseStats(lines=3, rows=3, skipped=0)
+
+
+def test_read_s3_object(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    with mock_aws():
+        s3_client = boto3.client("s3", region_name="us-east-1")
+        s3_client.create_bucket(Bucket="access-logs")
+        s3_client.put_object(
+            Bucket="access-logs",
+            Key="part1.log.gz",
+            Body=gzip.compress((LOG_LINE + "\n").encode()),
+        )
+        (batch,) = read_s3_object(s3_client, "access-logs", "part1.log.gz")
+        assert batch.column("domain_name").to_pylist() == ["www.example.com"]
@@ -0,0 +1,100 @@
+"""
+Throughput and backtracking benchmarks of the access log regex.
+
+The budgets are deliberately loose so that the suite passes on a slow CI
+runner; override them with environment variables to tighten them locally.
+``make benchmark`` runs this suite with the measurements logged.
+"""
+
+import logging
+import os
+import time
+
+import pytest
+
+from website_pod.loggen import FORMATS, LogGenerator, pathological_lines
+from website_pod.parser import PATTERN, ParseStats, parse_lines
+
+LOG = logging.getLogger(__name__)
+
+MIN_LINES_PER_SECOND = float(os.environ.get("BENCHMARK_MIN_LINES_PER_SECOND", 10_000))
+MAX_LINE_SECONDS = float(os.environ.get("BENCHMARK_MAX_LINE_SECONDS", 0.02))
+# Parse time of a 4x longer line. Linear is 4, quadratic backtracking is 16.
+MAX_SCALING = float(os.environ.get("BENCHMARK_MAX_SCALING", 8))
+
+
+def best_time(func, *args, repeat=5):
+    """Best of ``repeat`` runs, the least noisy estimate of the cost."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def match_all(lines):
+    fullmatch = PATTERN.fullmatch
+    return sum(fullmatch(line) is not None for line in lines)
+
+
+def test_generated_formats():
+    for fmt in FORMATS:
+        lines = list(
+            LogGenerator(seed=7, formats=[fmt], long_query_ratio=0.1).lines(500)
+        )
+        stats = ParseStats()
+        rows = sum(batch.num_rows for batch in parse_lines(lines, stats=stats))
+        if fmt == "legacy":
+            # Lines without the classification fields don't match the Glue regex
+            # either, Athena returns them as rows of NULLs.
+            assert rows == 0, fmt
+        else:
+            assert rows == stats.lines == 500, fmt
+
+
+@pytest.mark.parametrize("long_query_ratio", [0.0, 0.05])
+def test_regex_throughput(long_query_ratio):
+    lines = list(
+        LogGenerator(
+            seed=42,
+            formats=["classification", "current"],
+            long_query_ratio=long_query_ratio,
+        ).lines(20_000)
+    )
+    seconds = best_time(match_all, lines, repeat=3)
+    lines_per_second = len(lines) / seconds
+    LOG.info(
+        "Regex throughput with %d%% long query strings: %.0f lines/s, %.1f MB/s",
+        long_query_ratio * 100,
+        lines_per_second,
+        sum(map(len, lines)) / seconds / 2**20,
+    )
+    assert (
+        lines_per_second >= MIN_LINES_PER_SECOND
+    ), f"{lines_per_second:.0f} lines/s is below {MIN_LINES_PER_SECOND:.0f}"
+
+
+@pytest.mark.parametrize("name", sorted(pathological_lines(64)))
+def test_pathological_line_budget(name):
+    line = pathological_lines()[name]
+    seconds = best_time(PATTERN.fullmatch, line)
+    LOG.info("%s (%d chars): %.3f ms", name, len(line), seconds * 1000)
+    assert (
+        seconds <= MAX_LINE_SECONDS
+    ), f"{name} took {seconds * 1000:.1f} ms, the budget is {MAX_LINE_SECONDS * 1000:.1f} ms"
+    if name.endswith("_mismatch"):
+        assert PATTERN.fullmatch(line) is None
+    else:
+        assert PATTERN.fullmatch(line) is not None
+
+
+@pytest.mark.parametrize("name", sorted(pathological_lines(64)))
+def test_pathological_line_scaling(name):
+    short = best_time(PATTERN.fullmatch, pathological_lines(4096)[name])
+    long = best_time(PATTERN.fullmatch, pathological_lines(16384)[name])
+    LOG.info("%s: 4x longer line takes %.1fx longer", name, long / short)
+    assert long / short <= MAX_SCALING, (
+        f"{name}: a 4x longer line takes {long / short:.1f}x longer, "
+        "the regex backtracks superlinearly"
+    )
@@ -0,0 +1,257 @@
+import gzip
+import logging
+import os
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pyarrow as pa
+import pytest
+
+from website_pod.loggen import LogGenerator
+from website_pod.simulator import (
+    InstanceModel,
+    PodConfig,
+    main,
+    parse_args,
+    request_rate,
+    simulate,
+    synthetic_profile,
+)
+
+LOG = logging.getLogger(__name__)
+
+MAX_MONTH_SECONDS = float(os.environ.get("BENCHMARK_MAX_SIMULATION_SECONDS", 10))
+# 1000 requests/minute per instance at 100% CPU, healthy 2 minutes after the launch
+INSTANCE = InstanceModel(requests_per_minute=1000, boot_time=110, service_time=0.1)
+
+
+def test_steady_load():
+    result = simulate(np.full(600, 1000.0), PodConfig(), INSTANCE)
+    assert result.under_capacity_minutes == 0
+    assert result.failed_requests == 0
+    assert result.scale_out_events == result.scale_in_events == 0
+    assert result.instance_hours == 2 * 10
+    # Two instances at 50% utilization
+    assert result.latency_p50 == pytest.approx(0.2)
+    np.testing.assert_array_equal(result.timeline["cpu"], 50)
+
+
+def test_scale_out():
+    requests = np.concatenate([np.full(60, 600.0), np.full(120, 3000.0)])
+    config = PodConfig(cpu_metric_period=60)
+    result = simulate(requests, config, INSTANCE)
+    desired = result.timeline["desired"]
+    serving = result.timeline["serving"]
+
+    # 3 minutes above the target, then ceil(2 * 100 / 60) instances
+    assert desired[62] == 4
+    # Health checks pass 110s after the launch, plus one more interval
+    assert serving[63] == 2 and serving[65] == 4
+    # CPU stays at 100% while the queue drains, so the ASG overshoots...
+    assert desired[65] == 7
+    assert result.scale_out_events == 2
+    assert result.max_instances == 7
+    # ... and scales in to 3000 / (5 * 1000) = 60% CPU, the target
+    assert desired[-1] == 5 and serving[-1] == 5
+    assert result.scale_in_events == 1
+    assert 0 < result.under_capacity_minutes < 15
+
+
+def test_cpu_metric_period():
+    """Basic monitoring reacts to a surge five times slower than detailed monitoring."""
+    requests = np.concatenate([np.full(60, 600.0), np.full(120, 3000.0)])
+    detailed = simulate(requests, PodConfig(cpu_metric_period=60), INSTANCE)
+    basic = simulate(requests, PodConfig(cpu_metric_period=300), INSTANCE)
+    assert basic.under_capacity_minutes > 2 * detailed.under_capacity_minutes
+    assert basic.failed_requests > detailed.failed_requests
+    # Requests queued beyond the idle timeout fail
+    assert basic.latency_p99 == 60
+
+
+def test_scale_in():
+    requests = np.concatenate([np.full(60, 3000.0), np.full(120, 600.0)])
+    config = PodConfig(asg_min_size=2, cpu_metric_period=60)
+    result = simulate(requests, config, INSTANCE)
+    desired = result.timeline["desired"]
+    assert desired[59] == 5
+    # 15 minutes below 90% of the target, then ceil(5 * 12 / 60) instances
+    assert desired[73] == 5
+    assert desired[74] == 2
+    assert desired[-1] == 2
+
+    # Never below the minimum
+    result = simulate(
+        requests, PodConfig(asg_min_size=6, cpu_metric_period=60), INSTANCE
+    )
+    assert result.scale_in_events == 0
+    np.testing.assert_array_equal(result.timeline["desired"], 6)
+
+
+def test_min_size_trades_instance_hours_for_capacity():
+    requests = synthetic_profile(days=2, base_rpm=500, peak_rpm=5000, seed=3)
+    small = simulate(requests, PodConfig(asg_min_size=2), INSTANCE)
+    large = simulate(requests, PodConfig(asg_min_size=6), INSTANCE)
+    assert large.under_capacity_minutes < small.under_capacity_minutes
+    assert large.instance_hours > small.instance_hours
+
+
+def test_grace_period_shorter_than_health_check_convergence():
+    """Instances that aren't healthy when the grace period ends are replaced, forever."""
+    requests = np.full(120, 3000.0)
+    config = PodConfig(health_check_grace_period=60, cpu_metric_period=60)
+    result = simulate(requests, config, INSTANCE)
+    assert result.replaced_instances > 50
+    assert result.timeline["serving"].max() == 2
+    assert result.failed_requests > 0
+
+    # EC2 health checks don't use the grace period
+    result = simulate(
+        requests, PodConfig(health_check_type="EC2", cpu_metric_period=60), INSTANCE
+    )
+    assert result.replaced_instances == 0
+    assert result.timeline["serving"][-1] == 5
+
+
+def test_instance_failures():
+    requests = np.full(24 * 60, 1000.0)
+    instance = InstanceModel(
+        requests_per_minute=1000, boot_time=110, failures_per_hour=0.05
+    )
+    elb = simulate(requests, PodConfig(), instance, seed=1)
+    assert elb.replaced_instances > 0
+    assert elb.failed_requests > 0
+    # The ALB stops routing to a failed instance within a minute
+    assert elb.failed_ratio < 0.01
+
+    assert elb.timeline["serving"][-1] == 2
+
+    # EC2 health checks don't notice a failed application. The instance stays
+    # in the ASG and counts toward the desired capacity, so the ASG doesn't
+    # scale out although the other instance runs at 100% CPU.
+    ec2 = simulate(requests, PodConfig(health_check_type="EC2"), instance, seed=1)
+    assert ec2.replaced_instances == 0
+    assert ec2.timeline["running"][-1] == 2
+    assert ec2.timeline["serving"][-1] == 1
+    assert ec2.latency_p99 > 10 * elb.latency_p99
+
+
+def test_request_count_policy():
+    requests = np.concatenate([np.full(10, 600.0), np.full(60, 2400.0)])
+    config = PodConfig(
+        autoscaling_cpu_policy_enabled=False,
+        autoscaling_target_request_count=400,
+    )
+    result = simulate(requests, config, InstanceModel(requests_per_minute=2000))
+    # ceil(2 * 1200 / 400)
+    assert result.timeline["desired"][12] == 6
+    assert result.timeline["desired"][-1] == 6
+
+
+def test_no_policies():
+    result = simulate(
+        np.full(60, 5000.0), PodConfig(autoscaling_cpu_policy_enabled=False), INSTANCE
+    )
+    assert result.max_instances == 2
+    assert result.under_capacity_minutes == 60
+    # The queue is full after the idle timeout, then the surplus fails
+    assert result.failed_requests == pytest.approx(60 * 3000 - 2000, rel=0.01)
+
+
+def test_pod_config():
+    config = PodConfig.from_variables(
+        {"asg_min_size": 3, "health_check_type": "EC2", "service_name": "website"}
+    )
+    assert config.asg_min_size == 3
+    assert config.health_check_type == "EC2"
+    with pytest.raises(ValueError):
+        PodConfig(asg_min_size=11)
+    with pytest.raises(ValueError):
+        simulate([1.0, -1.0])
+
+
+def test_synthetic_profile():
+    rate = synthetic_profile(
+        days=14, base_rpm=1000, peak_rpm=10000, noise=0, spikes_per_week=0
+    )
+    assert rate.size == 14 * 24 * 60
+    assert rate.min() == pytest.approx(1000 * 0.6)
+    assert rate.max() == pytest.approx(10000)
+    # Monday 15:00 is the peak, 03:00 the trough
+    assert rate[15 * 60] == pytest.approx(10000)
+    assert rate[3 * 60] == pytest.approx(1000)
+
+
+def test_request_rate():
+    table = pa.table(
+        {
+            "time": [
+                "2025-01-31T14:00:01.000001Z",
+                "2025-01-31T14:00:59.999999Z",
+                "2025-01-31T14:03:00.000000Z",
+                "2025-01-31T14:01:30.000000Z",
+                "invalid",
+            ]
+        }
+    )
+    start, rate = request_rate(table)
+    assert start == datetime(2025, 1, 31, 14, 0, tzinfo=timezone.utc)
+    np.testing.assert_array_equal(rate, [2, 1, 0, 1])
+
+
+def test_main(tmp_path):
+    path = str(tmp_path / "synthetic.log.gz")
+    with gzip.open(path, "wt") as fp:
+        for line in LogGenerator(seed=1).lines(1000):
+            fp.write(line + "\n")
+    result = main([path, "--scale", "10", "--asg-min-size", "1"])
+    assert result.minutes >= 1
+    assert result.requests == 10_000
+
+    result = main(
+        [
+            "--days",
+            "1",
+            "--health-check-type",
+            "EC2",
+            "--no-autoscaling-cpu-policy-enabled",
+        ]
+    )
+    assert result.minutes == 24 * 60
+    assert result.max_instances == 2
+
+
+def test_parse_args_types():
+    args = parse_args(
+        [
+            "--autoscaling-target-cpu-load",
+            "62.5",
+            "--requests-per-minute",
+            "1500.5",
+            "--autoscaling-request-count-instance-warmup",
+            "120",
+        ]
+    )
+    assert args.autoscaling_target_cpu_load == 62.5
+    assert args.requests_per_minute == 1500.5
+    assert args.autoscaling_request_count_instance_warmup == 120
+    assert isinstance(args.autoscaling_request_count_instance_warmup, int)
+    assert args.autoscaling_target_request_count is None
+    with pytest.raises(SystemExit):
+        parse_args(["--autoscaling-request-count-instance-warmup", "1.5"])
+
+
+def test_month_benchmark():
+    requests = synthetic_profile(days=30, seed=42)
+    started = time.perf_counter()
+    result = simulate(requests, PodConfig(cpu_metric_period=60))
+    seconds = time.perf_counter() - started
+    LOG.info(
+        "Simulated %d minutes in %.2fs: %d under-capacity minutes, %.0f instance-hours",
+        result.minutes,
+        seconds,
+        result.under_capacity_minutes,
+        result.instance_hours,
+    )
+    assert result.minutes == 30 * 24 * 60
+    assert seconds <= MAX_MONTH_SECONDS
@@ -0,0 +1,126 @@
+import pickle
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from tests.access_logs import LOG_LINE, LOG_LINE_NO_TARGET
+from website_pod.parser import parse_lines
+from website_pod.sketch import KeyedSketches, LatencySketch
+
+QUANTILES = [0.01, 0.25, 0.5, 0.9, 0.99, 0.999]
+
+
+@pytest.fixture
+def latencies():
+    # Milliseconds to tens of seconds, like target_processing_time
+    return np.random.default_rng(42).lognormal(mean=-3, sigma=1.5, size=200_000)
+
+
+@pytest.mark.parametrize("relative_accuracy", [0.01, 0.02, 0.05])
+def test_accuracy(latencies, relative_accuracy):
+    sketch = LatencySketch(relative_accuracy=relative_accuracy)
+    sketch.add(latencies)
+    exact = np.quantile(latencies, QUANTILES, method="lower")
+    estimated = sketch.quantiles(QUANTILES)
+    assert np.all(np.abs(estimated - exact) <= relative_accuracy * exact), (
+        estimated,
+        exact,
+    )
+    assert sketch.quantile(0) == latencies.min()
+    assert sketch.quantile(1) == latencies.max()
+    assert sketch.count == latencies.size
+    assert sketch.mean == pytest.approx(latencies.mean())
+
+
+def test_memory_is_bounded(latencies):
+    sketch = LatencySketch()
+    empty_nbytes = sketch.nbytes
+    for _ in range(5):
+        sketch.add(latencies)
+    assert sketch.nbytes == empty_nbytes < 10_000
+    assert len(sketch.to_bytes()) < 10_000
+    sketch.add([1e9])  # Far beyond max_value: the last bucket
+    assert sketch.nbytes == empty_nbytes
+
+
+def test_bucket_values_are_shared(latencies):
+    sketches = KeyedSketches("target_ip", "target_processing_time")
+    sketches.add(
+        ["10.0.0.1", "10.0.0.2"] * (latencies.size // 2),
+        latencies[: latencies.size // 2 * 2],
+    )
+    first, second = sketches["10.0.0.1"], sketches["10.0.0.2"]
+    assert first._values is second._values
+    assert first._values is not LatencySketch(relative_accuracy=0.02)._values
+    assert first.nbytes == first._counts.nbytes
+    assert pickle.loads(pickle.dumps(first))._values is first._values
+
+
+def test_merge(latencies):
+    whole = LatencySketch()
+    whole.add(latencies)
+
+    merged = LatencySketch()
+    for chunk in np.array_split(latencies, 7):
+        part = LatencySketch()
+        part.add(chunk)
+        # As if it came from another worker process
+        merged.merge(pickle.loads(pickle.dumps(part)))
+    assert merged == whole
+    np.testing.assert_array_equal(
+        merged.quantiles(QUANTILES), whole.quantiles(QUANTILES)
+    )
+
+    with pytest.raises(ValueError):
+        merged.merge(LatencySketch(relative_accuracy=0.02))
+
+
+def test_serialization(latencies):
+    sketch = LatencySketch()
+    sketch.add(latencies)
+    sketch.add([0.0, 0.0])
+    restored = LatencySketch.from_bytes(sketch.to_bytes())
+    assert restored == sketch
+    np.testing.assert_array_equal(
+        restored.quantiles(QUANTILES), sketch.quantiles(QUANTILES)
+    )
+
+
+def test_ignored_values():
+    sketch = LatencySketch()
+    sketch.add([-1, np.nan, 0.0, 0.0, 0.002])
+    assert sketch.count == 3
+    assert sketch.quantile(0.5) == 0.0
+    assert sketch.quantile(1) == 0.002
+    assert np.isnan(LatencySketch().quantile(0.5))
+
+
+def test_keyed_sketches(tmp_path):
+    other_target = LOG_LINE.replace("10.0.0.1:80 0.086 0.048", "10.0.0.2:80 0.086 1.5")
+    batches = list(
+        parse_lines([LOG_LINE] * 10 + [other_target] * 5 + [LOG_LINE_NO_TARGET])
+    )
+
+    sketches = KeyedSketches("target_ip", "target_processing_time")
+    for batch in batches:
+        sketches.update(batch)
+    from_table = KeyedSketches("target_ip", "target_processing_time")
+    from_table.update(pa.Table.from_batches(batches))
+    assert all(from_table[key] == sketch for key, sketch in sketches.sketches.items())
+    assert len(sketches) == 3
+    assert sketches["10.0.0.1"].count == 10
+    assert sketches["10.0.0.1"].quantile(0.99) == 0.048
+    assert sketches["10.0.0.2"].quantile(0.99) == 1.5
+    # Requests that never reached a target have no target timing
+    assert sketches[""].count == 0
+
+    # An hour of sketches round-trips through Parquet and merges with the next one
+    path = str(tmp_path / "14.parquet")
+    pq.write_table(sketches.to_table(), path)
+    restored = KeyedSketches.from_table(pq.read_table(path))
+    assert restored.key_column == "target_ip"
+    assert restored["10.0.0.2"] == sketches["10.0.0.2"]
+    restored.merge(sketches)
+    assert restored["10.0.0.1"].count == 20
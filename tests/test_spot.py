@@ -78,3 +78,15 @@ def test_lb(
             ]
         )
         assert healthy_instance_count == 2
+
+        asg = response["AutoScalingGroups"][0]
+        assert asg["CapacityRebalance"] is True
+        policy = asg["MixedInstancesPolicy"]
+        assert (
+            policy["InstancesDistribution"]["SpotAllocationStrategy"]
+            == "price-capacity-optimized"
+        )
+        overrides = [
+            o["InstanceType"] for o in policy["LaunchTemplate"].get("Overrides", [])
+        ]
+        assert overrides == ["t3.micro", "t3a.micro"], overrides
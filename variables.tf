@@ -35,11 +35,94 @@ variable "alb_access_log_athena_enabled" {
     The Glue database is named `<service_name>_<random_suffix>` (hyphens
     replaced with underscores) and the table is named
     `<service_name>_alb_access_logs`.
+
+    The table is partitioned by `day` (`yyyy/MM/dd`) with partition projection,
+    so filter on it to limit the scanned data, e.g. `WHERE day = '2025/01/31'`.
   EOF
   type        = bool
   default     = false
 }
 
+variable "alb_access_log_athena_projection_range" {
+  description = <<-EOF
+    Range of the projected `day` partitions of the ALB access log table, in the
+    Athena date projection format: two comma-separated dates (`yyyy/MM/dd`) or
+    relative expressions like `NOW-1YEARS`.
+    Logs older than the range start are not visible to Athena.
+
+    **Example:** `"2024/01/01,NOW"`
+  EOF
+  type        = string
+  default     = "NOW-1YEARS,NOW"
+
+  validation {
+    condition     = length(split(",", var.alb_access_log_athena_projection_range)) == 2
+    error_message = "alb_access_log_athena_projection_range must be two comma-separated dates, e.g. \"NOW-1YEARS,NOW\"."
+  }
+}
+
+variable "alb_access_log_athena_bytes_scanned_cutoff" {
+  description = <<-EOF
+    Maximum bytes a single query in the Athena workgroup may scan. Queries that
+    scan more are cancelled. Clients can't override it, the workgroup
+    configuration is enforced.
+    Set to null to disable the limit. Minimum is 10 MB (10485760 bytes).
+  EOF
+  type        = number
+  default     = 10737418240 # 10 GiB
+
+  validation {
+    condition     = var.alb_access_log_athena_bytes_scanned_cutoff == null ? true : var.alb_access_log_athena_bytes_scanned_cutoff >= 10485760
+    error_message = "alb_access_log_athena_bytes_scanned_cutoff must be at least 10485760 bytes (10 MB)."
+  }
+}
+
+variable "alb_access_log_athena_publish_metrics" {
+  description = "Whether the Athena workgroup publishes query metrics (e.g. ProcessedBytes) to CloudWatch."
+  type        = bool
+  default     = true
+}
+
+variable "alb_access_log_compaction_enabled" {
+  description = <<-EOF
+    When true (and `alb_access_log_athena_enabled` is also true), creates a
+    scheduled Glue Python shell job that rewrites each day of raw access logs
+    into one Snappy-compressed Parquet object, and a second Glue table
+    `<service_name>_alb_access_logs_parquet` over them.
+
+    The Parquet table has the same columns and `day` partitions as the raw table,
+    but Athena reads only the columns a query uses instead of regex-parsing every line.
+  EOF
+  type        = bool
+  default     = false
+}
+
+variable "alb_access_log_compaction_schedule" {
+  description = <<-EOF
+    Schedule of the compaction job, as a Glue cron expression (UTC).
+    Each run compacts the previous day, so run it after midnight UTC
+    once the ALB has delivered the last logs of the day.
+  EOF
+  type        = string
+  default     = "cron(30 1 * * ? *)"
+
+  validation {
+    condition     = can(regex("^cron\\(.+\\)$", var.alb_access_log_compaction_schedule))
+    error_message = "alb_access_log_compaction_schedule must be a cron(...) expression."
+  }
+}
+
+variable "alb_access_log_compaction_max_capacity" {
+  description = "Glue DPUs of the compaction job: 0.0625 or 1."
+  type        = number
+  default     = 1
+
+  validation {
+    condition     = contains([0.0625, 1], var.alb_access_log_compaction_max_capacity)
+    error_message = "alb_access_log_compaction_max_capacity must be 0.0625 or 1."
+  }
+}
+
 variable "alb_healthcheck_enabled" {
   description = "Whether health checks are enabled."
   type        = bool
@@ -123,9 +206,13 @@ variable "alb_healthcheck_timeout" {
 }
 
 variable "alb_healthcheck_response_code_matcher" {
-  description = "Range of http return codes that can match"
+  description = <<-EOF
+    Range of return codes that can match.
+    If not specified, defaults to "200-299" (HTTP status codes), or to "12" (gRPC status codes)
+    when `target_group_protocol_version` is GRPC.
+  EOF
   type        = string
-  default     = "200-299"
+  default     = null
 }
 variable "alb_idle_timeout" {
   description = "The time in seconds that the connection is allowed to be idle."
@@ -133,6 +220,77 @@ variable "alb_idle_timeout" {
   default     = 60
 }
 
+variable "alb_enable_http2" {
+  description = "Whether HTTP/2 is enabled between clients and the load balancer."
+  type        = bool
+  default     = true
+}
+
+variable "alb_client_keep_alive" {
+  description = <<-EOF
+    Client keep-alive duration in seconds. After this time, the load balancer closes
+    client connections, even if they are active. Longer keep-alive lets busy clients
+    reuse connections instead of paying the TCP and TLS setup cost again.
+    Valid range: 60-604800 seconds. AWS default is 3600 seconds.
+  EOF
+  type        = number
+  default     = 3600
+
+  validation {
+    condition     = var.alb_client_keep_alive >= 60 && var.alb_client_keep_alive <= 604800
+    error_message = "alb_client_keep_alive must be between 60 and 604800 seconds."
+  }
+}
+
+variable "alb_desync_mitigation_mode" {
+  description = <<-EOF
+    How the load balancer handles requests that might pose an HTTP desync security risk:
+    monitor, defensive (AWS default), or strictest.
+  EOF
+  type        = string
+  default     = "defensive"
+
+  validation {
+    condition     = contains(["monitor", "defensive", "strictest"], var.alb_desync_mitigation_mode)
+    error_message = "alb_desync_mitigation_mode must be one of: monitor, defensive, strictest."
+  }
+}
+
+variable "alb_minimum_capacity_units" {
+  description = <<-EOF
+    Load balancer capacity units (LCUs) to reserve for the ALB.
+    The reservation keeps the load balancer scaled up, so it can absorb
+    a known traffic spike (a launch, a marketing event) without scaling under live load.
+    If not specified, the ALB scales on demand only.
+
+    **Note:** Reserved LCUs are billed whether they are used or not.
+    Remove the reservation after the event.
+
+    **Example:** `alb_minimum_capacity_units = 200`
+  EOF
+  type        = number
+  default     = null
+
+  validation {
+    condition     = var.alb_minimum_capacity_units == null ? true : var.alb_minimum_capacity_units >= 100
+    error_message = "alb_minimum_capacity_units must be at least 100."
+  }
+}
+
+variable "alb_ssl_policy" {
+  description = <<-EOF
+    Security policy of the HTTPS listener, which controls the TLS protocols and ciphers.
+    See https://docs.aws.amazon.com/elasticloadbalancing/latest/application/describe-ssl-policies.html
+  EOF
+  type        = string
+  default     = "ELBSecurityPolicy-TLS13-1-2-Ext1-2021-06"
+
+  validation {
+    condition     = startswith(var.alb_ssl_policy, "ELBSecurityPolicy-")
+    error_message = "alb_ssl_policy must be an ELB security policy name (ELBSecurityPolicy-*)."
+  }
+}
+
 variable "alb_listener_port" {
   description = "TCP port that a load balancer listens to to serve client HTTP requests. The load balancer redirects this port to 443 and HTTPS."
   type        = number
@@ -264,6 +422,103 @@ variable "asg_scale_in_protected_instances" {
   }
 }
 
+variable "asg_instance_refresh_max_healthy_percentage" {
+  description = <<-EOF
+    Upper limit on the healthy capacity during an instance refresh, as a percentage of the
+    desired capacity. Values above 100 let the ASG launch replacements before terminating
+    old instances, e.g. 200 with `min_healthy_percentage = 100` replaces the whole group
+    in one batch without losing capacity.
+    Valid range: 100-200. Can exceed `min_healthy_percentage` by at most 100.
+    If not specified, AWS default (100) is used.
+  EOF
+  type        = number
+  default     = null
+
+  validation {
+    condition = (
+      var.asg_instance_refresh_max_healthy_percentage == null
+      ? true
+      : var.asg_instance_refresh_max_healthy_percentage >= 100 && var.asg_instance_refresh_max_healthy_percentage <= 200
+    )
+    error_message = "asg_instance_refresh_max_healthy_percentage must be between 100 and 200."
+  }
+}
+
+variable "asg_instance_refresh_skip_matching" {
+  description = <<-EOF
+    If true, an instance refresh skips instances that already run the desired
+    launch template version.
+  EOF
+  type        = bool
+  default     = false
+}
+
+variable "asg_instance_refresh_instance_warmup" {
+  description = <<-EOF
+    Seconds after a new instance comes into service before an instance refresh
+    moves on to the next batch.
+    If not specified, the ASG health check grace period is used.
+  EOF
+  type        = number
+  default     = null
+
+  validation {
+    condition     = var.asg_instance_refresh_instance_warmup == null ? true : var.asg_instance_refresh_instance_warmup >= 0
+    error_message = "asg_instance_refresh_instance_warmup must be greater than or equal to 0."
+  }
+}
+
+variable "asg_instance_refresh_checkpoint_percentages" {
+  description = <<-EOF
+    Percentages of replaced instances at which an instance refresh pauses for
+    `asg_instance_refresh_checkpoint_delay` seconds. Values must be increasing
+    and the last one should be 100 for the refresh to complete.
+
+    **Example:** `[20, 50, 100]`
+  EOF
+  type        = list(number)
+  default     = null
+
+  validation {
+    condition = (
+      var.asg_instance_refresh_checkpoint_percentages == null
+      ? true
+      : length(var.asg_instance_refresh_checkpoint_percentages) > 0
+      && alltrue([for p in var.asg_instance_refresh_checkpoint_percentages : p >= 1 && p <= 100])
+      && alltrue(
+        [
+          for i, p in var.asg_instance_refresh_checkpoint_percentages :
+          i == 0 ? true : p > var.asg_instance_refresh_checkpoint_percentages[max(i - 1, 0)]
+        ]
+      )
+    )
+    error_message = "asg_instance_refresh_checkpoint_percentages must be a non-empty list of increasing values between 1 and 100."
+  }
+}
+
+variable "asg_instance_refresh_checkpoint_delay" {
+  description = <<-EOF
+    Seconds to wait at each checkpoint of an instance refresh.
+    If not specified, AWS default (3600) is used.
+  EOF
+  type        = number
+  default     = null
+
+  validation {
+    condition     = var.asg_instance_refresh_checkpoint_delay == null ? true : var.asg_instance_refresh_checkpoint_delay >= 0 && var.asg_instance_refresh_checkpoint_delay <= 172800
+    error_message = "asg_instance_refresh_checkpoint_delay must be between 0 and 172800 seconds."
+  }
+}
+
+variable "asg_instance_refresh_auto_rollback" {
+  description = <<-EOF
+    If true, a failed instance refresh rolls the ASG back to the previous
+    launch template version.
+  EOF
+  type        = bool
+  default     = false
+}
+
 variable "asg_default_cooldown" {
   description = <<-EOF
     Amount of time, in seconds, after a scaling activity completes before another
@@ -316,12 +571,346 @@ variable "asg_enabled_metrics" {
   ]
 }
 
+variable "asg_warm_pool_enabled" {
+  description = <<-EOF
+    Whether to maintain a warm pool of pre-initialized instances for the ASG.
+
+    Instances in the warm pool have already run userdata/cloud-init, so scale-out
+    events are served from the pool in seconds instead of waiting for a full boot.
+    When enabled, the WarmPool* metrics are added to `asg_enabled_metrics`
+    (unless metrics collection is disabled with an empty list).
+
+    **Note:** Warm pools can't be used together with spot instances
+    (`on_demand_base_capacity`), because AWS doesn't support warm pools
+    on ASGs with a mixed instances policy.
+  EOF
+  type        = bool
+  default     = false
+}
+
+variable "asg_warm_pool_state" {
+  description = <<-EOF
+    State of instances waiting in the warm pool: Stopped, Running, or Hibernated.
+
+    - `Stopped` (default): Cheapest, you pay only for EBS volumes.
+    - `Hibernated`: Preserves in-memory state. Requires an AMI and instance type that support hibernation.
+    - `Running`: Fastest to serve traffic, but billed as regular running instances.
+  EOF
+  type        = string
+  default     = "Stopped"
+
+  validation {
+    condition     = contains(["Stopped", "Running", "Hibernated"], var.asg_warm_pool_state)
+    error_message = "asg_warm_pool_state must be one of: Stopped, Running, Hibernated."
+  }
+}
+
+variable "asg_warm_pool_min_size" {
+  description = "Minimum number of instances to maintain in the warm pool."
+  type        = number
+  default     = 0
+
+  validation {
+    condition     = var.asg_warm_pool_min_size >= 0
+    error_message = "asg_warm_pool_min_size must be >= 0."
+  }
+}
+
+variable "asg_warm_pool_max_group_prepared_capacity" {
+  description = <<-EOF
+    Total maximum number of instances allowed in the ASG and the warm pool combined.
+    If not specified, the warm pool is sized up to `asg_max_size`
+    (i.e. the pool holds `asg_max_size` - desired capacity instances).
+  EOF
+  type        = number
+  default     = null
+}
+
+variable "asg_warm_pool_reuse_on_scale_in" {
+  description = "Whether instances in the ASG are returned to the warm pool on scale in instead of being terminated."
+  type        = bool
+  default     = false
+}
+
 variable "autoscaling_target_cpu_load" {
   description = "Target CPU load for autoscaling"
   default     = 60
   type        = number
 }
 
+variable "autoscaling_cpu_policy_enabled" {
+  description = <<-EOF
+    Whether to create the CPU target tracking policy (see `autoscaling_target_cpu_load`).
+    Disable it to scale on request count alone (`autoscaling_target_request_count`).
+  EOF
+  type        = bool
+  default     = true
+}
+
+variable "autoscaling_target_request_count" {
+  description = <<-EOF
+    Target number of requests per instance for the ALBRequestCountPerTarget
+    target tracking policy. If not specified, the policy is not created.
+
+    The policy can run alone or next to the CPU policy. When both are enabled,
+    the ASG scales out if either policy asks for more capacity, and scales in
+    only when both policies agree.
+
+    **Note:** The metric is the request count per target per minute.
+    For example, 1000 means each instance should serve ~1000 requests/minute.
+  EOF
+  type        = number
+  default     = null
+
+  validation {
+    condition     = var.autoscaling_target_request_count == null ? true : var.autoscaling_target_request_count > 0
+    error_message = "autoscaling_target_request_count must be greater than 0."
+  }
+}
+
+variable "autoscaling_request_count_instance_warmup" {
+  description = <<-EOF
+    Estimated time, in seconds, until a newly launched instance contributes to
+    the request count metric. If not specified, the ASG default instance warmup is used.
+  EOF
+  type        = number
+  default     = null
+}
+
+variable "autoscaling_latency_threshold" {
+  description = <<-EOF
+    Target response time, in seconds, above which the latency step scaling policy
+    adds instances. If not specified, latency step scaling is disabled.
+
+    The threshold is compared to the `autoscaling_latency_percentile` of the
+    target group's TargetResponseTime. This policy only scales out; scale in is left
+    to the CPU and request count target tracking policies.
+
+    Example: 0.5 to add capacity when p90 latency exceeds 500 ms.
+  EOF
+  type        = number
+  default     = null
+
+  validation {
+    condition     = var.autoscaling_latency_threshold == null ? true : var.autoscaling_latency_threshold > 0
+    error_message = "autoscaling_latency_threshold must be greater than 0."
+  }
+}
+
+variable "autoscaling_latency_percentile" {
+  description = "TargetResponseTime percentile that drives latency step scaling, e.g. p90, p95, p99."
+  type        = string
+  default     = "p90"
+
+  validation {
+    condition     = can(regex("^p(\\d{1,2}(\\.\\d{1,2})?|100)$", var.autoscaling_latency_percentile))
+    error_message = "autoscaling_latency_percentile must be a percentile statistic like 'p90' or 'p99.9'."
+  }
+}
+
+variable "autoscaling_latency_step_adjustments" {
+  description = <<-EOF
+    Step adjustments of the latency step scaling policy.
+
+    Bounds are in seconds, relative to `autoscaling_latency_threshold`.
+    `upper_bound = null` means infinity.
+
+    The default adds 1 instance when latency is up to 1 second above the
+    threshold and 2 instances when it is further above it.
+  EOF
+  type = list(object({
+    lower_bound        = number
+    upper_bound        = optional(number)
+    scaling_adjustment = number
+  }))
+  default = [
+    {
+      lower_bound        = 0
+      upper_bound        = 1
+      scaling_adjustment = 1
+    },
+    {
+      lower_bound        = 1
+      scaling_adjustment = 2
+    },
+  ]
+
+  validation {
+    condition     = length(var.autoscaling_latency_step_adjustments) > 0
+    error_message = "autoscaling_latency_step_adjustments must contain at least one step."
+  }
+}
+
+variable "autoscaling_latency_instance_warmup" {
+  description = <<-EOF
+    Time, in seconds, until a newly launched instance counts toward the latency
+    scaling metric. Acts as the cooldown of the latency step scaling policy:
+    while instances are warming up, further breaches only add the difference
+    between the new step and the capacity already launching.
+  EOF
+  type        = number
+  default     = 300
+}
+
+variable "autoscaling_latency_evaluation_periods" {
+  description = "Number of consecutive 1-minute periods the latency must breach the threshold before scaling out."
+  type        = number
+  default     = 2
+
+  validation {
+    condition     = var.autoscaling_latency_evaluation_periods >= 1
+    error_message = "autoscaling_latency_evaluation_periods must be at least 1."
+  }
+}
+
+variable "autoscaling_predictive_mode" {
+  description = <<-EOF
+    Mode of the predictive scaling policy. If not specified, the policy is not created.
+
+    - `ForecastOnly`: Generates forecasts without scaling. Use it first to evaluate
+      the forecast accuracy in the EC2 Auto Scaling console.
+    - `ForecastAndScale`: Launches capacity ahead of the forecasted load.
+
+    Predictive scaling forecasts the ALB request count (the same metric pair as
+    `autoscaling_target_request_count`) and needs at least 24 hours of history.
+    Keep a target tracking policy enabled to handle unforecasted load.
+  EOF
+  type        = string
+  default     = null
+
+  validation {
+    condition     = var.autoscaling_predictive_mode == null ? true : contains(["ForecastOnly", "ForecastAndScale"], var.autoscaling_predictive_mode)
+    error_message = "autoscaling_predictive_mode must be either 'ForecastOnly' or 'ForecastAndScale'."
+  }
+}
+
+variable "autoscaling_predictive_target_request_count" {
+  description = <<-EOF
+    Target number of requests per instance per minute used to turn the forecasted
+    load into capacity. Defaults to `autoscaling_target_request_count`.
+  EOF
+  type        = number
+  default     = null
+
+  validation {
+    condition     = var.autoscaling_predictive_target_request_count == null ? true : var.autoscaling_predictive_target_request_count > 0
+    error_message = "autoscaling_predictive_target_request_count must be greater than 0."
+  }
+}
+
+variable "autoscaling_predictive_scheduling_buffer_time" {
+  description = <<-EOF
+    How many seconds ahead of the forecasted load instances are launched.
+    Set it to roughly the time an instance needs to boot and pass health checks.
+  EOF
+  type        = number
+  default     = 300
+
+  validation {
+    condition     = var.autoscaling_predictive_scheduling_buffer_time >= 0 && var.autoscaling_predictive_scheduling_buffer_time <= 3600
+    error_message = "autoscaling_predictive_scheduling_buffer_time must be between 0 and 3600 seconds."
+  }
+}
+
+variable "autoscaling_predictive_max_capacity_breach_behavior" {
+  description = <<-EOF
+    What to do when the forecasted capacity exceeds `asg_max_size`.
+
+    - `HonorMaxCapacity` (default): Capacity is capped at `asg_max_size`.
+    - `IncreaseMaxCapacity`: The ASG max size is raised temporarily,
+      by up to `autoscaling_predictive_max_capacity_buffer` percent above the forecast.
+  EOF
+  type        = string
+  default     = "HonorMaxCapacity"
+
+  validation {
+    condition     = contains(["HonorMaxCapacity", "IncreaseMaxCapacity"], var.autoscaling_predictive_max_capacity_breach_behavior)
+    error_message = "autoscaling_predictive_max_capacity_breach_behavior must be either 'HonorMaxCapacity' or 'IncreaseMaxCapacity'."
+  }
+}
+
+variable "autoscaling_predictive_max_capacity_buffer" {
+  description = <<-EOF
+    Size of the capacity buffer, as a percentage of the forecasted capacity, used when
+    `autoscaling_predictive_max_capacity_breach_behavior` is `IncreaseMaxCapacity`.
+  EOF
+  type        = number
+  default     = 10
+
+  validation {
+    condition     = var.autoscaling_predictive_max_capacity_buffer >= 0 && var.autoscaling_predictive_max_capacity_buffer <= 100
+    error_message = "autoscaling_predictive_max_capacity_buffer must be between 0 and 100."
+  }
+}
+
+variable "autoscaling_scheduled_actions" {
+  description = <<-EOF
+    Scheduled scaling actions for predictable traffic windows.
+    Each action sets the min size, max size and/or desired capacity of the ASG
+    on a cron `recurrence` (in `time_zone`, UTC by default) or once at `start_time`.
+    Target tracking policies keep scaling within the scheduled bounds.
+
+    **Note:** An action that changes `min_size` or `max_size` makes the ASG drift from
+    `asg_min_size` and `asg_max_size`. The next `terraform apply` restores them,
+    so apply outside the scheduled windows, or leave min/max alone and schedule `desired_capacity`.
+
+    **Example:**
+    ```
+    autoscaling_scheduled_actions = [
+      {
+        name       = "business-hours"
+        recurrence = "0 8 * * MON-FRI"
+        time_zone  = "America/New_York"
+        min_size   = 6
+      },
+      {
+        name       = "overnight"
+        recurrence = "0 20 * * *"
+        time_zone  = "America/New_York"
+        min_size   = 2
+      }
+    ]
+    ```
+  EOF
+  type = list(object({
+    name             = string
+    recurrence       = optional(string)
+    time_zone        = optional(string)
+    start_time       = optional(string)
+    end_time         = optional(string)
+    min_size         = optional(number)
+    max_size         = optional(number)
+    desired_capacity = optional(number)
+  }))
+  default  = []
+  nullable = false
+
+  validation {
+    condition = length(var.autoscaling_scheduled_actions) == length(
+      distinct([for a in var.autoscaling_scheduled_actions : a.name])
+    )
+    error_message = "autoscaling_scheduled_actions names must be unique."
+  }
+  validation {
+    condition = alltrue(
+      [
+        for a in var.autoscaling_scheduled_actions :
+        a.min_size != null || a.max_size != null || a.desired_capacity != null
+      ]
+    )
+    error_message = "Each scheduled action needs at least one of min_size, max_size or desired_capacity."
+  }
+  validation {
+    condition = alltrue(
+      [
+        for a in var.autoscaling_scheduled_actions :
+        a.recurrence != null || a.start_time != null
+      ]
+    )
+    error_message = "Each scheduled action needs a recurrence or a start_time."
+  }
+}
+
 variable "backend_subnets" {
   description = "Subnet ids where EC2 instances should be present"
   type        = list(string)
@@ -439,16 +1028,237 @@ variable "root_volume_size" {
   default     = 30
   nullable    = false
 }
+
+variable "root_volume_type" {
+  description = <<-EOF
+    EBS volume type of the root volume: gp2, gp3, io1 or io2.
+    If not specified, the volume type of the AMI's root snapshot is used.
+
+    **Note:** Changing the type of a running pod changes the launch template,
+    which replaces the instances with an instance refresh.
+  EOF
+  type        = string
+  default     = null
+
+  validation {
+    condition     = var.root_volume_type == null ? true : contains(["gp2", "gp3", "io1", "io2"], var.root_volume_type)
+    error_message = "root_volume_type must be one of: gp2, gp3, io1, io2."
+  }
+}
+
+variable "root_volume_iops" {
+  description = <<-EOF
+    Provisioned IOPS of the root volume. Supported with gp3 (3000-16000), io1 and io2.
+    If not specified, the volume type baseline is used (3000 IOPS for gp3).
+  EOF
+  type        = number
+  default     = null
+
+  validation {
+    condition     = var.root_volume_iops == null ? true : var.root_volume_iops >= 100 && var.root_volume_iops <= 256000
+    error_message = "root_volume_iops must be between 100 and 256000."
+  }
+}
+
+variable "root_volume_throughput" {
+  description = <<-EOF
+    Provisioned throughput of the root volume in MiB/s. Only supported with gp3 (125-1000).
+    If not specified, the gp3 baseline of 125 MiB/s is used.
+  EOF
+  type        = number
+  default     = null
+
+  validation {
+    condition     = var.root_volume_throughput == null ? true : var.root_volume_throughput >= 125 && var.root_volume_throughput <= 1000
+    error_message = "root_volume_throughput must be between 125 and 1000 MiB/s."
+  }
+}
+
+variable "swap_size_multiplier" {
+  description = <<-EOF
+    Swap space to reserve on the root volume, as a multiple of the instance RAM.
+    The root volume is sized as `root_volume_size + ceil(swap_size_multiplier * RAM in GiB)`.
+    Set to 0 to not reserve any space for swap.
+  EOF
+  type        = number
+  default     = 2
+  nullable    = false
+
+  validation {
+    condition     = var.swap_size_multiplier >= 0
+    error_message = "swap_size_multiplier must be greater than or equal to 0."
+  }
+}
+
+variable "extra_block_devices" {
+  description = <<-EOF
+    Additional block device mappings for the launch template.
+    Set `virtual_name` (e.g. "ephemeral0") to map an instance store volume,
+    otherwise an EBS volume is attached.
+
+    **Example:**
+    ```
+    extra_block_devices = [
+      {
+        device_name = "/dev/sdf"
+        volume_size = 100
+        throughput  = 250
+      },
+      {
+        device_name  = "/dev/sdb"
+        virtual_name = "ephemeral0"
+      }
+    ]
+    ```
+  EOF
+  type = list(object({
+    device_name           = string
+    virtual_name          = optional(string)
+    volume_size           = optional(number)
+    volume_type           = optional(string, "gp3")
+    iops                  = optional(number)
+    throughput            = optional(number)
+    encrypted             = optional(bool, true)
+    snapshot_id           = optional(string)
+    delete_on_termination = optional(bool, true)
+  }))
+  default  = []
+  nullable = false
+
+  validation {
+    condition = alltrue(
+      [
+        for d in var.extra_block_devices :
+        d.virtual_name != null || d.volume_size != null || d.snapshot_id != null
+      ]
+    )
+    error_message = "Each EBS entry in extra_block_devices needs a volume_size or a snapshot_id."
+  }
+  validation {
+    condition = alltrue(
+      [
+        for d in var.extra_block_devices :
+        d.virtual_name == null ? true : can(regex("^ephemeral[0-9]+$", d.virtual_name))
+      ]
+    )
+    error_message = "extra_block_devices virtual_name must be of the form ephemeralN."
+  }
+}
 variable "service_name" {
   description = "Descriptive name of a service that will use this VPC"
   type        = string
   default     = "website"
 }
 
-variable "on_demand_base_capacity" {
-  description = "If specified, the ASG will request spot instances and this will be the minimal number of on-demand instances."
-  type        = number
-  default     = null
+variable "on_demand_base_capacity" {
+  description = "If specified, the ASG will request spot instances and this will be the minimal number of on-demand instances."
+  type        = number
+  default     = null
+}
+
+variable "on_demand_percentage_above_base_capacity" {
+  description = <<-EOF
+    Percentage of on-demand instances above `on_demand_base_capacity`; the rest are spot instances.
+    If not specified, it's 0 (all spot) when `on_demand_base_capacity` is set,
+    and 100 (all on-demand) when only `instance_type_overrides` or
+    `instance_requirements` are set.
+  EOF
+  type        = number
+  default     = null
+
+  validation {
+    condition     = var.on_demand_percentage_above_base_capacity == null ? true : (var.on_demand_percentage_above_base_capacity >= 0 && var.on_demand_percentage_above_base_capacity <= 100)
+    error_message = "on_demand_percentage_above_base_capacity must be between 0 and 100."
+  }
+}
+
+variable "spot_allocation_strategy" {
+  description = <<-EOF
+    How the ASG allocates spot capacity across instance pools.
+    Used only with a mixed instances policy.
+
+    - `price-capacity-optimized` (default): Pools with the most capacity at the lowest price.
+      Recommended by AWS, it minimizes interruptions.
+    - `capacity-optimized`: Pools with the most available capacity.
+    - `capacity-optimized-prioritized`: Like capacity-optimized, honors the order of `instance_type_overrides`.
+    - `lowest-price`: The cheapest pools, at the cost of more interruptions.
+  EOF
+  type        = string
+  default     = "price-capacity-optimized"
+
+  validation {
+    condition = contains(
+      ["price-capacity-optimized", "capacity-optimized", "capacity-optimized-prioritized", "lowest-price"],
+      var.spot_allocation_strategy
+    )
+    error_message = "spot_allocation_strategy must be one of: price-capacity-optimized, capacity-optimized, capacity-optimized-prioritized, lowest-price."
+  }
+}
+
+variable "capacity_rebalance" {
+  description = <<-EOF
+    Whether the ASG proactively replaces spot instances that receive
+    a rebalance recommendation, before they are interrupted.
+  EOF
+  type        = bool
+  default     = false
+}
+
+variable "instance_type_overrides" {
+  description = <<-EOF
+    List of instance types the ASG can launch, instead of only `instance_type`.
+    Diversifying instance types keeps scale-out reliable when one spot pool runs out of capacity.
+
+    `weighted_capacity` is how many capacity units an instance of this type counts for.
+    If you use weights, `asg_min_size` and `asg_max_size` are in capacity units.
+
+    **Example:**
+    ```
+    instance_type_overrides = [
+      { instance_type = "m6i.large" },
+      { instance_type = "m5.large" },
+      { instance_type = "m6i.xlarge", weighted_capacity = "2" },
+    ]
+    ```
+
+    Can't be combined with `instance_requirements`.
+  EOF
+  type = list(object({
+    instance_type     = string
+    weighted_capacity = optional(string)
+  }))
+  default = []
+}
+
+variable "instance_requirements" {
+  description = <<-EOF
+    Attribute-based instance type selection. The ASG launches any instance type
+    matching these requirements. Memory is in MiB.
+
+    **Example:**
+    ```
+    instance_requirements = {
+      vcpu_min       = 2
+      vcpu_max       = 4
+      memory_mib_min = 4096
+      memory_mib_max = 16384
+    }
+    ```
+
+    Can't be combined with `instance_type_overrides`.
+  EOF
+  type = object({
+    vcpu_min                = number
+    vcpu_max                = optional(number)
+    memory_mib_min          = number
+    memory_mib_max          = optional(number)
+    allowed_instance_types  = optional(list(string))
+    excluded_instance_types = optional(list(string))
+    burstable_performance   = optional(string)
+    cpu_manufacturers       = optional(list(string))
+    instance_generations    = optional(list(string))
+  })
+  default = null
 }
 
 variable "ssh_cidr_block" {
@@ -506,6 +1316,26 @@ variable "target_group_protocol" {
   }
 }
 
+variable "target_group_protocol_version" {
+  description = <<-EOF
+    Protocol version the load balancer uses to send requests to targets: HTTP1, HTTP2, or GRPC.
+
+    - `HTTP1` (default): HTTP/1.1 to targets.
+    - `HTTP2`: HTTP/2 to targets. Multiplexes requests over fewer backend connections.
+    - `GRPC`: For gRPC services. The health check matcher defaults to gRPC status code 12,
+      set `alb_healthcheck_path` to a gRPC method, e.g. "/package.Service/Check".
+
+    **Note:** Changing the protocol version replaces the target group.
+  EOF
+  type        = string
+  default     = "HTTP1"
+
+  validation {
+    condition     = contains(["HTTP1", "HTTP2", "GRPC"], var.target_group_protocol_version)
+    error_message = "target_group_protocol_version must be one of: HTTP1, HTTP2, GRPC."
+  }
+}
+
 variable "load_balancing_algorithm_type" {
   description = <<-EOF
     Load balancing algorithm for the target group.
@@ -518,6 +1348,10 @@ variable "load_balancing_algorithm_type" {
       Best for: Workloads with varying request processing times, long-running requests,
       or when backend instances have different capacities.
 
+    - `weighted_random`: Routes requests randomly, weighted by target health.
+      Best for: Pods where one degraded instance shouldn't get its full share of requests.
+      Enables automatic target weights (see `load_balancing_anomaly_mitigation`).
+
     **Note:** When stickiness is enabled, the algorithm applies only to initial
     session assignment. Subsequent requests from the same client go to the same target.
   EOF
@@ -525,8 +1359,113 @@ variable "load_balancing_algorithm_type" {
   default     = "round_robin"
 
   validation {
-    condition     = contains(["round_robin", "least_outstanding_requests"], var.load_balancing_algorithm_type)
-    error_message = "load_balancing_algorithm_type must be either 'round_robin' or 'least_outstanding_requests'."
+    condition     = contains(["round_robin", "least_outstanding_requests", "weighted_random"], var.load_balancing_algorithm_type)
+    error_message = "load_balancing_algorithm_type must be one of: round_robin, least_outstanding_requests, weighted_random."
+  }
+}
+
+variable "load_balancing_anomaly_mitigation" {
+  description = <<-EOF
+    Whether to turn on anomaly mitigation of the ALB automatic target weights.
+    Requires `load_balancing_algorithm_type = "weighted_random"`.
+
+    The ALB detects targets that return more errors than the rest of the target group
+    and shifts traffic away from them until they recover.
+  EOF
+  type        = bool
+  default     = false
+}
+
+variable "target_group_slow_start" {
+  description = <<-EOF
+    Time in seconds during which a newly registered target receives a linearly
+    increasing share of requests. Gives freshly launched instances time to warm
+    caches and JIT before they get their full share of traffic.
+
+    0 disables slow start. Otherwise, valid range is 30-900 seconds.
+    Not supported with the `weighted_random` algorithm.
+  EOF
+  type        = number
+  default     = 0
+
+  validation {
+    condition     = var.target_group_slow_start == 0 || (var.target_group_slow_start >= 30 && var.target_group_slow_start <= 900)
+    error_message = "target_group_slow_start must be 0 or between 30 and 900 seconds."
+  }
+}
+
+variable "backend_pools" {
+  description = <<-EOF
+    Additional backend pools, keyed by pool name. Each pool gets its own target group,
+    autoscaling group and a listener rule that forwards requests matching `path_patterns`
+    (on the module's DNS names) to the pool. Requests that match no pool go to the main ASG.
+
+    Use it to separate cheap static requests from heavy API requests,
+    so that each pool is sized and scales on its own.
+
+    Pools use the same launch template (AMI, userdata, instance type) as the main ASG.
+    Unset attributes default to the corresponding module variables
+    (e.g. `port` to `target_group_port`, `asg_min_size` to `asg_min_size`).
+
+    Listener rules take priorities 98, 97, ... in the alphabetical order of pool names,
+    unless `priority` is set (must be between 1 and 98). Priorities must be distinct,
+    including the auto-assigned ones.
+
+    **Note:** An ALB rule allows up to 5 condition values, and the rule matches the
+    host names from `dns_a_records` too: `length(dns_a_records) + length(path_patterns)`
+    must be at most 5 for each pool.
+
+    **Example:**
+    ```
+    backend_pools = {
+      api = {
+        path_patterns                 = ["/api/*"]
+        health_check_path             = "/api/health"
+        load_balancing_algorithm_type = "least_outstanding_requests"
+        asg_min_size                  = 4
+        asg_max_size                  = 20
+      }
+      static = {
+        path_patterns        = ["/static/*", "/assets/*"]
+        deregistration_delay = 30
+        asg_min_size         = 2
+        asg_max_size         = 4
+      }
+    }
+    ```
+  EOF
+  type = map(object({
+    path_patterns                 = list(string)
+    priority                      = optional(number)
+    port                          = optional(number)
+    protocol                      = optional(string)
+    health_check_path             = optional(string)
+    health_check_matcher          = optional(string)
+    load_balancing_algorithm_type = optional(string)
+    deregistration_delay          = optional(number)
+    asg_min_size                  = optional(number)
+    asg_max_size                  = optional(number)
+    autoscaling_target_cpu_load   = optional(number)
+  }))
+  default = {}
+
+  validation {
+    condition = alltrue([
+      for pool in var.backend_pools : length(pool.path_patterns) >= 1 && length(pool.path_patterns) <= 5
+    ])
+    error_message = "Each backend pool must have between 1 and 5 path_patterns."
+  }
+
+  validation {
+    condition = alltrue([
+      for pool in var.backend_pools : pool.load_balancing_algorithm_type == null ? true : contains(["round_robin", "least_outstanding_requests", "weighted_random"], pool.load_balancing_algorithm_type)
+    ])
+    error_message = "Backend pool load_balancing_algorithm_type must be one of: round_robin, least_outstanding_requests, weighted_random."
+  }
+
+  validation {
+    condition     = !contains(keys(var.backend_pools), "default")
+    error_message = "A backend pool can't be named \"default\", the name stands for the main target group in alarm names."
   }
 }
 
@@ -852,6 +1791,46 @@ variable "alarm_target_response_time_threshold" {
   }
 }
 
+variable "alarm_target_response_time_percentiles" {
+  description = <<-EOF
+    Tail latency alarms: map of TargetResponseTime percentiles to thresholds in seconds.
+    Each entry creates an alarm on the percentile statistic, in addition to the
+    average-based latency alarm. An average hides tail latency, a p99 alarm doesn't.
+
+    Alarms are only created when `alarm_emails` or `alarm_topic_arns` is set.
+
+    **Example:**
+    ```
+    alarm_target_response_time_percentiles = {
+      p90 = 0.5
+      p99 = 2.0
+    }
+    ```
+  EOF
+  type        = map(number)
+  default     = {}
+  nullable    = false
+
+  validation {
+    condition = alltrue(
+      [
+        for p, threshold in var.alarm_target_response_time_percentiles :
+        can(regex("^p(\\d{1,2}(\\.\\d{1,2})?|100)$", p)) && threshold > 0
+      ]
+    )
+    error_message = "alarm_target_response_time_percentiles keys must be percentiles like 'p90' or 'p99.9' and thresholds must be greater than 0."
+  }
+}
+
+variable "alarm_target_response_time_per_target_group" {
+  description = <<-EOF
+    If true, the percentile latency alarms are created per target group
+    (the main one and each of `backend_pools`) instead of for the whole load balancer.
+  EOF
+  type        = bool
+  default     = false
+}
+
 variable "alarm_success_rate_threshold" {
   description = <<-EOF
     Minimum success rate (percentage) before triggering an alarm.
@@ -972,3 +1951,316 @@ variable "alarm_evaluation_periods" {
     error_message = "Evaluation periods must be at least 1"
   }
 }
+
+variable "alarm_saturation_enabled" {
+  description = <<-EOF
+    If true, creates alarms that show the load balancer or the targets are saturated:
+    - RejectedConnectionCount: the ALB hit its maximum number of connections
+    - TargetConnectionErrorCount: the ALB couldn't connect to targets
+    - HTTPCode_ELB_503_Count: no healthy targets or no capacity to serve
+    - ActiveConnectionCount growth: concurrent connections surge
+    - ConsumedLCUs: load balancer capacity units above a level (if `alarm_consumed_lcu_threshold` is set)
+
+    Alarms are only created when `alarm_emails` or `alarm_topic_arns` is set.
+  EOF
+  type        = bool
+  default     = false
+}
+
+variable "alarm_rejected_connection_threshold" {
+  description = "Number of rejected connections per minute that triggers the saturation alarm."
+  type        = number
+  default     = 5
+
+  validation {
+    condition     = var.alarm_rejected_connection_threshold >= 0
+    error_message = "alarm_rejected_connection_threshold must be >= 0."
+  }
+}
+
+variable "alarm_target_connection_error_threshold" {
+  description = "Number of failed connections from the ALB to targets per minute that triggers the saturation alarm."
+  type        = number
+  default     = 5
+
+  validation {
+    condition     = var.alarm_target_connection_error_threshold >= 0
+    error_message = "alarm_target_connection_error_threshold must be >= 0."
+  }
+}
+
+variable "alarm_elb_503_threshold" {
+  description = "Number of 503 responses generated by the ALB per minute that triggers the saturation alarm."
+  type        = number
+  default     = 10
+
+  validation {
+    condition     = var.alarm_elb_503_threshold >= 0
+    error_message = "alarm_elb_503_threshold must be >= 0."
+  }
+}
+
+variable "alarm_saturation_evaluation_periods" {
+  description = "Number of 1-minute periods the saturation alarms evaluate."
+  type        = number
+  default     = 5
+
+  validation {
+    condition     = var.alarm_saturation_evaluation_periods >= 1
+    error_message = "alarm_saturation_evaluation_periods must be at least 1."
+  }
+}
+
+variable "alarm_saturation_datapoints_to_alarm" {
+  description = <<-EOF
+    Number of minutes within the evaluation periods that must breach the threshold
+    to trigger a saturation alarm ("M out of N").
+    The default of 3 out of 5 ignores a single burst of rejected connections or 503s.
+  EOF
+  type        = number
+  default     = 3
+
+  validation {
+    condition     = var.alarm_saturation_datapoints_to_alarm >= 1
+    error_message = "alarm_saturation_datapoints_to_alarm must be at least 1."
+  }
+}
+
+variable "alarm_active_connection_growth_threshold" {
+  description = <<-EOF
+    Growth of ActiveConnectionCount, in percent from one 5-minute period to the next,
+    that triggers the saturation alarm. E.g. 100 alerts when concurrent connections double.
+    Set to null to disable the alarm.
+  EOF
+  type        = number
+  default     = 100
+
+  validation {
+    condition     = var.alarm_active_connection_growth_threshold == null ? true : var.alarm_active_connection_growth_threshold > 0
+    error_message = "alarm_active_connection_growth_threshold must be greater than 0."
+  }
+}
+
+variable "alarm_lcu_reservation_utilization_threshold" {
+  description = <<-EOF
+    Peak LCUs, as a percentage of `alb_minimum_capacity_units`, that trigger the
+    LCU reservation alarm. The alarm warns that traffic approaches the reservation,
+    and the load balancer will have to scale beyond it under load.
+    Set to null to disable the alarm.
+
+    **Note:** The alarm is created when `alb_minimum_capacity_units` is set and
+    alarms are enabled (`alarm_emails` or `alarm_topic_arns`), whether or not
+    `alarm_saturation_enabled` is true. It is listed in `saturation_alarm_arns`.
+  EOF
+  type        = number
+  default     = 80
+
+  validation {
+    condition     = var.alarm_lcu_reservation_utilization_threshold == null ? true : var.alarm_lcu_reservation_utilization_threshold > 0
+    error_message = "alarm_lcu_reservation_utilization_threshold must be greater than 0."
+  }
+}
+
+variable "alarm_consumed_lcu_threshold" {
+  description = <<-EOF
+    ConsumedLCUs (load balancer capacity units) that trigger the saturation alarm.
+    There is no universal value, set it from the load balancer's normal peak.
+    If not specified, the alarm is not created.
+  EOF
+  type        = number
+  default     = null
+
+  validation {
+    condition     = var.alarm_consumed_lcu_threshold == null ? true : var.alarm_consumed_lcu_threshold > 0
+    error_message = "alarm_consumed_lcu_threshold must be greater than 0."
+  }
+}
+
+variable "alarm_anomaly_detection_enabled" {
+  description = <<-EOF
+    If true, creates CloudWatch anomaly detection alarms on the load balancer's
+    RequestCount (too high or too low) and TargetResponseTime (too high).
+    The band follows daily and weekly traffic patterns, so it catches regressions
+    that static thresholds miss, e.g. a latency that is normal at peak but not at 3am.
+
+    Anomaly detection needs about two weeks of metric history to learn the patterns.
+    Alarms are only created when `alarm_emails` or `alarm_topic_arns` is set.
+  EOF
+  type        = bool
+  default     = false
+}
+
+variable "alarm_anomaly_detection_band_width" {
+  description = <<-EOF
+    Width of the anomaly detection band in standard deviations.
+    A wider band raises fewer, more significant alarms.
+  EOF
+  type        = number
+  default     = 2
+
+  validation {
+    condition     = var.alarm_anomaly_detection_band_width > 0
+    error_message = "alarm_anomaly_detection_band_width must be greater than 0."
+  }
+}
+
+variable "alarm_anomaly_detection_period" {
+  description = "Period in seconds of the metrics evaluated by the anomaly detection alarms."
+  type        = number
+  default     = 300
+
+  validation {
+    condition     = contains([60, 300, 900, 3600], var.alarm_anomaly_detection_period)
+    error_message = "alarm_anomaly_detection_period must be one of: 60, 300, 900, 3600."
+  }
+}
+
+variable "alarm_anomaly_detection_evaluation_periods" {
+  description = "Number of periods the anomaly detection alarms evaluate."
+  type        = number
+  default     = 3
+
+  validation {
+    condition     = var.alarm_anomaly_detection_evaluation_periods >= 1
+    error_message = "alarm_anomaly_detection_evaluation_periods must be at least 1."
+  }
+}
+
+variable "alarm_anomaly_detection_datapoints_to_alarm" {
+  description = <<-EOF
+    Number of data points within the evaluation periods that must be outside
+    the band to trigger the alarm ("M out of N").
+    If not specified, all evaluation periods must be outside the band.
+  EOF
+  type        = number
+  default     = null
+
+  validation {
+    condition     = var.alarm_anomaly_detection_datapoints_to_alarm == null ? true : var.alarm_anomaly_detection_datapoints_to_alarm >= 1
+    error_message = "alarm_anomaly_detection_datapoints_to_alarm must be at least 1."
+  }
+}
+
+variable "alarm_anomaly_detection_latency_statistic" {
+  description = "TargetResponseTime statistic that the latency anomaly alarm tracks, e.g. Average, p90, p99."
+  type        = string
+  default     = "p90"
+
+  validation {
+    condition     = var.alarm_anomaly_detection_latency_statistic == "Average" || can(regex("^p(\\d{1,2}(\\.\\d{1,2})?|100)$", var.alarm_anomaly_detection_latency_statistic))
+    error_message = "alarm_anomaly_detection_latency_statistic must be Average or a percentile like 'p90'."
+  }
+}
+
+variable "dashboard_enabled" {
+  description = <<-EOF
+    If true, creates a CloudWatch dashboard named after the autoscaling group.
+    It shows request rate, p50/p90/p99 latency, HTTP errors split by load balancer
+    and targets, target health, ASG capacity, CPU against `autoscaling_target_cpu_load`
+    and the state of the module's alarms.
+
+    **Note:** The ASG capacity graph only shows metrics listed in `asg_enabled_metrics`.
+  EOF
+  type        = bool
+  default     = false
+}
+
+variable "dashboard_period" {
+  description = "Default period in seconds of the dashboard graphs."
+  type        = number
+  default     = 60
+
+  validation {
+    condition     = var.dashboard_period >= 60 && var.dashboard_period % 60 == 0
+    error_message = "dashboard_period must be a multiple of 60."
+  }
+}
+
+# CloudFront edge caching
+variable "cloudfront_enabled" {
+  description = <<-EOF
+    Whether to create a CloudFront distribution in front of the ALB.
+
+    When enabled, the DNS records from `dns_a_records` point at the distribution
+    instead of the ALB, and cacheable responses are served from CloudFront edge locations.
+    Requests are forwarded to the ALB over HTTPS with the viewer Host header.
+
+    **Note:** CloudFront needs an ACM certificate in us-east-1.
+    Outside us-east-1 you must provide one with `cloudfront_certificate_arn`.
+  EOF
+  type        = bool
+  default     = false
+}
+
+variable "cloudfront_certificate_arn" {
+  description = <<-EOF
+    ARN of an ACM certificate in us-east-1 that covers all DNS names from `dns_a_records`.
+    Required when `cloudfront_enabled` is true and the module is deployed outside us-east-1.
+    In us-east-1, the module's own certificate is used by default.
+  EOF
+  type        = string
+  default     = null
+}
+
+variable "cloudfront_default_cache_policy" {
+  description = <<-EOF
+    Name of the CloudFront cache policy for requests that match no `cloudfront_cache_behaviors`.
+    The default, `Managed-CachingDisabled`, passes dynamic traffic to the ALB uncached.
+  EOF
+  type        = string
+  default     = "Managed-CachingDisabled"
+}
+
+variable "cloudfront_cache_behaviors" {
+  description = <<-EOF
+    Cache behaviors for path patterns with cacheable content, in order of precedence.
+    `cache_policy` is the name of a managed or custom CloudFront cache policy.
+    Cached behaviors allow GET, HEAD and OPTIONS requests only.
+
+    **Example:**
+    ```
+    cloudfront_cache_behaviors = [
+      { path_pattern = "/static/*" },
+      { path_pattern = "/images/*", cache_policy = "my-images-policy" },
+    ]
+    ```
+  EOF
+  type = list(object({
+    path_pattern = string
+    cache_policy = optional(string, "Managed-CachingOptimized")
+  }))
+  default = []
+}
+
+variable "cloudfront_compression" {
+  description = "Whether CloudFront compresses responses (gzip and Brotli) for viewers that support it."
+  type        = bool
+  default     = true
+}
+
+variable "cloudfront_origin_shield_region" {
+  description = <<-EOF
+    AWS region of CloudFront Origin Shield, an extra caching layer that reduces
+    the load on the ALB. Pick the region closest to the ALB, usually the module's region.
+    If not specified, Origin Shield is disabled.
+  EOF
+  type        = string
+  default     = null
+}
+
+variable "cloudfront_price_class" {
+  description = "CloudFront price class: PriceClass_All, PriceClass_200 or PriceClass_100."
+  type        = string
+  default     = "PriceClass_All"
+
+  validation {
+    condition     = contains(["PriceClass_All", "PriceClass_200", "PriceClass_100"], var.cloudfront_price_class)
+    error_message = "cloudfront_price_class must be one of: PriceClass_All, PriceClass_200, PriceClass_100."
+  }
+}
+
+variable "cloudfront_web_acl_id" {
+  description = "ARN of a WAFv2 web ACL (scope CLOUDFRONT) to associate with the distribution."
+  type        = string
+  default     = null
+}
@@ -0,0 +1,3 @@
+"""
+Python tooling for the ALB access logs of a website pod.
+"""
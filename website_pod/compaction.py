@@ -0,0 +1,252 @@
+"""
+Compact one day of raw ALB access logs into a single Parquet object.
+
+The module runs as the AWS Glue Python shell job created by ``compaction.tf``.
+It reads ``input.regex`` and the columns from the raw access log Glue table,
+so the Parquet output always has the same schema and types as the table it
+compacts.
+
+Glue uploads this file as a standalone script, so it may only import the
+standard library, boto3 and pyarrow.
+"""
+
+import argparse
+import gzip
+import io
+import logging
+import re
+import tempfile
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urlparse
+
+import boto3
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+LOG = logging.getLogger(__name__)
+
+ARROW_TYPES = {
+    "string": pa.string(),
+    "int": pa.int32(),
+    "bigint": pa.int64(),
+    "double": pa.float64(),
+}
+# Values outside the range of the column type are NULL, like unparsable ones
+_INT_RANGES = {
+    "int": (-(2**31), 2**31 - 1),
+    "bigint": (-(2**63), 2**63 - 1),
+}
+OUTPUT_NAME = "alb-access-logs.parquet"
+DEFAULT_BATCH_SIZE = 50_000
+
+
+@dataclass(frozen=True)
+class SourceTable:
+    """Schema and location of the raw access log table."""
+
+    location: str
+    regex: str
+    columns: list
+
+    @property
+    def schema(self) -> pa.Schema:
+        return pa.schema(
+            [pa.field(col["Name"], ARROW_TYPES[col["Type"]]) for col in self.columns]
+        )
+
+
+def split_s3_url(url: str) -> tuple:
+    """Split ``s3://bucket/prefix/`` into the bucket and the key prefix."""
+    parsed = urlparse(url)
+    if parsed.scheme != "s3":
+        raise ValueError(f"Not an S3 URL: {url}")
+    return parsed.netloc, parsed.path.lstrip("/")
+
+
+def get_source_table(glue_client, database: str, table: str) -> SourceTable:
+    """Read the location, the SerDe regex and the columns of a Glue table."""
+    descriptor = glue_client.get_table(DatabaseName=database, Name=table)["Table"][
+        "StorageDescriptor"
+    ]
+    return SourceTable(
+        location=descriptor["Location"],
+        regex=descriptor["SerdeInfo"]["Parameters"]["input.regex"],
+        columns=descriptor["Columns"],
+    )
+
+
+def _converter(hive_type: str):
+    """
+    Return a function that converts a captured group like the Hive
+    RegexSerDe does: values that don't parse or don't fit the column
+    type become NULL.
+    """
+    cast = {"int": int, "bigint": int, "double": float}.get(hive_type)
+    if cast is None:
+        return lambda value: value
+    low, high = _INT_RANGES.get(hive_type, (None, None))
+
+    def convert(value):
+        try:
+            number = cast(value)
+        except (TypeError, ValueError):
+            return None
+        if low is not None and not low <= number <= high:
+            return None
+        return number
+
+    return convert
+
+
+def parse_lines(lines, source: SourceTable, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Parse access log lines into Arrow record batches of up to ``batch_size`` rows.
+
+    Lines that don't match the regex are skipped. Unlike the RegexSerDe, which
+    returns them as rows of NULLs, they carry no information worth storing.
+
+    :return: A generator of ``(record_batch, skipped_lines)`` tuples.
+    """
+    pattern = re.compile(source.regex)
+    schema = source.schema
+    converters = [_converter(col["Type"]) for col in source.columns]
+    rows = []
+    skipped = 0
+    for line in lines:
+        match = pattern.fullmatch(line)
+        if match is None:
+            skipped += 1
+            continue
+        rows.append(match.groups())
+        if len(rows) >= batch_size:
+            yield _to_batch(rows, schema, converters), skipped
+            rows = []
+            skipped = 0
+    if rows or skipped:
+        yield _to_batch(rows, schema, converters), skipped
+
+
+def _to_batch(rows, schema, converters) -> pa.RecordBatch:
+    arrays = [
+        pa.array([convert(row[idx]) for row in rows], type=field.type)
+        for idx, (field, convert) in enumerate(zip(schema, converters))
+    ]
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def iter_log_lines(s3_client, bucket: str, key: str):
+    """Stream the lines of a gzip-compressed log object."""
+    body = s3_client.get_object(Bucket=bucket, Key=key)["Body"]
+    with gzip.GzipFile(fileobj=body) as gz:
+        for line in io.TextIOWrapper(gz, encoding="utf-8", errors="replace"):
+            yield line.rstrip("\n")
+
+
+def list_keys(s3_client, bucket: str, prefix: str):
+    """List all object keys under a prefix."""
+    paginator = s3_client.get_paginator("list_objects_v2")
+    for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
+        for obj in page.get("Contents", []):
+            yield obj["Key"]
+
+
+def compact_day(
+    s3_client,
+    glue_client,
+    database: str,
+    table: str,
+    day: str,
+    target_location: str,
+    compression: str = "snappy",
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> dict:
+    """
+    Rewrite the raw access logs of one day into one Parquet object.
+
+    The output goes to ``<target_location><day>/alb-access-logs.parquet``,
+    so re-running the job for the same day replaces the previous output.
+
+    :param day: Partition to compact, in the ``yyyy/MM/dd`` format.
+    :return: Statistics of the run: ``objects``, ``rows``, ``skipped`` and
+        ``key`` (None if there were no logs for the day).
+    """
+    source = get_source_table(glue_client, database, table)
+    source_bucket, source_prefix = split_s3_url(source.location)
+    target_bucket, target_prefix = split_s3_url(target_location)
+    stats = {"objects": 0, "rows": 0, "skipped": 0, "key": None}
+
+    keys = list(list_keys(s3_client, source_bucket, f"{source_prefix}{day}/"))
+    if not keys:
+        LOG.info("No access logs for %s under %s", day, source.location)
+        return stats
+
+    with tempfile.NamedTemporaryFile(suffix=".parquet") as output:
+        with pq.ParquetWriter(
+            output.name, source.schema, compression=compression
+        ) as writer:
+            for key in keys:
+                for batch, skipped in parse_lines(
+                    iter_log_lines(s3_client, source_bucket, key),
+                    source,
+                    batch_size=batch_size,
+                ):
+                    if batch.num_rows:
+                        writer.write_batch(batch)
+                    stats["rows"] += batch.num_rows
+                    stats["skipped"] += skipped
+                stats["objects"] += 1
+
+        stats["key"] = f"{target_prefix}{day}/{OUTPUT_NAME}"
+        s3_client.upload_file(output.name, target_bucket, stats["key"])
+
+    LOG.info(
+        "Compacted %d objects (%d rows, %d unparsable lines) into s3://%s/%s",
+        stats["objects"],
+        stats["rows"],
+        stats["skipped"],
+        target_bucket,
+        stats["key"],
+    )
+    return stats
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--source_database", required=True)
+    parser.add_argument("--source_table", required=True)
+    parser.add_argument(
+        "--target_location",
+        required=True,
+        help="S3 URL of the Parquet table, e.g. s3://bucket/parquet/",
+    )
+    parser.add_argument(
+        "--day",
+        help="Day to compact as yyyy/MM/dd or yyyy-MM-dd. Defaults to yesterday (UTC).",
+    )
+    parser.add_argument("--compression", default="snappy")
+    # Glue passes its own arguments (--JOB_ID, --scriptLocation, ...) too.
+    args, _ = parser.parse_known_args(argv)
+    if args.day is None:
+        yesterday = datetime.now(timezone.utc) - timedelta(days=1)
+        args.day = yesterday.strftime("%Y/%m/%d")
+    args.day = args.day.replace("-", "/")
+    return args
+
+
+def main(argv=None):
+    logging.basicConfig(level=logging.INFO)
+    args = parse_args(argv)
+    compact_day(
+        boto3.client("s3"),
+        boto3.client("glue"),
+        database=args.source_database,
+        table=args.source_table,
+        day=args.day,
+        target_location=args.target_location,
+        compression=args.compression,
+    )
+
+
+if __name__ == "__main__":
+    main()
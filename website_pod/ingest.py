@@ -0,0 +1,269 @@
+"""
+Incremental, parallel download of ALB access logs from S3.
+
+The load balancer writes a small gzip object per node every five minutes under
+``AWSLogs/<account>/elasticloadbalancing/<region>/yyyy/mm/dd/``. ``ingest()``
+lists the objects with a paginator, downloads and decompresses them in a
+bounded thread pool that shares one pooled S3 client, and keeps a
+``Watermark`` so that the next run only fetches objects it hasn't seen.
+
+Object keys sort by time, but objects may land out of order. The watermark
+only moves past keys whose objects are older than ``settle``; newer keys that
+were already ingested are remembered individually until they settle.
+"""
+
+import argparse
+import gzip
+import json
+import logging
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Iterator
+
+import boto3
+from botocore.config import Config
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_MAX_WORKERS = 16
+DEFAULT_SETTLE = timedelta(hours=1)
+
+
+@dataclass
+class Watermark:
+    """
+    Position of the previous runs in the bucket listing.
+
+    All keys up to and including ``start_after`` are ingested.
+    ``seen`` holds the keys after it that are ingested too.
+    """
+
+    start_after: str = ""
+    seen: set = field(default_factory=set)
+
+    @classmethod
+    def load(cls, path: str) -> "Watermark":
+        """Read a watermark file. A missing file is an empty watermark."""
+        if not os.path.exists(path):
+            return cls()
+        with open(path) as fp:
+            state = json.load(fp)
+        return cls(start_after=state["start_after"], seen=set(state["seen"]))
+
+    def save(self, path: str):
+        """Write the watermark atomically, so a crash can't leave a torn file."""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as fp:
+            json.dump(
+                {"start_after": self.start_after, "seen": sorted(self.seen)},
+                fp,
+                indent=2,
+            )
+        os.replace(tmp_path, path)
+
+    def advance(self, objects: list, ingested: set, cutoff: datetime):
+        """
+        Move ``start_after`` past the leading run of ingested objects
+        last modified before ``cutoff``.
+
+        :param objects: Objects after ``start_after`` as returned by
+            ``list_objects()``, in key order.
+        :param ingested: Keys ingested by this run.
+        """
+        done = self.seen | ingested
+        for obj in objects:
+            if obj["Key"] not in done or obj["LastModified"] >= cutoff:
+                break
+            self.start_after = obj["Key"]
+        self.seen = {key for key in done if key > self.start_after}
+
+
+@dataclass
+class IngestStats:
+    """Counters of an ingestion run."""
+
+    objects: int = 0
+    compressed_bytes: int = 0
+    bytes: int = 0
+    seconds: float = 0.0
+
+    @property
+    def objects_per_second(self) -> float:
+        return self.objects / self.seconds if self.seconds else 0.0
+
+    @property
+    def mb_per_second(self) -> float:
+        """Decompressed megabytes per second."""
+        return self.bytes / 2**20 / self.seconds if self.seconds else 0.0
+
+
+def make_s3_client(max_workers: int = DEFAULT_MAX_WORKERS, **kwargs):
+    """
+    Create an S3 client whose connection pool fits ``max_workers`` threads.
+    boto3 clients are thread safe, so all workers share it.
+    """
+    config = Config(
+        max_pool_connections=max_workers,
+        retries={"mode": "adaptive", "max_attempts": 10},
+    )
+    return boto3.client("s3", config=config, **kwargs)
+
+
+def list_objects(s3_client, bucket: str, prefix: str, start_after: str = ""):
+    """List the objects under a prefix with keys after ``start_after``, in key order."""
+    paginator = s3_client.get_paginator("list_objects_v2")
+    kwargs = {"StartAfter": start_after} if start_after else {}
+    for page in paginator.paginate(Bucket=bucket, Prefix=prefix, **kwargs):
+        yield from page.get("Contents", [])
+
+
+def fetch_object(s3_client, bucket: str, key: str) -> bytes:
+    """Download an object and decompress it if it is gzipped."""
+    body = s3_client.get_object(Bucket=bucket, Key=key)["Body"].read()
+    return gzip.decompress(body) if key.endswith(".gz") else body
+
+
+def ingest(
+    s3_client,
+    bucket: str,
+    prefix: str,
+    watermark: Watermark,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    settle: timedelta = DEFAULT_SETTLE,
+    now: datetime = None,
+    stats: IngestStats = None,
+) -> Iterator[tuple]:
+    """
+    Download the objects under ``prefix`` that the watermark hasn't seen.
+
+    At most ``2 * max_workers`` objects are in flight, so memory stays bounded
+    however many objects are new. The watermark is advanced when the generator
+    finishes or is closed, and only past the objects the caller consumed:
+    an object counts once the caller asks for the next one, so an interrupted
+    run fetches the object it was processing again.
+
+    :param watermark: Updated in place. Save it after the run.
+    :param settle: Objects last modified less than ``settle`` before ``now``
+        may still be followed by late objects with smaller keys.
+    :param stats: If given, updated as the objects are consumed.
+    :return: A generator of ``(key, decompressed_bytes)`` in completion order.
+    """
+    stats = IngestStats() if stats is None else stats
+    cutoff = (now or datetime.now(timezone.utc)) - settle
+    started = time.monotonic()
+
+    listed = list(list_objects(s3_client, bucket, prefix, watermark.start_after))
+    new = iter([obj for obj in listed if obj["Key"] not in watermark.seen])
+    ingested = set()
+    in_flight = {}
+    pool = ThreadPoolExecutor(max_workers=max_workers)
+
+    def submit(obj):
+        future = pool.submit(fetch_object, s3_client, bucket, obj["Key"])
+        in_flight[future] = obj
+
+    try:
+        for obj in new:
+            submit(obj)
+            if len(in_flight) >= 2 * max_workers:
+                break
+
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                obj = in_flight.pop(future)
+                data = future.result()
+                next_obj = next(new, None)
+                if next_obj is not None:
+                    submit(next_obj)
+                yield obj["Key"], data
+                ingested.add(obj["Key"])
+                stats.objects += 1
+                stats.compressed_bytes += obj["Size"]
+                stats.bytes += len(data)
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+        watermark.advance(listed, ingested, cutoff)
+        stats.seconds += time.monotonic() - started
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--bucket", required=True, help="Access log bucket")
+    parser.add_argument(
+        "--prefix",
+        required=True,
+        help="e.g. AWSLogs/<account>/elasticloadbalancing/<region>/",
+    )
+    parser.add_argument(
+        "--watermark", required=True, help="Path of the watermark JSON file"
+    )
+    parser.add_argument(
+        "--since",
+        help="Day to start from as yyyy/MM/dd, if the watermark file doesn't exist yet.",
+    )
+    parser.add_argument(
+        "--output", help="Write the parsed log lines to this Parquet file."
+    )
+    parser.add_argument("--max-workers", type=int, default=DEFAULT_MAX_WORKERS)
+    parser.add_argument(
+        "--settle-minutes",
+        type=int,
+        default=int(DEFAULT_SETTLE.total_seconds() // 60),
+    )
+    args = parser.parse_args(argv)
+    if not args.prefix.endswith("/"):
+        args.prefix += "/"
+    return args
+
+
+def main(argv=None):
+    logging.basicConfig(level=logging.INFO)
+    args = parse_args(argv)
+
+    watermark = Watermark.load(args.watermark)
+    if not watermark.start_after and args.since:
+        # Keys of the day sort after its bare prefix.
+        watermark.start_after = f"{args.prefix}{args.since.replace('-', '/')}/"
+
+    stats = IngestStats()
+    objects = ingest(
+        make_s3_client(args.max_workers),
+        args.bucket,
+        args.prefix,
+        watermark,
+        max_workers=args.max_workers,
+        settle=timedelta(minutes=args.settle_minutes),
+        stats=stats,
+    )
+    if args.output:
+        # Imported here, so that plain downloads don't need pyarrow.
+        import pyarrow.parquet as pq
+
+        from website_pod.parser import SCHEMA, parse_lines
+
+        with pq.ParquetWriter(args.output, SCHEMA) as writer:
+            for _, data in objects:
+                lines = data.decode("utf-8", errors="replace").splitlines()
+                for batch in parse_lines(lines):
+                    writer.write_batch(batch)
+    else:
+        for _ in objects:
+            pass
+
+    watermark.save(args.watermark)
+    LOG.info(
+        "Ingested %d objects, %.1f MB in %.1fs: %.1f objects/s, %.1f MB/s",
+        stats.objects,
+        stats.bytes / 2**20,
+        stats.seconds,
+        stats.objects_per_second,
+        stats.mb_per_second,
+    )
+
+
+if __name__ == "__main__":
+    main()
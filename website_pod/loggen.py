@@ -0,0 +1,207 @@
+"""
+Synthetic ALB access log generator.
+
+Generates lines in the format the load balancer writes, with the shape of
+real traffic: URLs follow a Zipf distribution, user agents come from a list
+of common browsers and bots, and a share of the requests carries a long query
+string. ``FORMATS`` selects the fields: ``current`` lines end with
+``conn_trace_id`` (2024), ``classification`` lines stop after the desync
+classification fields (2020), and ``legacy`` lines stop after
+``target_status_code_list`` (2018).
+
+``pathological_lines()`` returns crafted lines for the worst cases of the
+``input.regex``: very long URLs full of spaces and quotes, with and without a
+mismatch at the end of the line.
+"""
+
+import argparse
+import gzip
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Iterator
+
+import numpy as np
+
+FORMATS = ("legacy", "classification", "current")
+
+USER_AGENTS = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/18.1 Safari/605.1.15",
+    "Mozilla/5.0 (X11; Linux x86_64; rv:133.0) Gecko/20100101 Firefox/133.0",
+    "Mozilla/5.0 (iPhone; CPU iPhone OS 18_1 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/18.1 Mobile/15E148 Safari/604.1",
+    "Mozilla/5.0 (Linux; Android 14; Pixel 8) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Mobile Safari/537.36",
+    "Mozilla/5.0 (compatible; Googlebot/2.1; +http://www.google.com/bot.html)",
+    "Mozilla/5.0 (compatible; bingbot/2.0; +http://www.bing.com/bingbot.htm)",
+    "curl/8.5.0",
+    "python-requests/2.32.3",
+    "ELB-HealthChecker/2.0",
+    "-",
+)
+STATUS_CODES = (200,) * 6 + (201, 204, 301, 302, 304, 400, 403, 404, 500, 502, 503)
+VERBS = ("GET", "GET", "GET", "GET", "POST", "PUT", "DELETE", "HEAD", "OPTIONS")
+SECTIONS = (
+    "api/v1/items",
+    "api/v1/users",
+    "static/js",
+    "static/css",
+    "blog",
+    "search",
+    "docs",
+)
+
+ELB = "app/website/50dc6c495c0c9188"
+TARGET_GROUP = "arn:aws:elasticloadbalancing:us-east-1:123456789012:targetgroup/website/73e2d6bc24d8a067"
+CERTIFICATE = "arn:aws:acm:us-east-1:123456789012:certificate/12345678-1234-1234-1234-123456789012"
+DOMAIN = "www.example.com"
+
+
+class LogGenerator:
+    """
+    Deterministic generator of synthetic access log lines.
+
+    :param seed: Seed of the random generators. Equal seeds give equal lines.
+    :param urls: Number of distinct URL paths.
+    :param zipf_a: Zipf exponent of the URL popularity. Larger is more skewed.
+    :param long_query_ratio: Share of the requests with a long query string.
+    :param long_query_length: Maximum length of a long query string.
+    :param formats: Formats to pick the lines from, uniformly.
+    """
+
+    def __init__(
+        self,
+        seed: int = 0,
+        urls: int = 10_000,
+        zipf_a: float = 1.2,
+        long_query_ratio: float = 0.01,
+        long_query_length: int = 8192,
+        formats=("current",),
+        start: datetime = datetime(2025, 1, 31, tzinfo=timezone.utc),
+    ):
+        unknown = set(formats) - set(FORMATS)
+        if unknown:
+            raise ValueError(f"Unknown formats {sorted(unknown)}, use {FORMATS}.")
+        self.random = random.Random(seed)
+        self.numpy = np.random.default_rng(seed)
+        self.paths = [f"/{SECTIONS[idx % len(SECTIONS)]}/{idx}" for idx in range(urls)]
+        self.zipf_a = zipf_a
+        self.long_query_ratio = long_query_ratio
+        self.long_query_length = long_query_length
+        self.formats = tuple(formats)
+        self.time = start
+
+    def _query(self) -> str:
+        if self.random.random() >= self.long_query_ratio:
+            return self.random.choice(("", "", "", "?page=2", "?utm_source=newsletter"))
+        length = self.random.randint(
+            self.long_query_length // 4, self.long_query_length
+        )
+        params = []
+        while sum(map(len, params)) < length:
+            params.append(
+                f"p{len(params)}={self.random.getrandbits(64):x}%20{self.random.getrandbits(32):x}"
+            )
+        return "?" + "&".join(params)
+
+    def line(self, path: str) -> str:
+        """One log line for a request to ``path``."""
+        rnd = self.random
+        self.time += timedelta(microseconds=rnd.randint(0, 2000))
+        fmt = rnd.choice(self.formats)
+        status = rnd.choice(STATUS_CODES)
+        target = f"10.0.{rnd.randint(0, 3)}.{rnd.randint(1, 254)}:80"
+        target_time = round(rnd.expovariate(1 / 0.05), 3)
+        if status == 503:
+            target, target_time, target_status = "-", -1, "-"
+        else:
+            target_status = str(status)
+        https = rnd.random() < 0.9
+        fields = [
+            "https" if https else "http",
+            self.time.strftime("%Y-%m-%dT%H:%M:%S.%fZ"),
+            ELB,
+            f"{rnd.randint(1, 223)}.{rnd.randint(0, 255)}.{rnd.randint(0, 255)}.{rnd.randint(1, 254)}:{rnd.randint(1024, 65535)}",
+            target,
+            f"{rnd.random() / 1000:.3f}",
+            str(target_time),
+            f"{rnd.random() / 1000:.3f}",
+            str(status),
+            target_status,
+            str(rnd.randint(0, 2048)),
+            str(rnd.randint(0, 500_000)),
+            f'"{rnd.choice(VERBS)} {"https" if https else "http"}://{DOMAIN}:{443 if https else 80}{path}{self._query()} HTTP/1.1"',
+            f'"{rnd.choice(USER_AGENTS)}"',
+            "ECDHE-RSA-AES128-GCM-SHA256" if https else "-",
+            "TLSv1.2" if https else "-",
+            TARGET_GROUP,
+            f'"Root=1-{rnd.getrandbits(32):08x}-{rnd.getrandbits(96):024x}"',
+            f'"{DOMAIN}"',
+            f'"{CERTIFICATE}"' if https else '"-"',
+            str(rnd.randint(0, 10)),
+            self.time.strftime("%Y-%m-%dT%H:%M:%S.%fZ"),
+            '"forward"',
+            '"-"',
+            '"-"',
+            f'"{target}"',
+            f'"{target_status}"',
+        ]
+        if fmt in ("classification", "current"):
+            fields += ['"-"', '"-"']
+        if fmt == "current":
+            fields.append(f"TID_{rnd.getrandbits(64):016x}")
+        return " ".join(fields)
+
+    def lines(self, count: int) -> Iterator[str]:
+        """Generate ``count`` lines, with Zipf-distributed URL paths."""
+        ranks = self.numpy.zipf(self.zipf_a, size=count)
+        for rank in np.minimum(ranks, len(self.paths)) - 1:
+            yield self.line(self.paths[rank])
+
+
+def pathological_lines(length: int = 16384) -> dict:
+    """
+    Lines that make the regex work hardest, with URLs of about ``length`` characters.
+
+    The fragments in the URL look like the end of the request field followed by
+    the fields after it, so every one of them is a candidate end of ``(.*)``.
+    ALB accepts request lines up to 16 KB.
+    """
+    generator = LogGenerator(seed=1)
+    template = generator.line("/PATH")
+    fragment = ' x HTTP/1.1" "ua" ECDHE TLSv1.2 arn "t" "d" "c" 1 ts "a" "r" "l" "80" "200" "-" "-'
+    spaces = "/search?q=" + "%20a b" * (length // 6)
+    quotes = "/search?q=" + fragment * (length // len(fragment))
+    lines = {
+        "long_url_spaces": template.replace("/PATH", spaces),
+        "long_url_fragments": template.replace("/PATH", quotes),
+    }
+    # Same lines, but the lowercase cipher fails ([A-Z0-9-_]+) after the URL,
+    # so the regex backtracks through every candidate end of the URL.
+    for name, line in list(lines.items()):
+        lines[f"{name}_mismatch"] = line.replace("ECDHE-RSA-AES128-GCM-SHA256", "ecdhe")
+    lines["long_user_agent_mismatch"] = template.replace(
+        '" ECDHE', f' {"x" * length}" ecdhe', 1
+    )
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("output", help="Path of the gzip-compressed log file")
+    parser.add_argument("--lines", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--format", choices=FORMATS, action="append", dest="formats")
+    parser.add_argument("--long-query-ratio", type=float, default=0.01)
+    args = parser.parse_args(argv)
+
+    generator = LogGenerator(
+        seed=args.seed,
+        long_query_ratio=args.long_query_ratio,
+        formats=args.formats or ("current",),
+    )
+    with gzip.open(args.output, "wt") as fp:
+        for line in generator.lines(args.lines):
+            fp.write(line + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+"""
+Streaming parser of ALB access logs.
+
+The parser reads gzip-compressed log objects line by line and yields Arrow
+record batches with exactly the schema of the raw access log Glue table:
+the same ``input.regex``, the same 34 columns and the same Hive types.
+``REGEX`` and ``COLUMNS`` are copies of the Terraform definitions in
+``glue.tf`` and ``locals.tf``; ``tests/test_parser.py`` fails if they drift.
+
+Numeric columns are converted like the RegexSerDe does: values that don't
+parse (``-``, empty strings, out of range numbers) become nulls.
+``batch.column("target_processing_time").to_numpy(zero_copy_only=False)``
+gives a NumPy array of a column.
+"""
+
+import gzip
+import io
+import re
+from dataclasses import dataclass
+from typing import Iterable, Iterator
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
+# Keep in sync with input.regex of aws_glue_catalog_table.alb_access_logs
+REGEX = " ".join(
+    [
+        r"([^ ]*)",  # type
+        r"([^ ]*)",  # time
+        r"([^ ]*)",  # elb
+        r"([^ ]*):([0-9]*)",  # client_ip : client_port
+        r"([^ ]*)[:-]([0-9]*)",  # target_ip : target_port
+        r"([-.0-9]*)",  # request_processing_time
+        r"([-.0-9]*)",  # target_processing_time
+        r"([-.0-9]*)",  # response_processing_time
+        r"(|[-0-9]*)",  # elb_status_code
+        r"(-|[-0-9]*)",  # target_status_code
+        r"([-0-9]*)",  # received_bytes
+        r"([-0-9]*)",  # sent_bytes
+        r'"([^ ]*) (.*) (- |[^ ]*)"',  # request_verb request_url request_proto
+        r'"([^"]*)"',  # user_agent
+        r"([A-Z0-9-_]+)",  # ssl_cipher
+        r"([A-Za-z0-9.-]*)",  # ssl_protocol
+        r"([^ ]*)",  # target_group_arn
+        r'"([^"]*)"',  # trace_id
+        r'"([^"]*)"',  # domain_name
+        r'"([^"]*)"',  # chosen_cert_arn
+        r"([-.0-9]*)",  # matched_rule_priority
+        r"([^ ]*)",  # request_creation_time
+        r'"([^"]*)"',  # actions_executed
+        r'"([^"]*)"',  # redirect_url
+        r'"([^ ]*)"',  # lambda_error_reason
+        r'"([^\s]+?)"',  # target_port_list
+        r'"([^\s]+)"',  # target_status_code_list
+        r'"([^ ]*)"',  # classification
+        r'"([^ ]*)"',  # classification_reason
+        r"?([^ ]*)?.*",  # conn_trace_id + future fields
+    ]
+)
+
+# Keep in sync with local.alb_access_log_columns
+COLUMNS = (
+    ("type", "string"),
+    ("time", "string"),
+    ("elb", "string"),
+    ("client_ip", "string"),
+    ("client_port", "int"),
+    ("target_ip", "string"),
+    ("target_port", "int"),
+    ("request_processing_time", "double"),
+    ("target_processing_time", "double"),
+    ("response_processing_time", "double"),
+    ("elb_status_code", "int"),
+    ("target_status_code", "string"),
+    ("received_bytes", "bigint"),
+    ("sent_bytes", "bigint"),
+    ("request_verb", "string"),
+    ("request_url", "string"),
+    ("request_proto", "string"),
+    ("user_agent", "string"),
+    ("ssl_cipher", "string"),
+    ("ssl_protocol", "string"),
+    ("target_group_arn", "string"),
+    ("trace_id", "string"),
+    ("domain_name", "string"),
+    ("chosen_cert_arn", "string"),
+    ("matched_rule_priority", "string"),
+    ("request_creation_time", "string"),
+    ("actions_executed", "string"),
+    ("redirect_url", "string"),
+    ("lambda_error_reason", "string"),
+    ("target_port_list", "string"),
+    ("target_status_code_list", "string"),
+    ("classification", "string"),
+    ("classification_reason", "string"),
+    ("conn_trace_id", "string"),
+)
+
+ARROW_TYPES = {
+    "string": pa.string(),
+    "int": pa.int32(),
+    "bigint": pa.int64(),
+    "double": pa.float64(),
+}
+SCHEMA = pa.schema([pa.field(name, ARROW_TYPES[kind]) for name, kind in COLUMNS])
+PATTERN = re.compile(REGEX)
+DEFAULT_BATCH_SIZE = 50_000
+
+# Strings that convert to the Hive type. Anything else becomes null.
+_NUMBER_PATTERNS = {
+    "int": r"^-?[0-9]{1,10}$",
+    "bigint": r"^-?[0-9]{1,18}$",
+    "double": r"^[-+]?([0-9]+\.?[0-9]*|\.[0-9]+)([eE][-+]?[0-9]+)?$",
+}
+_INT32_MIN = -(2**31)
+_INT32_MAX = 2**31 - 1
+
+
+@dataclass
+class ParseStats:
+    """Counters of a parse run, updated while the batches are consumed."""
+
+    lines: int = 0
+    rows: int = 0
+    skipped: int = 0
+
+
+def _to_array(values, hive_type: str) -> pa.Array:
+    """Convert a column of captured strings to its Arrow type."""
+    strings = pa.array(values, type=pa.string())
+    if hive_type == "string":
+        return strings
+
+    valid = pc.match_substring_regex(strings, _NUMBER_PATTERNS[hive_type])
+    numbers = pc.if_else(valid, strings, pa.scalar(None, type=pa.string()))
+    if hive_type == "double":
+        return pc.cast(numbers, pa.float64())
+
+    wide = pc.cast(numbers, pa.int64())
+    if hive_type == "int":
+        in_range = pc.and_(
+            pc.greater_equal(wide, _INT32_MIN), pc.less_equal(wide, _INT32_MAX)
+        )
+        return pc.cast(pc.if_else(in_range, wide, None), pa.int32())
+    return wide
+
+
+def _to_batch(rows: list) -> pa.RecordBatch:
+    columns = zip(*rows) if rows else [()] * len(COLUMNS)
+    return pa.RecordBatch.from_arrays(
+        [_to_array(values, kind) for values, (_, kind) in zip(columns, COLUMNS)],
+        schema=SCHEMA,
+    )
+
+
+def parse_lines(
+    lines: Iterable[str],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    stats: ParseStats = None,
+) -> Iterator[pa.RecordBatch]:
+    """
+    Parse access log lines into record batches of up to ``batch_size`` rows.
+
+    Lines that don't match ``REGEX`` are skipped and counted in ``stats``.
+
+    :param lines: Log lines, with or without the trailing newline.
+    :param batch_size: Maximum number of rows in a batch.
+    :param stats: If given, the counters are updated as the lines are parsed.
+    """
+    stats = ParseStats() if stats is None else stats
+    fullmatch = PATTERN.fullmatch
+    rows = []
+    for line in lines:
+        stats.lines += 1
+        match = fullmatch(line.rstrip("\n"))
+        if match is None:
+            stats.skipped += 1
+            continue
+        rows.append(match.groups())
+        if len(rows) >= batch_size:
+            stats.rows += len(rows)
+            yield _to_batch(rows)
+            rows = []
+    if rows:
+        stats.rows += len(rows)
+        yield _to_batch(rows)
+
+
+def iter_gzip_lines(fileobj) -> Iterator[str]:
+    """Stream the lines of a gzip-compressed binary file object."""
+    with gzip.GzipFile(fileobj=fileobj) as gz:
+        yield from io.TextIOWrapper(gz, encoding="utf-8", errors="replace")
+
+
+def read_log_file(path: str, **kwargs) -> Iterator[pa.RecordBatch]:
+    """Parse a local gzip-compressed log file. Keyword arguments go to ``parse_lines()``."""
+    with open(path, "rb") as fp:
+        yield from parse_lines(iter_gzip_lines(fp), **kwargs)
+
+
+def read_s3_object(
+    s3_client, bucket: str, key: str, **kwargs
+) -> Iterator[pa.RecordBatch]:
+    """Parse a gzip-compressed log object, streaming it from S3."""
+    body = s3_client.get_object(Bucket=bucket, Key=key)["Body"]
+    yield from parse_lines(iter_gzip_lines(body), **kwargs)
+
+
+def read_table(paths: Iterable[str], stats: ParseStats = None) -> pa.Table:
+    """Parse local gzip-compressed log files into one Arrow table."""
+    batches = [batch for path in paths for batch in read_log_file(path, stats=stats)]
+    return pa.Table.from_batches(batches, schema=SCHEMA)
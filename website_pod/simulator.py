@@ -0,0 +1,600 @@
+"""
+Offline autoscaling simulator of a website pod.
+
+``simulate()`` replays a per-minute request rate, either counted from parsed
+access logs with ``request_rate()`` or generated by ``synthetic_profile()``,
+against the scaling and health check settings of the module (``PodConfig``,
+named after the module variables) and a capacity model of one instance
+(``InstanceModel``). It reports under-capacity minutes, failed requests,
+queueing latency and instance-hours, so that settings can be compared before
+deploying.
+
+The simulation steps through minutes; instance lifecycle transitions are
+events on a heap, timed to the second and applied at the next minute:
+
+* A launched instance registers with the target group and answers health
+  checks after ``boot_time``. The target turns healthy after
+  ``alb_healthcheck_healthy_threshold`` passing checks, ``alb_healthcheck_interval``
+  seconds apart.
+* With ``health_check_type = "ELB"``, an instance that isn't healthy when
+  ``health_check_grace_period`` expires is replaced.
+* A failed instance keeps receiving requests, which fail, until
+  ``alb_healthcheck_unhealthy_threshold`` checks fail. Then the ALB stops routing
+  to it and, with ELB health checks, the ASG replaces it.
+* Target tracking policies follow the CloudWatch alarms AWS creates for them:
+  scale out after 3 periods above the target, scale in after 15 periods below
+  90% of it, to ``ceil(instances * metric / target)``. Instances launched less
+  than the instance warmup ago block scale-in; the warmup defaults to
+  ``asg_default_cooldown``, as in AWS.
+* Each serving instance is an M/M/1 queue: latency is
+  ``service_time / (1 - utilization)``. Demand above capacity queues up to
+  ``alb_idle_timeout`` seconds, then fails.
+"""
+
+import argparse
+import heapq
+import logging
+import math
+from dataclasses import dataclass, field, fields
+from datetime import datetime, timezone
+from typing import Optional, get_args
+
+import numpy as np
+
+LOG = logging.getLogger(__name__)
+
+# Target tracking alarms: evaluation periods above the target to scale out,
+# below the scale-in threshold to scale in.
+SCALE_OUT_PERIODS = 3
+SCALE_IN_PERIODS = 15
+SCALE_IN_RATIO = 0.9
+# Utilization at which the M/M/1 latency is capped
+MAX_UTILIZATION = 0.99
+
+
+@dataclass
+class PodConfig:
+    """Scaling and health check settings, with the defaults of the module variables."""
+
+    asg_min_size: int = 2
+    asg_max_size: int = 10
+    asg_default_cooldown: int = 300
+    autoscaling_cpu_policy_enabled: bool = True
+    autoscaling_target_cpu_load: float = 60.0
+    autoscaling_target_request_count: Optional[float] = None
+    autoscaling_request_count_instance_warmup: Optional[int] = None
+    health_check_type: str = "ELB"
+    health_check_grace_period: int = 600
+    alb_healthcheck_interval: int = 5
+    alb_healthcheck_healthy_threshold: int = 2
+    alb_healthcheck_unhealthy_threshold: int = 2
+    alb_idle_timeout: int = 60
+    # Not a module variable: instances without detailed monitoring report
+    # CPUUtilization every 5 minutes.
+    cpu_metric_period: int = 300
+
+    @classmethod
+    def from_variables(cls, variables: dict) -> "PodConfig":
+        """
+        Config from module variables, e.g. a parsed ``terraform.tfvars.json``.
+        Variables the simulator doesn't use are ignored.
+        """
+        names = {item.name for item in fields(cls)}
+        return cls(**{key: value for key, value in variables.items() if key in names})
+
+    def __post_init__(self):
+        if not 0 <= self.asg_min_size <= self.asg_max_size:
+            raise ValueError("asg_min_size must be between 0 and asg_max_size.")
+        if self.health_check_type not in ("EC2", "ELB"):
+            raise ValueError("health_check_type must be either 'EC2' or 'ELB'.")
+        if self.cpu_metric_period % 60:
+            raise ValueError("cpu_metric_period must be a multiple of 60 seconds.")
+
+
+@dataclass
+class InstanceModel:
+    """
+    Capacity model of one instance.
+
+    :param requests_per_minute: Requests an instance serves per minute at 100% CPU.
+        Measure it with a load test, or estimate it from the access logs and
+        the CPUUtilization metric of a busy hour.
+    :param boot_time: Seconds from the launch until the application answers
+        health checks, including a launching lifecycle hook.
+    :param service_time: Mean response time, in seconds, of an idle instance.
+    :param failures_per_hour: Application failures per instance-hour.
+    """
+
+    requests_per_minute: float = 6000.0
+    boot_time: int = 300
+    service_time: float = 0.05
+    failures_per_hour: float = 0.0
+
+
+@dataclass
+class SimulationResult:
+    """Totals of a simulation. ``timeline`` holds per-minute NumPy arrays."""
+
+    minutes: int
+    requests: float
+    failed_requests: float
+    under_capacity_minutes: int
+    instance_hours: float
+    latency_p50: float
+    latency_p99: float
+    max_instances: int
+    scale_out_events: int
+    scale_in_events: int
+    replaced_instances: int
+    timeline: dict = field(repr=False, default_factory=dict)
+
+    @property
+    def failed_ratio(self) -> float:
+        return self.failed_requests / self.requests if self.requests else 0.0
+
+
+class _Instance:
+    __slots__ = ("launched", "state")
+
+    # States: booting -> serving -> failed (still routed) -> unhealthy
+    def __init__(self, launched: int, state: str):
+        self.launched = launched
+        self.state = state
+
+
+class _Policy:
+    """Breach counters of the alarms of a target tracking policy."""
+
+    def __init__(self, target: float, period: int, warmup: int):
+        self.target = target
+        self.period = period
+        self.warmup = warmup
+        self.high = 0
+        self.low = 0
+        self.metric = None
+        self.samples = []
+
+    def observe(self, value: float, minute: int):
+        """Add a per-minute sample, and evaluate the alarms at the end of a period."""
+        if value is not None:
+            self.samples.append(value)
+        if (minute + 1) % self.period:
+            return
+        if not self.samples:
+            # Missing data keeps the alarm state
+            return
+        metric = sum(self.samples) / len(self.samples)
+        self.samples = []
+        self.high = self.high + 1 if metric > self.target else 0
+        self.low = self.low + 1 if metric < self.target * SCALE_IN_RATIO else 0
+        self.metric = metric
+
+    def capacity(self, instances: int) -> int:
+        return math.ceil(instances * self.metric / self.target - 1e-9)
+
+
+class _Simulation:
+    def __init__(self, config: PodConfig, instance: InstanceModel, seed: int):
+        self.config = config
+        self.model = instance
+        self.rng = np.random.default_rng(seed)
+        self.events = []
+        self.sequence = 0
+        self.instances = [_Instance(0, "serving") for _ in range(config.asg_min_size)]
+        self.desired = config.asg_min_size
+        self.last_launch = -math.inf
+        self.scale_out_events = 0
+        self.scale_in_events = 0
+        self.replaced = 0
+
+        interval = config.alb_healthcheck_interval
+        # The first check after the boot, then the rest of the healthy threshold
+        self.healthy_after = (
+            math.ceil(instance.boot_time / interval) * interval
+            + (config.alb_healthcheck_healthy_threshold - 1) * interval
+        )
+        self.unhealthy_after = config.alb_healthcheck_unhealthy_threshold * interval
+
+        self.policies = []
+        if config.autoscaling_cpu_policy_enabled:
+            self.policies.append(
+                (
+                    "cpu",
+                    _Policy(
+                        config.autoscaling_target_cpu_load,
+                        config.cpu_metric_period // 60,
+                        config.asg_default_cooldown,
+                    ),
+                )
+            )
+        if config.autoscaling_target_request_count is not None:
+            warmup = config.autoscaling_request_count_instance_warmup
+            self.policies.append(
+                (
+                    "request_count",
+                    _Policy(
+                        config.autoscaling_target_request_count,
+                        1,
+                        config.asg_default_cooldown if warmup is None else warmup,
+                    ),
+                )
+            )
+
+    def schedule(self, time: int, kind: str, instance: _Instance):
+        self.sequence += 1
+        heapq.heappush(self.events, (time, self.sequence, kind, instance))
+
+    def launch(self, time: int):
+        instance = _Instance(time, "booting")
+        self.instances.append(instance)
+        self.last_launch = time
+        self.schedule(time + self.healthy_after, "healthy", instance)
+        if self.config.health_check_type == "ELB":
+            self.schedule(
+                time + self.config.health_check_grace_period, "grace", instance
+            )
+
+    def terminate(self, instance: _Instance, replace: bool):
+        self.instances.remove(instance)
+        instance.state = "terminated"
+        if replace:
+            self.replaced += 1
+
+    def process_events(self, now: int):
+        while self.events and self.events[0][0] <= now:
+            time, _, kind, instance = heapq.heappop(self.events)
+            if instance.state == "terminated":
+                continue
+            if kind == "healthy" and instance.state == "booting":
+                instance.state = "serving"
+            elif kind == "grace" and instance.state == "booting":
+                # Still failing its health checks: the ASG replaces it
+                self.terminate(instance, replace=True)
+            elif kind == "detected" and instance.state == "failed":
+                instance.state = "unhealthy"
+                if self.config.health_check_type == "ELB":
+                    self.terminate(instance, replace=True)
+
+    def fail_instances(self, now: int):
+        serving = [item for item in self.instances if item.state == "serving"]
+        rate = self.model.failures_per_hour / 60
+        for index in np.flatnonzero(self.rng.random(len(serving)) < rate):
+            serving[index].state = "failed"
+            self.schedule(now + self.unhealthy_after, "detected", serving[index])
+
+    def scale(
+        self, now: int, cpu: Optional[float], per_target: Optional[float], serving: int
+    ):
+        warming = {
+            name: now < self.last_launch + policy.warmup
+            for name, policy in self.policies
+        }
+        values = {"cpu": cpu, "request_count": per_target}
+        minute = now // 60
+        out, scale_in = [], []
+        for name, policy in self.policies:
+            policy.observe(values[name], minute)
+            if serving == 0:
+                continue
+            if policy.high >= SCALE_OUT_PERIODS:
+                out.append(policy.capacity(serving))
+            if policy.low >= SCALE_IN_PERIODS and not warming[name]:
+                scale_in.append(policy.capacity(serving))
+        config = self.config
+        if out and max(out) > self.desired:
+            self.desired = min(max(out), config.asg_max_size)
+            self.scale_out_events += 1
+        elif self.policies and len(scale_in) == len(self.policies):
+            # Scale in only when every policy agrees
+            desired = max(max(scale_in), config.asg_min_size)
+            if desired < self.desired:
+                self.desired = desired
+                self.scale_in_events += 1
+
+    def reconcile(self, time: int):
+        # Terminate what isn't serving first, newest first
+        order = {"unhealthy": 0, "failed": 1, "booting": 2, "serving": 3}
+        while len(self.instances) > self.desired:
+            victim = min(
+                self.instances, key=lambda item: (order[item.state], -item.launched)
+            )
+            self.terminate(victim, replace=False)
+        while len(self.instances) < self.desired:
+            self.launch(time)
+
+    def run(self, requests: np.ndarray) -> SimulationResult:
+        config, model = self.config, self.model
+        size = requests.size
+        timeline = {
+            name: np.zeros(size)
+            for name in (
+                "capacity",
+                "served",
+                "failed",
+                "latency",
+                "cpu",
+                "running",
+                "serving",
+                "desired",
+            )
+        }
+        timeline["latency"][:] = np.nan
+        rate = model.requests_per_minute
+        backlog = 0.0
+        under = 0
+        for minute in range(size):
+            now = minute * 60
+            self.process_events(now)
+            if model.failures_per_hour:
+                self.fail_instances(now)
+            states = [item.state for item in self.instances]
+            serving = states.count("serving")
+            routed = serving + states.count("failed")
+
+            load = float(requests[minute])
+            failed = 0.0
+            cpu = per_target = None
+            capacity = serving * rate
+            if routed:
+                per_target = load / routed
+                # Requests routed to failed targets fail until the ALB notices
+                failed = load * (routed - serving) / routed
+            if serving:
+                demand = load - failed + backlog
+                served = min(demand, capacity)
+                backlog = demand - served
+                queue_limit = capacity * config.alb_idle_timeout / 60
+                if backlog > queue_limit:
+                    failed += backlog - queue_limit
+                    backlog = queue_limit
+                utilization = served / capacity
+                cpu = 100 * utilization
+                timeline["served"][minute] = served
+                latency = model.service_time / (
+                    1 - min(utilization, MAX_UTILIZATION)
+                ) + backlog / (capacity / 60)
+                # Slower requests time out, and they are counted as failed already
+                timeline["latency"][minute] = min(latency, config.alb_idle_timeout)
+                under += int(backlog > 0)
+            else:
+                # No healthy targets, the ALB returns 503
+                failed = load + backlog
+                backlog = 0.0
+                under += int(load > 0)
+
+            timeline["capacity"][minute] = capacity
+            timeline["failed"][minute] = failed
+            timeline["cpu"][minute] = np.nan if cpu is None else cpu
+            timeline["running"][minute] = len(self.instances)
+            timeline["serving"][minute] = serving
+
+            self.scale(now, cpu, per_target, serving)
+            self.reconcile(now + 60)
+            timeline["desired"][minute] = self.desired
+
+        served = timeline["served"]
+        latency = timeline["latency"]
+        p50, p99 = _weighted_quantiles(latency, served, [0.5, 0.99])
+        return SimulationResult(
+            minutes=size,
+            requests=float(requests.sum()),
+            failed_requests=float(timeline["failed"].sum()),
+            under_capacity_minutes=int(under),
+            instance_hours=float(timeline["running"].sum() / 60),
+            latency_p50=p50,
+            latency_p99=p99,
+            max_instances=int(timeline["running"].max()) if size else 0,
+            scale_out_events=self.scale_out_events,
+            scale_in_events=self.scale_in_events,
+            replaced_instances=self.replaced,
+            timeline=timeline,
+        )
+
+
+def _weighted_quantiles(values: np.ndarray, weights: np.ndarray, qs) -> list:
+    mask = (weights > 0) & ~np.isnan(values)
+    if not mask.any():
+        return [math.nan] * len(qs)
+    order = np.argsort(values[mask])
+    cumulative = np.cumsum(weights[mask][order])
+    index = np.searchsorted(cumulative, np.asarray(qs) * cumulative[-1])
+    return [
+        float(value) for value in values[mask][order][np.minimum(index, order.size - 1)]
+    ]
+
+
+def simulate(
+    requests,
+    config: PodConfig = None,
+    instance: InstanceModel = None,
+    seed: int = 0,
+) -> SimulationResult:
+    """
+    Replay a request rate against a pod configuration.
+
+    The pod starts with ``asg_min_size`` healthy instances.
+
+    :param requests: Requests per minute, one value per minute.
+    :param seed: Seed of the instance failures.
+    """
+    requests = np.asarray(requests, dtype=np.float64)
+    if np.any(requests < 0) or np.any(np.isnan(requests)):
+        raise ValueError("Request rates must be non-negative numbers.")
+    return _Simulation(config or PodConfig(), instance or InstanceModel(), seed).run(
+        requests
+    )
+
+
+def synthetic_profile(
+    days: float = 30,
+    base_rpm: float = 2000,
+    peak_rpm: float = 12000,
+    weekend_ratio: float = 0.6,
+    noise: float = 0.05,
+    spikes_per_week: float = 1,
+    spike_ratio: float = 3,
+    spike_minutes: int = 30,
+    seed: int = 0,
+) -> np.ndarray:
+    """
+    Per-minute request rate with a daily cycle peaking at 15:00 UTC,
+    quieter weekends, noise and sudden traffic spikes.
+
+    :param spike_ratio: Peak of a spike relative to the traffic it lands on.
+        A spike ramps up in a minute and decays over ``spike_minutes``.
+    """
+    rng = np.random.default_rng(seed)
+    minutes = np.arange(int(days * 24 * 60))
+    hour = minutes / 60 % 24
+    daily = (1 - np.cos((hour - 3) / 24 * 2 * np.pi)) / 2  # 0 at 03:00, 1 at 15:00
+    rate = base_rpm + (peak_rpm - base_rpm) * daily
+    # Day 0 is a Monday
+    weekend = (minutes // (24 * 60)) % 7 >= 5
+    rate = np.where(weekend, rate * weekend_ratio, rate)
+    rate *= rng.lognormal(0, noise, minutes.size)
+
+    spikes = rng.poisson(spikes_per_week * days / 7)
+    bump = np.zeros(minutes.size)
+    decay = np.exp(-np.arange(4 * spike_minutes) / spike_minutes)
+    for start in rng.integers(0, minutes.size, spikes):
+        end = min(start + decay.size, minutes.size)
+        bump[start:end] += (spike_ratio - 1) * decay[: end - start]
+    return rate * (1 + bump)
+
+
+def request_rate(table, column: str = "time"):
+    """
+    Requests per minute from a parsed access log table.
+
+    :param table: Arrow table or record batch from ``website_pod.parser``, or a
+        Parquet file written by ``website_pod.ingest``.
+    :return: ``(start, rate)``: the first minute as a datetime in UTC, and a
+        NumPy array with the number of requests in each minute after it.
+    """
+    import pyarrow.compute as pc
+
+    # ISO 8601 timestamps: the first 16 characters are the minute
+    minutes = pc.strptime(
+        pc.utf8_slice_codeunits(table.column(column), 0, 16),
+        format="%Y-%m-%dT%H:%M",
+        unit="s",
+        error_is_null=True,
+    )
+    minutes = pc.drop_null(minutes).cast("int64").to_numpy() // 60
+    if not minutes.size:
+        raise ValueError("The table has no timestamps.")
+    first = int(minutes.min())
+    start = datetime.fromtimestamp(first * 60, tz=timezone.utc)
+    return start, np.bincount((minutes - first).astype(np.int64)).astype(np.float64)
+
+
+def _option(group, item):
+    """Add a command line option for a dataclass field, typed after its annotation."""
+    flag = "--" + item.name.replace("_", "-")
+    # Optional[int] is Union[int, None]
+    kind = next(
+        (arg for arg in get_args(item.type) if arg is not type(None)), item.type
+    )
+    if kind is bool:
+        group.add_argument(
+            flag, default=item.default, action=argparse.BooleanOptionalAction
+        )
+    elif item.name == "health_check_type":
+        group.add_argument(flag, default=item.default, choices=("EC2", "ELB"))
+    else:
+        group.add_argument(flag, default=item.default, type=kind)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "paths",
+        nargs="*",
+        help="Access log files (.log.gz) or Parquet files to replay. "
+        "Without paths, a synthetic profile is replayed.",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--scale",
+        type=float,
+        default=1.0,
+        help="Multiply the request rate, e.g. to replay a sampled log or a growth forecast.",
+    )
+    synthetic = parser.add_argument_group("synthetic profile")
+    synthetic.add_argument("--days", type=float, default=30)
+    synthetic.add_argument("--base-rpm", type=float, default=2000)
+    synthetic.add_argument("--peak-rpm", type=float, default=12000)
+    synthetic.add_argument("--spikes-per-week", type=float, default=1)
+    for cls, title in (
+        (PodConfig, "module variables"),
+        (InstanceModel, "instance model"),
+    ):
+        group = parser.add_argument_group(title)
+        for item in fields(cls):
+            _option(group, item)
+    return parser.parse_args(argv)
+
+
+def load_request_rate(paths: list) -> np.ndarray:
+    """Requests per minute of access log or Parquet files."""
+    # Imported here, so that synthetic runs don't need pyarrow.
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    from website_pod.parser import read_table
+
+    parquet = [path for path in paths if path.endswith(".parquet")]
+    logs = [path for path in paths if not path.endswith(".parquet")]
+    tables = [pq.read_table(path, columns=["time"]) for path in parquet]
+    if logs:
+        tables.append(read_table(logs).select(["time"]))
+    start, rate = request_rate(pa.concat_tables(tables))
+    LOG.info("Replaying %d minutes of traffic from %s", rate.size, start.isoformat())
+    return rate
+
+
+def main(argv=None):
+    logging.basicConfig(level=logging.INFO)
+    args = parse_args(argv)
+    if args.paths:
+        requests = load_request_rate(args.paths)
+    else:
+        requests = synthetic_profile(
+            days=args.days,
+            base_rpm=args.base_rpm,
+            peak_rpm=args.peak_rpm,
+            spikes_per_week=args.spikes_per_week,
+            seed=args.seed,
+        )
+    config = PodConfig(
+        **{item.name: getattr(args, item.name) for item in fields(PodConfig)}
+    )
+    instance = InstanceModel(
+        **{item.name: getattr(args, item.name) for item in fields(InstanceModel)}
+    )
+    result = simulate(requests * args.scale, config, instance, seed=args.seed)
+    LOG.info(
+        "%d minutes, %.0f requests: %d under-capacity minutes, %.4f%% failed requests",
+        result.minutes,
+        result.requests,
+        result.under_capacity_minutes,
+        result.failed_ratio * 100,
+    )
+    LOG.info(
+        "Latency p50 %.3fs, p99 %.3fs. %.1f instance-hours, at most %d instances",
+        result.latency_p50,
+        result.latency_p99,
+        result.instance_hours,
+        result.max_instances,
+    )
+    LOG.info(
+        "%d scale-out and %d scale-in activities, %d instances replaced",
+        result.scale_out_events,
+        result.scale_in_events,
+        result.replaced_instances,
+    )
+    return result
+
+
+if __name__ == "__main__":
+    main()
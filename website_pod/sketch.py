@@ -0,0 +1,309 @@
+"""
+Mergeable latency sketches for the timing columns of the access logs.
+
+``LatencySketch`` is a log-bucketed histogram in the spirit of HDR Histogram
+and DDSketch: a value ``x`` falls into bucket ``ceil(log(x) / log(gamma))``
+with ``gamma = (1 + a) / (1 - a)``, so every quantile it returns is within
+relative accuracy ``a`` of the exact sample at that rank. The buckets cover a
+fixed range, so a sketch takes the same memory however many samples it holds,
+two sketches with the same parameters merge by adding their counts, and a
+sketch serializes to a few hundred bytes.
+
+``KeyedSketches`` keeps one sketch per key, e.g. per ``target_ip`` or
+``domain_name``, and stores them as an Arrow table, so a day of traffic can
+be kept as 24 small hourly files and merged on demand instead of re-scanning
+the raw logs.
+"""
+
+import struct
+from functools import lru_cache
+from math import ceil, log
+
+import numpy as np
+import pyarrow as pa
+
+DEFAULT_RELATIVE_ACCURACY = 0.01
+# ALB timings have microsecond resolution and can't exceed the maximum idle timeout.
+DEFAULT_MIN_VALUE = 1e-6
+DEFAULT_MAX_VALUE = 4000.0
+
+_HEADER = struct.Struct("<B3d3Q3d")
+_VERSION = 1
+
+
+@lru_cache(maxsize=None)
+def _bucket_values(relative_accuracy: float, min_value: float, max_value: float):
+    """
+    Value that represents each bucket with the smallest relative error.
+    Shared, read-only, by all the sketches with the same parameters.
+    """
+    gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+    log_gamma = log(gamma)
+    offset = ceil(log(min_value) / log_gamma)
+    size = ceil(log(max_value) / log_gamma) - offset + 1
+    values = (2 * gamma ** (np.arange(size) + offset) / (gamma + 1)).astype(np.float64)
+    values.flags.writeable = False
+    return values
+
+
+class LatencySketch:
+    """
+    Quantile sketch of non-negative values with a relative accuracy guarantee.
+
+    Values below ``min_value`` are counted as zero; values above ``max_value``
+    land in the last bucket. Negative values and NaNs are ignored: ALB logs
+    ``-1`` for the timings of requests that never reached a target.
+    """
+
+    def __init__(
+        self,
+        relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY,
+        min_value: float = DEFAULT_MIN_VALUE,
+        max_value: float = DEFAULT_MAX_VALUE,
+    ):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1.")
+        if not 0 < min_value < max_value:
+            raise ValueError("min_value must be positive and below max_value.")
+        self.relative_accuracy = relative_accuracy
+        self.min_value = min_value
+        self.max_value = max_value
+        gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = log(gamma)
+        self._offset = ceil(log(min_value) / self._log_gamma)
+        self._values = _bucket_values(relative_accuracy, min_value, max_value)
+        self._counts = np.zeros(self._values.size, dtype=np.uint64)
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = float("inf")
+        self.max = float("-inf")
+
+    @property
+    def parameters(self) -> tuple:
+        return self.relative_accuracy, self.min_value, self.max_value
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Memory taken by the bucket counts. It doesn't depend on the number of samples.
+        The bucket values are shared by all the sketches with the same parameters.
+        """
+        return self._counts.nbytes
+
+    def add(self, values):
+        """Add a value or an array of values."""
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[values >= 0]  # also drops NaNs
+        if not values.size:
+            return
+        small = values < self.min_value
+        self.zero_count += int(small.sum())
+        positive = values[~small]
+        if positive.size:
+            index = np.ceil(np.log(positive) / self._log_gamma).astype(np.int64)
+            index = np.clip(index - self._offset, 0, self._counts.size - 1)
+            self._counts += np.bincount(index, minlength=self._counts.size).astype(
+                np.uint64
+            )
+        self.count += int(values.size)
+        self.sum += float(values.sum())
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+
+    def merge(self, other: "LatencySketch"):
+        """Add the samples of another sketch with the same parameters."""
+        if other.parameters != self.parameters:
+            raise ValueError(
+                f"Can't merge sketches with different parameters: "
+                f"{self.parameters} and {other.parameters}."
+            )
+        self._counts += other._counts
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def quantiles(self, qs) -> np.ndarray:
+        """
+        Estimate the values at quantiles ``qs`` (between 0 and 1).
+
+        The estimate for ``q`` is within the relative accuracy of the sample
+        of rank ``floor(q * (count - 1))``, like ``numpy.quantile(method="lower")``.
+        """
+        qs = np.asarray(qs, dtype=np.float64)
+        if self.count == 0:
+            return np.full(qs.shape, np.nan)
+        if np.any((qs < 0) | (qs > 1)):
+            raise ValueError("Quantiles must be between 0 and 1.")
+        ranks = np.floor(qs * (self.count - 1))
+        cumulative = np.cumsum(self._counts) + self.zero_count
+        index = np.searchsorted(cumulative, ranks, side="right")
+        values = self._values[np.minimum(index, self._counts.size - 1)]
+        values = np.where(ranks < self.zero_count, 0.0, values)
+        # The smallest and the largest samples are known exactly
+        values = np.where(ranks == 0, self.min, values)
+        values = np.where(ranks == self.count - 1, self.max, values)
+        return np.clip(values, self.min, self.max)
+
+    def quantile(self, q: float) -> float:
+        return float(self.quantiles([q])[0])
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else float("nan")
+
+    def to_bytes(self) -> bytes:
+        """Serialize the sketch. Only non-empty buckets are stored."""
+        index = np.flatnonzero(self._counts).astype(np.uint32)
+        return (
+            _HEADER.pack(
+                _VERSION,
+                *self.parameters,
+                self.zero_count,
+                self.count,
+                index.size,
+                self.sum,
+                self.min,
+                self.max,
+            )
+            + index.tobytes()
+            + self._counts[index].tobytes()
+        )
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "LatencySketch":
+        (
+            version,
+            relative_accuracy,
+            min_value,
+            max_value,
+            zero_count,
+            count,
+            size,
+            total,
+            minimum,
+            maximum,
+        ) = _HEADER.unpack_from(data)
+        if version != _VERSION:
+            raise ValueError(f"Unsupported sketch version {version}.")
+        sketch = cls(relative_accuracy, min_value, max_value)
+        index = np.frombuffer(data, dtype=np.uint32, count=size, offset=_HEADER.size)
+        sketch._counts[index] = np.frombuffer(
+            data, dtype=np.uint64, count=size, offset=_HEADER.size + index.nbytes
+        )
+        sketch.zero_count = zero_count
+        sketch.count = count
+        sketch.sum = total
+        sketch.min = minimum
+        sketch.max = maximum
+        return sketch
+
+    def __getstate__(self):
+        # The shared bucket values are restored from the cache, not pickled
+        state = self.__dict__.copy()
+        del state["_values"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._values = _bucket_values(*self.parameters)
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, LatencySketch)
+            and self.parameters == other.parameters
+            and np.array_equal(self._counts, other._counts)
+            and (self.zero_count, self.count, self.min, self.max)
+            == (other.zero_count, other.count, other.min, other.max)
+            and np.isclose(self.sum, other.sum)
+        )
+
+    def __repr__(self):
+        return (
+            f"{self.__class__.__name__}(count={self.count}, "
+            f"p50={self.quantile(0.5):.6g}, p99={self.quantile(0.99):.6g})"
+        )
+
+
+class KeyedSketches:
+    """
+    One ``LatencySketch`` per key of an access log column::
+
+        sketches = KeyedSketches("target_ip", "target_processing_time")
+        for batch in parse_lines(lines):
+            sketches.update(batch)
+        sketches["10.0.0.1"].quantile(0.99)
+    """
+
+    def __init__(self, key_column: str, value_column: str, **sketch_args):
+        self.key_column = key_column
+        self.value_column = value_column
+        self.sketch_args = sketch_args
+        self.sketches = {}
+
+    def __getitem__(self, key) -> LatencySketch:
+        return self.sketches[key]
+
+    def __len__(self):
+        return len(self.sketches)
+
+    def _sketch(self, key) -> LatencySketch:
+        if key not in self.sketches:
+            self.sketches[key] = LatencySketch(**self.sketch_args)
+        return self.sketches[key]
+
+    def add(self, keys, values):
+        """Add the values of parallel arrays of keys and values."""
+        encoded = pa.chunked_array([pa.array(keys, type=pa.string())])
+        self._add_encoded(encoded, np.asarray(values, dtype=np.float64))
+
+    def update(self, batch):
+        """Add the rows of an Arrow record batch or table from ``website_pod.parser``."""
+        keys = batch.column(self.key_column)
+        if isinstance(keys, pa.Array):
+            keys = pa.chunked_array([keys])
+        self._add_encoded(
+            keys, batch.column(self.value_column).to_numpy(zero_copy_only=False)
+        )
+
+    def _add_encoded(self, keys: pa.ChunkedArray, values: np.ndarray):
+        # Dictionary encoding groups the keys without sorting Python strings
+        encoded = keys.fill_null("").combine_chunks().dictionary_encode()
+        indices = encoded.indices.to_numpy()
+        dictionary = encoded.dictionary.to_pylist()
+        order = np.argsort(indices, kind="stable")
+        bounds = np.cumsum(np.bincount(indices, minlength=len(dictionary)))[:-1]
+        for key, group in zip(dictionary, np.split(values[order], bounds)):
+            self._sketch(key).add(group)
+
+    def merge(self, other: "KeyedSketches"):
+        for key, sketch in other.sketches.items():
+            self._sketch(key).merge(sketch)
+
+    def quantiles(self, qs) -> dict:
+        """Estimated quantiles of each key."""
+        return {key: sketch.quantiles(qs) for key, sketch in self.sketches.items()}
+
+    def to_table(self) -> pa.Table:
+        """Arrow table of serialized sketches, e.g. to store an hour as Parquet."""
+        keys = sorted(self.sketches)
+        return pa.table(
+            {
+                self.key_column: pa.array(keys, type=pa.string()),
+                self.value_column: pa.array(
+                    [self.sketches[key].to_bytes() for key in keys], type=pa.binary()
+                ),
+            }
+        )
+
+    @classmethod
+    def from_table(cls, table: pa.Table, **sketch_args) -> "KeyedSketches":
+        key_column, value_column = table.column_names
+        sketches = cls(key_column, value_column, **sketch_args)
+        for key, data in zip(
+            table.column(key_column).to_pylist(), table.column(value_column).to_pylist()
+        ):
+            sketches.sketches[key] = LatencySketch.from_bytes(data)
+        return sketches